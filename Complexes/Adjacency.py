@@ -0,0 +1,170 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+_MIN_PENDING = 256
+
+
+@dataclass(frozen=True)
+class Adjacency:
+    """
+    Compressed sparse row view of the 1-skeleton. The neighbours of v are indices[indptr[v]:indptr[v + 1]] in increasing
+    order with matching edge weights, and the lower neighbours are the prefix ending at lower_end[v].
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    lower_end: np.ndarray
+
+    @staticmethod
+    def from_edges(edges: np.ndarray, weights: np.ndarray, vertex_count: int) -> Adjacency:
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        weights = np.asarray(weights, dtype=np.float64)
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+        both_weights = np.concatenate([weights, weights])
+        order = np.lexsort((targets, sources))
+        sources, targets, both_weights = sources[order], targets[order], both_weights[order]
+        indptr = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=vertex_count), out=indptr[1:])
+        lower_end = indptr[:-1] + np.bincount(sources[targets < sources], minlength=vertex_count)
+        return Adjacency(indptr, targets, both_weights, lower_end)
+
+    @property
+    def vertex_count(self) -> int:
+        return self.indptr.shape[0] - 1
+
+    def neighbours(self, vertex: int) -> np.ndarray:
+        if vertex >= self.vertex_count:
+            return self.indices[:0]
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def lower_neighbours(self, vertex: int) -> np.ndarray:
+        if vertex >= self.vertex_count:
+            return self.indices[:0]
+        return self.indices[self.indptr[vertex]:self.lower_end[vertex]]
+
+    def lower_weights(self, vertex: int) -> np.ndarray:
+        if vertex >= self.vertex_count:
+            return self.weights[:0]
+        return self.weights[self.indptr[vertex]:self.lower_end[vertex]]
+
+    def edge_weight(self, x: int, y: int) -> float | None:
+        """
+        Weight of the edge {x, y} by binary search in the neighbours of x, None if there is no such edge.
+        """
+        neighbours = self.neighbours(x)
+        position = int(np.searchsorted(neighbours, y))
+        if position == neighbours.shape[0] or neighbours[position] != y:
+            return None
+        return float(self.weights[self.indptr[x] + position])
+
+    def with_edges(self, edges: np.ndarray, weights: np.ndarray, vertex_count: int) -> Adjacency:
+        """
+        A new adjacency with the edges added, or reweighted where they are already present, over at least
+        vertex_count vertices. New entries are put in place by binary search into the sorted rows, so the cost is
+        linear in the edges already there rather than a sort of all of them.
+        """
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        weights = np.asarray(weights, dtype=np.float64)
+        vertex_count = max(vertex_count, self.vertex_count, int(edges.max()) + 1 if edges.size else 0)
+        padding = np.full(vertex_count - self.vertex_count, self.indptr[-1], dtype=np.int64)
+        indptr, lower_end = np.concatenate([self.indptr, padding]), np.concatenate([self.lower_end, padding])
+
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+        both_weights = np.concatenate([weights, weights])
+        # Keys order the entries as the rows do; the last occurrence of a repeated edge wins.
+        keys = sources * vertex_count + targets
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = keys.shape[0] - 1 - last
+        sources, targets, both_weights, keys = sources[last], targets[last], both_weights[last], keys[last]
+
+        existing = np.repeat(np.arange(vertex_count, dtype=np.int64), np.diff(indptr)) * vertex_count + self.indices
+        positions = np.searchsorted(existing, keys)
+        found = positions < existing.shape[0]
+        found[found] = existing[positions[found]] == keys[found]
+        new_weights = self.weights.copy()
+        new_weights[positions[found]] = both_weights[found]
+
+        new = ~found
+        indices = np.insert(self.indices, positions[new], targets[new])
+        new_weights = np.insert(new_weights, positions[new], both_weights[new])
+        added = np.bincount(sources[new], minlength=vertex_count)
+        added_lower = np.bincount(sources[new & (targets < sources)], minlength=vertex_count)
+        new_indptr = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.diff(indptr) + added, out=new_indptr[1:])
+        new_lower_end = new_indptr[:-1] + (lower_end - indptr[:-1]) + added_lower
+        return Adjacency(new_indptr, indices, new_weights, new_lower_end)
+
+
+class AdjacencyIndex:
+    """
+    Adjacency kept up to date under edge insertions. Edges added since the last merge wait in a per-vertex dict that
+    answers neighbour and weight queries next to the CSR arrays; they are merged into the arrays once they outnumber a
+    quarter of the edges, or when the arrays themselves are asked for.
+    """
+    __adjacency: Adjacency
+    __vertex_count: int
+    __pending: Dict[int, Dict[int, float]]
+    __pending_count: int
+
+    def __init__(self, adjacency: Adjacency):
+        self.__adjacency = adjacency
+        self.__vertex_count = adjacency.vertex_count
+        self.__pending = dict()
+        self.__pending_count = 0
+
+    def add_vertex_count(self, vertex_count: int) -> None:
+        self.__vertex_count = max(self.__vertex_count, vertex_count)
+
+    def add_edges(self, edges: np.ndarray, weights: np.ndarray) -> None:
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if edges.shape[0] + self.__pending_count > max(_MIN_PENDING, self.__adjacency.indices.shape[0] // 8):
+            self.merge(edges, weights)
+            return
+        for (x, y), weight in zip(edges.tolist(), np.broadcast_to(weights, edges.shape[:1]).tolist()):
+            if y not in self.__pending.setdefault(x, dict()):
+                self.__pending_count += 1
+            self.__pending[x][y] = weight
+            self.__pending.setdefault(y, dict())[x] = weight
+        self.add_vertex_count(int(edges.max()) + 1 if edges.size else 0)
+
+    def merge(self, edges: np.ndarray | None = None, weights: np.ndarray | None = None) -> None:
+        """
+        Merges the pending edges, and then the given ones, into the CSR arrays.
+        """
+        pending = [(x, y, weight) for x, row in self.__pending.items() for y, weight in row.items() if x < y]
+        all_edges = [np.array([(x, y) for x, y, _ in pending], dtype=np.int64).reshape(-1, 2)]
+        all_weights = [np.array([weight for _, _, weight in pending], dtype=np.float64)]
+        if edges is not None:
+            all_edges.append(np.asarray(edges, dtype=np.int64).reshape(-1, 2))
+            all_weights.append(np.broadcast_to(np.asarray(weights, dtype=np.float64), all_edges[-1].shape[:1]))
+        edges, weights = np.concatenate(all_edges), np.concatenate(all_weights)
+        if edges.shape[0] or self.__vertex_count > self.__adjacency.vertex_count:
+            self.__adjacency = self.__adjacency.with_edges(edges, weights, self.__vertex_count)
+            self.__vertex_count = self.__adjacency.vertex_count
+        self.__pending = dict()
+        self.__pending_count = 0
+
+    def adjacency(self) -> Adjacency:
+        if self.__pending_count or self.__vertex_count > self.__adjacency.vertex_count:
+            self.merge()
+        return self.__adjacency
+
+    def neighbours(self, vertex: int) -> np.ndarray:
+        merged = self.__adjacency.neighbours(vertex)
+        pending = self.__pending.get(vertex)
+        if not pending:
+            return merged
+        return np.union1d(merged, np.fromiter(pending, dtype=np.int64, count=len(pending)))
+
+    def lower_neighbours(self, vertex: int) -> np.ndarray:
+        neighbours = self.neighbours(vertex)
+        return neighbours[:np.searchsorted(neighbours, vertex)]
+
+    def edge_weight(self, x: int, y: int) -> float | None:
+        weight = self.__pending.get(x, dict()).get(y)
+        return weight if weight is not None else self.__adjacency.edge_weight(x, y)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import logging
+from typing import List, Tuple
+
+import numpy as np
+from numpy import ndarray
+from scipy.spatial import Delaunay, QhullError
+
+from Complexes import Instrumentation
+from Complexes.CappedComplex import CappedComplex
+from Complexes.Cech.MiniBall import circumballs
+from Complexes.Combinatorial import simplex_keys
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.Instrumentation import Stats
+
+# A vertex this close to the circumsphere of a face, relative to its radius, does not attach the face.
+_TOLERANCE = 1e-9
+
+
+class Alpha:
+    """
+    Alpha complex of points in R^d for d >= 2: the simplices of their Delaunay triangulation, each born at the radius of
+    the smallest empty ball through its vertices, so that it has the homotopy type of the Cech complex of the same
+    radius with O(n) simplices in the plane and in space.
+
+    Weights are assigned from the top dimension down, for all simplices of a dimension at once. A Delaunay d-simplex
+    is born at its circumradius. A lower face is Gabriel if no vertex of its immediate cofaces lies inside its
+    circumsphere, and is then born at its circumradius; otherwise it is attached to a coface and is born with the first
+    of its cofaces.
+
+    Repeated points are triangulated once. Every copy is then a vertex joined to its first occurrence by an edge born at
+    0 and nothing else, so the complex deformation retracts onto the one without copies.
+
+    With instrument set, compute records the time of the triangulation and filtration phases and the number of attached
+    faces of every dimension, available from get_stats.
+    """
+    _points: List[ndarray]
+    _complex: FilteredSimplicialComplex | None
+    _stats: Stats | None
+    _logger: logging.Logger
+
+    def __init__(self, points: List[ndarray], instrument: bool = False):
+        self._points = points
+        self._complex = None
+        self._logger = logging.getLogger(__name__)
+        self._stats = Stats(type(self).__name__, self._logger) if instrument else None
+
+    def get_complex(self, epsilon: float | None = None) -> FilteredSimplicialComplex | CappedComplex:
+        """
+        The whole complex, or a view of the simplices born by epsilon.
+        """
+        assert self._complex is not None, "Complex has not been computed."
+        if epsilon is None:
+            return self._complex
+        return self._complex.cap(epsilon)
+
+    def get_stats(self) -> Stats:
+        if self._stats is None:
+            raise ValueError("Instrumentation is off, pass instrument=True.")
+        return self._stats
+
+    def compute(self, max_dim: int | None = None) -> FilteredSimplicialComplex:
+        points = np.asarray(self._points, dtype=np.float64)
+        points = points.reshape(points.shape[0], -1)
+        n, d = points.shape
+        if d < 2:
+            raise ValueError("Alpha complex needs points in at least 2 dimensions.")
+        unique_points, first, inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+        with Instrumentation.phase(self._stats, "triangulation"):
+            try:
+                simplices = np.sort(Delaunay(unique_points).simplices.astype(np.int64), axis=1)
+            except QhullError as error:
+                raise ValueError("Points do not span the space, cannot triangulate.") from error
+
+        self._complex = FilteredSimplicialComplex()
+        with Instrumentation.phase(self._stats, "filtration"):
+            layers = [(simplices, np.sqrt(circumballs(unique_points[simplices])[1]))]
+            for p in range(d - 1, 0, -1):
+                layers.append(self.__faces(unique_points, *layers[-1]))
+            layers.append((np.arange(unique_points.shape[0]).reshape(-1, 1), np.zeros(unique_points.shape[0])))
+            top = d if max_dim is None else min(max_dim, d)
+            layers = [(first[vertices], weights) for vertices, weights in reversed(layers[d - top:])]
+
+            copies = np.setdiff1d(np.arange(n), first)
+            if self._stats is not None:
+                self._stats.count("copies", copies.shape[0])
+            if copies.shape[0]:
+                layers[0] = (np.r_[layers[0][0], copies.reshape(-1, 1)], np.r_[layers[0][1], np.zeros(copies.shape[0])])
+                if top >= 1:
+                    edges = np.sort(np.column_stack([first[inverse.ravel()[copies]], copies]), axis=1)
+                    layers[1] = (np.r_[layers[1][0], edges], np.r_[layers[1][1], np.zeros(copies.shape[0])])
+            for vertices, weights in layers:
+                self._complex.add_simplices(vertices, weights)
+        if self._stats is not None:
+            for p in range(top + 1):
+                self._stats.count(f"{p}-simplices", self._complex.p_simplex_count(p))
+            self._stats.log_summary()
+        return self._complex
+
+    def __faces(self, points: np.ndarray, cofaces: np.ndarray, coface_weights: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        The facets of the given p-simplices and their weights. Every facet is listed once per coface, with the vertex
+        of the coface opposite it.
+        """
+        p = cofaces.shape[1] - 1
+        facets = np.concatenate([np.delete(cofaces, i, axis=1) for i in range(p + 1)])
+        opposite = cofaces.T.ravel()
+        weights = np.tile(coface_weights, p + 1)
+        _, first, inverse = np.unique(simplex_keys(facets), return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        faces = facets[first]
+
+        centres, squared_radii = circumballs(points[faces])
+        offsets = points[opposite] - centres[inverse]
+        inside = np.einsum("md,md->m", offsets, offsets) < squared_radii[inverse] * (1 - _TOLERANCE)
+        attached = np.zeros(faces.shape[0], dtype=bool)
+        attached[inverse[inside]] = True
+        first_coface = np.full(faces.shape[0], np.inf)
+        np.minimum.at(first_coface, inverse, weights)
+        if self._stats is not None:
+            self._stats.count(f"{p - 1}-attached", int(attached.sum()))
+
+        # A Gabriel face is never born after its cofaces, but rounding could say otherwise.
+        face_weights = np.where(attached, first_coface, np.minimum(np.sqrt(squared_radii), first_coface))
+        return faces, face_weights
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.Alpha.Alpha import Alpha
+from Complexes.Cech.Cech import Cech
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from PersistentHomology.PersHom3 import PersHom3
+
+
+def diagram(filtered_complex, dim):
+    pers_hom = PersHom3(filtered_complex, essential=True)
+    pers_hom.compute()
+    return sorted((point.dim, round(point.born, 9), np.inf if point.die_index is None else round(point.die, 9))
+                  for point in pers_hom.get_pers_diag().points
+                  if point.dim < dim and (point.die_index is None or point.die > point.born))
+
+
+class TestAlpha(TestCase):
+    def test_matches_cech(self):
+        # Both have the homotopy type of the union of balls, so their diagrams agree below the top dimension.
+        grid = np.array([[i, j] for i in range(4) for j in range(4)], dtype=float)
+        for points in (np.random.default_rng(0).random((18, 2)), np.random.default_rng(1).random((18, 3)), grid):
+            d = points.shape[1]
+            alpha = Alpha(list(points)).compute()
+            cech = Cech(list(points), np.inf).compute(d)
+            self.assertEqual(diagram(alpha, d), diagram(cech, d))
+            self.assertLess(alpha.size, cech.size)
+
+    def test_is_filtered(self):
+        points = np.random.default_rng(2).random((200, 3))
+        alpha = Alpha(list(points), instrument=True)
+        filtered_complex = alpha.compute()
+        valid = FilteredSimplicialComplex(check_valid=True)
+        for p in range(4):
+            valid.add_simplices(filtered_complex.p_simplex_vertices(p), filtered_complex.p_simplex_weights(p))
+        self.assertGreater(alpha.get_stats().counters["1-attached"], 0)
+        self.assertEqual(Alpha(list(points)).compute(1).dim, 1)
+        self.assertLessEqual(alpha.get_complex(0.05).size, filtered_complex.size)
+
+    def test_repeated_points(self):
+        # A copy is glued to its first occurrence by an edge instead of becoming a component of its own, and adds no
+        # class in any dimension, the top one included.
+        for points in (np.random.default_rng(0).random((10, 2)), np.random.default_rng(3).random((12, 3))):
+            d = points.shape[1]
+            repeated = np.r_[points, points[[2, 2, 5]]]
+            alpha = Alpha(list(repeated)).compute()
+            valid = FilteredSimplicialComplex(check_valid=True)
+            for p in range(d + 1):
+                vertices = alpha.p_simplex_vertices(p)
+                self.assertEqual(np.unique(vertices, axis=0).shape[0], vertices.shape[0])
+                valid.add_simplices(vertices, alpha.p_simplex_weights(p))
+            self.assertEqual(alpha.get_edge_weight(2, repeated.shape[0] - 2), 0.0)
+            self.assertEqual(alpha.p_simplex_count(1), Alpha(list(points)).compute().p_simplex_count(1) + 3)
+            self.assertEqual(diagram(alpha, d + 1), diagram(Alpha(list(points)).compute(), d + 1))
+            self.assertEqual(diagram(alpha, d), diagram(Cech(list(repeated), np.inf).compute(d), d))
+
+    def test_degenerate(self):
+        with self.assertRaises(ValueError):
+            Alpha([np.array([0.0, 0.0]), np.array([1.0, 1.0]), np.array([2.0, 2.0])]).compute()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+from typing import Dict, Generator, List, Set, TYPE_CHECKING
+
+import numpy as np
+
+from Complexes.Adjacency import Adjacency
+from Complexes.Combinatorial import simplex_keys
+from Complexes.Filtration import Filtration
+from Complexes.Simplex import Simplex
+
+if TYPE_CHECKING:
+    from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+
+
+class CappedComplex:
+    """
+    Read-only view of the simplices of a FilteredSimplicialComplex with weight at most weight_limit, or below it if
+    strict. Creating it is a binary search per dimension into the cached filtration of the parent; the view raises
+    ReferenceError once the parent has been changed. Queries are those of the parent restricted to the view; to add
+    simplices, materialise it first.
+    """
+    __parent: FilteredSimplicialComplex
+    __weight_limit: float
+    __strict: bool
+    __version: int
+    __p_counts: Dict[int, int]
+    __filtration: Filtration | None
+    __simplex_ordering: List[Simplex] | None
+    __simplex_to_order: Dict[Simplex, int] | None
+    __adjacency: Adjacency | None
+
+    def __init__(self, parent: FilteredSimplicialComplex, weight_limit: float, strict: bool = False):
+        self.__parent = parent
+        self.__weight_limit = weight_limit
+        self.__strict = strict
+        self.__version = parent.version
+        parent_filtration = parent.get_filtration()
+        self.__p_counts = dict()
+        for p in parent_filtration.p_orders:
+            count = parent_filtration.p_prefix_length(p, weight_limit, strict)
+            if count > 0:
+                self.__p_counts[p] = count
+        self.__filtration = None
+        self.__simplex_ordering = None
+        self.__simplex_to_order = None
+        self.__adjacency = None
+
+    def __check(self) -> FilteredSimplicialComplex:
+        if self.__parent.version != self.__version:
+            raise ReferenceError("Parent complex changed after the view was taken.")
+        return self.__parent
+
+    def __repr__(self) -> str:
+        output = []
+        for p in self.__p_counts:
+            for vertices, weight in zip(self.p_simplex_vertices(p).tolist(), self.p_simplex_weights(p).tolist()):
+                output.append(f"{str(Simplex(frozenset(vertices)))} w: {weight}")
+        return "\n".join(output)
+
+    def __contains__(self, item: Simplex) -> bool:
+        parent = self.__check()
+        return item in parent and self.__within(parent.get_weight(item))
+
+    def __within(self, weight: float) -> bool:
+        return weight < self.__weight_limit if self.__strict else weight <= self.__weight_limit
+
+    def __eq__(self, other: FilteredSimplicialComplex | CappedComplex):
+        """
+        Equal to a complex or view with the same simplices and weights.
+        """
+        if not hasattr(other, "p_simplex_vertices"):
+            return NotImplemented
+        dims = sorted(self.__p_counts)
+        if other.size != self.size or any(other.p_simplex_count(p) != self.p_simplex_count(p) for p in dims):
+            return False
+        for p in dims:
+            keys, other_keys = simplex_keys(self.p_simplex_vertices(p)), simplex_keys(other.p_simplex_vertices(p))
+            order, other_order = np.argsort(keys), np.argsort(other_keys)
+            if not np.array_equal(keys[order], other_keys[other_order]):
+                return False
+            if not np.array_equal(self.p_simplex_weights(p)[order], other.p_simplex_weights(p)[other_order]):
+                return False
+        return True
+
+    @property
+    def weight_limit(self) -> float:
+        return self.__weight_limit
+
+    @property
+    def strict(self) -> bool:
+        return self.__strict
+
+    @property
+    def dim(self):
+        return max(self.__p_counts.keys())
+
+    @property
+    def size(self):
+        return sum(self.__p_counts.values())
+
+    def p_simplex_count(self, p: int) -> int:
+        return self.__p_counts.get(p, 0)
+
+    def __p_rows(self, p: int) -> np.ndarray:
+        return self.__check().get_filtration().p_orders[p][:self.__p_counts[p]]
+
+    def p_simplex_vertices(self, p: int) -> np.ndarray:
+        """
+        The p-simplices of the view in filtration order.
+        """
+        if p not in self.__p_counts:
+            return np.empty((0, p + 1), dtype=np.int32)
+        return self.__parent.p_simplex_vertices(p)[self.__p_rows(p)]
+
+    def p_simplex_weights(self, p: int) -> np.ndarray:
+        if p not in self.__p_counts:
+            return np.empty(0, dtype=np.float64)
+        return self.__check().get_filtration().p_sorted_weights[p][:self.__p_counts[p]]
+
+    def p_simplices(self, p: int) -> Generator[Simplex, None, None]:
+        for vertices in self.p_simplex_vertices(p).tolist():
+            yield Simplex(frozenset(vertices))
+
+    def get_weight(self, simplex: Simplex) -> float:
+        if simplex not in self:
+            raise ValueError("Simplex not in complex.")
+        return self.__parent.get_weight(simplex)
+
+    def get_cofaces(self, simplex: Simplex) -> Generator[Simplex, None, None]:
+        for coface in self.__check().get_cofaces(simplex):
+            if coface in self:
+                yield coface
+
+    def get_adjacency(self) -> Adjacency:
+        """
+        CSR arrays of the 1-skeleton of the view, over the vertex labels of the parent.
+        """
+        parent = self.__check()
+        if self.__adjacency is None:
+            self.__adjacency = Adjacency.from_edges(self.p_simplex_vertices(1), self.p_simplex_weights(1),
+                                                    parent.get_adjacency().vertex_count)
+        return self.__adjacency
+
+    def get_edge_neighbours(self, vertex: int) -> Set[int]:
+        return set(self.get_adjacency().neighbours(vertex).tolist())
+
+    def get_lower_neighbours(self, vertex: int) -> Set[int]:
+        return set(self.get_adjacency().lower_neighbours(vertex).tolist())
+
+    def get_edge_weight(self, x: int, y: int) -> float:
+        weight = self.get_adjacency().edge_weight(x, y)
+        if weight is None:
+            raise ValueError("Simplex not in complex.")
+        return weight
+
+    def add_simplex(self, simplex: Simplex, weight: float):
+        raise TypeError("A capped complex is a read-only view, add simplices to its materialised copy.")
+
+    def get_filtration(self) -> Filtration:
+        """
+        Prefix of the parent filtration, with rows renumbered to index p_simplex_vertices of this view.
+        """
+        parent = self.__check()
+        if self.__filtration is None:
+            parent_filtration = parent.get_filtration()
+            length = parent_filtration.prefix_length(self.__weight_limit, self.__strict)
+            dims, rows = parent_filtration.dims[:length], parent_filtration.rows[:length].copy()
+            p_orders, p_ranks, p_sorted_weights = dict(), dict(), dict()
+            for p, count in self.__p_counts.items():
+                mask = dims == p
+                rows[mask] = parent_filtration.p_ranks[p][rows[mask]]
+                p_orders[p] = p_ranks[p] = np.arange(count)
+                p_sorted_weights[p] = parent_filtration.p_sorted_weights[p][:count]
+            self.__filtration = Filtration(dims, rows, parent_filtration.weights[:length], p_orders, p_ranks,
+                                           p_sorted_weights)
+        return self.__filtration
+
+    def get_simplex_ordering(self) -> List[Simplex]:
+        filtration = self.get_filtration()
+        if self.__simplex_ordering is None:
+            vertices = {p: self.p_simplex_vertices(p) for p in self.__p_counts}
+            self.__simplex_ordering = [Simplex(frozenset(vertices[p][row].tolist()))
+                                       for p, row in zip(filtration.dims.tolist(), filtration.rows.tolist())]
+        return self.__simplex_ordering
+
+    def get_simplex_to_order(self) -> Dict[Simplex, int]:
+        if self.__simplex_to_order is None:
+            self.__simplex_to_order = {simplex: i for i, simplex in enumerate(self.get_simplex_ordering())}
+        return self.__simplex_to_order
+
+    def get_weight_ordering(self) -> List[float]:
+        return self.get_filtration().weights.tolist()
+
+    def get_weight_array(self) -> np.ndarray:
+        return self.get_filtration().weights
+
+    def cap(self, weight_limit: float, strict: bool = False) -> CappedComplex:
+        if weight_limit > self.__weight_limit:
+            weight_limit, strict = self.__weight_limit, self.__strict
+        elif weight_limit == self.__weight_limit:
+            strict = strict or self.__strict
+        return CappedComplex(self.__check(), weight_limit, strict)
+
+    def materialise(self) -> FilteredSimplicialComplex:
+        """
+        Independent copy of the view as a FilteredSimplicialComplex with the same kind of backend as the parent.
+        """
+        parent = self.__check()
+        fc = type(parent)(backend=parent.backend_type())
+        for p in self.__p_counts:
+            fc.add_simplices(self.p_simplex_vertices(p), self.p_simplex_weights(p))
+        return fc
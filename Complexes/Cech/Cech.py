@@ -0,0 +1,114 @@
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+from numpy import ndarray
+from scipy.spatial import cKDTree
+
+from Complexes.Combinatorial import simplex_keys
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.VR.Base import VRBase
+from Complexes.Cech.MiniBall import miniballs
+
+
+class Cech(VRBase):
+    """
+    Cech complex of points in Euclidean space: a simplex is born at the radius of the minimum enclosing ball of its
+    vertices, and kept while that radius is below epsilon. Vertices are born at 0 and edges at half their length.
+
+    Every pair of vertices of a simplex of radius r is closer than 2r, so the candidates are the cliques of the Rips
+    graph at 2 epsilon. They are generated one dimension at a time from the simplices already kept, and a candidate
+    only survives if all its facets did. The balls of the kept simplices are cached by simplex key, and the balls of
+    the next dimension are computed in batches of _batch_size from them (see MiniBall.miniballs).
+    """
+    _batch_size: int = 1 << 16
+    __centres: np.ndarray | None
+    __squared_radii: np.ndarray | None
+    __keys: np.ndarray | None
+
+    def __init__(self, points: List[ndarray], epsilon: float, instrument: bool = False):
+        super().__init__(points, epsilon, "euclidean", instrument)
+        self.__centres = None
+        self.__squared_radii = None
+        self.__keys = None
+
+    def compute_skeleton(self):
+        points = np.asarray(self._points, dtype=np.float64)
+        n = points.shape[0]
+        points = points.reshape(n, -1)
+        self._complex = FilteredSimplicialComplex()
+        self._complex.add_simplices(np.arange(n).reshape(n, 1), np.zeros(n))
+
+        if np.isinf(self._epsilon):
+            edges = np.column_stack(np.triu_indices(n, 1)).astype(np.int64)
+        else:
+            edges = cKDTree(points).query_pairs(2 * self._epsilon, output_type="ndarray").astype(np.int64)
+        edges = np.sort(edges.reshape(-1, 2), axis=1)
+        radii = np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1) / 2
+        edges, radii = edges[radii < self._epsilon], radii[radii < self._epsilon]
+        if edges.shape[0]:
+            self._complex.add_simplices(edges, radii)
+
+        order = np.argsort(simplex_keys(edges), kind="stable")
+        edges, radii = edges[order], radii[order]
+        self.__keys = simplex_keys(edges)
+        self.__centres = (points[edges[:, 0]] + points[edges[:, 1]]) / 2
+        self.__squared_radii = radii ** 2
+        self._is_skeleton_constructed = True
+
+    def compute_expansion(self, dim: int):
+        if not self._is_skeleton_constructed:
+            raise ReferenceError("Skeleton not constructed.")
+        points = np.asarray(self._points, dtype=np.float64)
+        points = points.reshape(points.shape[0], -1)
+        adjacency = self._complex.get_adjacency()
+        for p in range(2, dim + 1):
+            facets = self._complex.p_simplex_vertices(p - 1)
+            found = [self.__expand(points, adjacency, facets[start:start + self._batch_size])
+                     for start in range(0, facets.shape[0], self._batch_size)]
+            simplices = np.concatenate([batch[0] for batch in found]) if found else np.zeros((0, p + 1), np.int64)
+            if simplices.shape[0] == 0:
+                break
+            centres = np.concatenate([batch[1] for batch in found])
+            squared_radii = np.concatenate([batch[2] for batch in found])
+            self._complex.add_simplices(simplices, np.sqrt(squared_radii))
+
+            keys = simplex_keys(simplices)
+            order = np.argsort(keys, kind="stable")
+            self.__keys, self.__centres, self.__squared_radii = keys[order], centres[order], squared_radii[order]
+
+    def __lookup(self, facets: np.ndarray) -> np.ndarray:
+        """
+        Positions of the facets in the ball cache, -1 for those that were not kept.
+        """
+        keys = simplex_keys(facets)
+        positions = np.searchsorted(self.__keys, keys)
+        found = positions < self.__keys.shape[0]
+        found[found] = self.__keys[positions[found]] == keys[found]
+        return np.where(found, positions, -1)
+
+    def __expand(self, points: np.ndarray, adjacency, facets: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        The cofaces of a batch of (p - 1)-simplices got by adding a vertex below all of theirs, with their balls. Each
+        p-simplex is found exactly once, from the facet without its smallest vertex.
+        """
+        p = facets.shape[1]
+        lowest = facets[:, 0]
+        counts = adjacency.lower_end[lowest] - adjacency.indptr[lowest]
+        rows = np.repeat(np.arange(facets.shape[0]), counts)
+        offsets = np.arange(rows.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+        added = adjacency.indices[adjacency.indptr[lowest][rows] + offsets]
+        simplices = np.column_stack([added, facets[rows]])
+        if self._stats is not None:
+            self._stats.count(f"{p}-candidates", simplices.shape[0])
+
+        positions = np.empty((simplices.shape[0], p + 1), dtype=np.int64)
+        for i in range(p + 1):
+            positions[:, i] = self.__lookup(np.delete(simplices, i, axis=1))
+        kept = (positions >= 0).all(axis=1)
+        simplices, positions = simplices[kept], positions[kept]
+
+        centres, squared_radii = miniballs(points[simplices], self.__centres[positions],
+                                           self.__squared_radii[positions])
+        kept = squared_radii < self._epsilon ** 2
+        return simplices[kept], centres[kept], squared_radii[kept]
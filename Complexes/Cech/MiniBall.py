@@ -0,0 +1,66 @@
+from __future__ import annotations
+from typing import Tuple
+
+import numpy as np
+
+# A point counts as inside a ball when its squared distance to the centre is within this relative slack of r^2.
+_TOLERANCE = 1e-9
+
+
+def circumballs(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Centres and squared radii of the smallest balls with every point of a set on their boundary, for an (m, k, d)
+    array of m sets of k points. The centre lies in the affine hull of the set: with the rows of A the differences
+    x_i - x_0, it is x_0 + A^T l where A A^T l = diag(A A^T) / 2, solved for all sets at once. Sets that are not
+    affinely independent have no such ball; they get the least squares centre and should be handled by the caller.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    origin = points[:, 0]
+    differences = points[:, 1:] - origin[:, None]
+    if differences.shape[1] == 0:
+        return origin.copy(), np.zeros(points.shape[0])
+    gram = differences @ differences.transpose(0, 2, 1)
+    right = np.diagonal(gram, axis1=1, axis2=2) / 2
+    try:
+        coefficients = np.linalg.solve(gram, right[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        coefficients = (np.linalg.pinv(gram) @ right[..., None])[..., 0]
+    offsets = np.einsum("mk,mkd->md", coefficients, differences)
+    return origin + offsets, np.einsum("md,md->m", offsets, offsets)
+
+
+def contains(centres: np.ndarray, squared_radii: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Whether every point lies in the ball of the same row, up to rounding.
+    """
+    offsets = np.asarray(points, dtype=np.float64) - centres
+    squared_distances = np.einsum("...d,...d->...", offsets, offsets)
+    return squared_distances <= squared_radii * (1 + _TOLERANCE) + _TOLERANCE ** 2
+
+
+def miniballs(points: np.ndarray, facet_centres: np.ndarray,
+              facet_squared_radii: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum enclosing balls of m sets of k points, given as an (m, k, d) array, from the minimum enclosing balls of
+    their facets: facet_centres[:, i] and facet_squared_radii[:, i] belong to the set without its i-th point.
+
+    This is the last step of Welzl's recursion. If the ball of some facet holds the missing point it encloses the
+    whole set, and as no ball enclosing the set is smaller than the ball of a facet it is the minimum; of those the
+    smallest is taken, to be robust to rounding. Otherwise every point is on the boundary of the minimum ball, which is
+    then the circumball. Balls of edges are known in closed form, so calling this one dimension at a time, with the
+    balls of the previous dimension looked up, gives every ball with one small solve per set at most.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    inside = contains(facet_centres, facet_squared_radii, points)
+    squared_radii = np.where(inside, facet_squared_radii, np.inf)
+    best = np.argmin(squared_radii, axis=1)
+    rows = np.arange(points.shape[0])
+    centres = facet_centres[rows, best].copy()
+    squared_radii = squared_radii[rows, best]
+
+    supported = ~inside.any(axis=1)
+    if supported.any():
+        centres[supported], circumradii = circumballs(points[supported])
+        # Never below the balls of the facets, so weights stay monotone under rounding.
+        squared_radii[supported] = np.maximum(circumradii, facet_squared_radii[supported].max(axis=1))
+    return centres, squared_radii
@@ -0,0 +1,43 @@
+from itertools import combinations
+from unittest import TestCase
+
+import miniball
+import numpy as np
+
+from Complexes.Cech.Cech import Cech
+from Complexes.Cech.MiniBall import circumballs
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+
+
+class TestCech(TestCase):
+    def test_matches_miniball(self):
+        # In the plane every 3-simplex is degenerate, so its ball always comes from a facet.
+        for d in (2, 3, 4):
+            points = np.random.default_rng(d).random((12, d))
+            complex_ = Cech(list(points), np.inf).compute(3)
+            for p in range(1, 4):
+                vertices = complex_.p_simplex_vertices(p)
+                self.assertEqual(vertices.shape[0], len(list(combinations(range(12), p + 1))))
+                for simplex, weight in zip(vertices, complex_.p_simplex_weights(p)):
+                    _, squared_radius = miniball.get_bounding_ball(points[simplex], epsilon=1e-12)
+                    self.assertAlmostEqual(weight, np.sqrt(squared_radius), places=9)
+
+    def test_is_the_sublevel_set(self):
+        points = np.random.default_rng(0).random((60, 3))
+        full = Cech(list(points), np.inf).compute(3)
+        capped = Cech(list(points), 0.2, instrument=True)
+        complex_ = capped.compute(3)
+        valid = FilteredSimplicialComplex(check_valid=True)
+        for p in range(4):
+            weights = full.p_simplex_weights(p)
+            expected = full.p_simplex_vertices(p)[weights < 0.2]
+            self.assertEqual({tuple(row) for row in complex_.p_simplex_vertices(p).tolist()},
+                             {tuple(row) for row in expected.tolist()})
+            valid.add_simplices(complex_.p_simplex_vertices(p), complex_.p_simplex_weights(p))
+        self.assertGreater(capped.get_stats().counters["3-candidates"], complex_.p_simplex_count(3))
+
+    def test_circumballs(self):
+        triangle = np.array([[[0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 2.0, 0.0]]])
+        centres, squared_radii = circumballs(triangle)
+        np.testing.assert_allclose(centres, [[1.0, 1.0, 0.0]])
+        np.testing.assert_allclose(squared_radii, [2.0])
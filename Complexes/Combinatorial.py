@@ -0,0 +1,78 @@
+from __future__ import annotations
+from math import comb
+from typing import Iterable, Tuple
+
+import numpy as np
+
+_INT64_LIMIT = float(2 ** 62)
+
+
+def simplex_key(vertices: Iterable[int]) -> int:
+    """
+    Index of a simplex in the combinatorial number system. For sorted vertices v_0 < ... < v_p the key is
+    sum_i C(v_i, i + 1), which is a bijection between p-simplices and non-negative integers.
+    """
+    key = 0
+    for i, vertex in enumerate(sorted(vertices)):
+        if vertex < 0:
+            raise ValueError("Vertex labels must be non-negative.")
+        key += comb(vertex, i + 1)
+    return key
+
+
+def key_to_vertices(key: int, p: int) -> Tuple[int, ...]:
+    """
+    Inverse of simplex_key for a p-simplex, returned as a sorted tuple of vertices.
+    """
+    vertices = []
+    for k in range(p + 1, 0, -1):
+        vertex = k - 1
+        while comb(vertex + 1, k) <= key:
+            vertex += 1
+        key -= comb(vertex, k)
+        vertices.append(vertex)
+    return tuple(reversed(vertices))
+
+
+def binomial_array(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Element-wise C(values, k). Computed in int64 when the result is known to fit, otherwise with Python integers in an
+    object array so that keys never silently overflow.
+    """
+    values = np.asarray(values)
+    if k == 0:
+        return np.ones(values.shape, dtype=np.int64)
+    estimate = values.astype(np.float64)
+    for t in range(1, k):
+        estimate = estimate * (values - t) / (t + 1)
+    if values.size and float(estimate.max()) * k >= _INT64_LIMIT:
+        values = values.astype(object)
+    else:
+        values = values.astype(np.int64)
+    result = values.copy()
+    for t in range(1, k):
+        result = result * (values - t) // (t + 1)
+    result[values < k] = 0
+    return result
+
+
+def simplex_keys(vertices: np.ndarray) -> np.ndarray:
+    """
+    Vectorised simplex_key over the rows of an (m, p + 1) array of vertices sorted along each row.
+    """
+    vertices = np.asarray(vertices)
+    if vertices.size and vertices.min() < 0:
+        raise ValueError("Vertex labels must be non-negative.")
+    columns = [binomial_array(vertices[:, i], i + 1) for i in range(vertices.shape[1])]
+    estimate = np.zeros(vertices.shape[0], dtype=np.float64)
+    for column in columns:
+        estimate += column.astype(np.float64)
+    exact = any(column.dtype == object for column in columns)
+    if exact or (estimate.size and float(estimate.max()) >= _INT64_LIMIT):
+        keys = np.zeros(vertices.shape[0], dtype=object)
+        columns = [column.astype(object) for column in columns]
+    else:
+        keys = np.zeros(vertices.shape[0], dtype=np.int64)
+    for column in columns:
+        keys = keys + column
+    return keys
@@ -1,123 +1,257 @@
 from __future__ import annotations
-from typing import Set, Dict, Generator, List
+from typing import Set, Generator, List, Dict
 
+import numpy as np
+
+from Complexes.Adjacency import Adjacency, AdjacencyIndex
+from Complexes.CappedComplex import CappedComplex
+from Complexes.Combinatorial import simplex_keys
+from Complexes.Filtration import Filtration
 from Complexes.Simplex import Simplex
+from Complexes.SimplexBackend import SimplexBackend
+from Complexes.SimplexStore import SimplexStore
 
 
 class FilteredSimplicialComplex:
-    __simplices: Dict[int, Set[Simplex]]
-    __weights: Dict[Simplex, float]
+    __store: SimplexBackend
     __check_valid: bool
+    __adjacency: AdjacencyIndex | None  # Built on demand, then kept up to date as edges change.
+    __filtration: Filtration | None  # Built on demand, dropped on any change.
+    __simplex_ordering: List[Simplex] | None  # Likewise.
+    __simplex_to_order: Dict[Simplex, int] | None  # Likewise.
+    __version: int
 
-    def __init__(self, check_valid=False):
-        self.__simplices = dict()
-        self.__weights = dict()
+    def __init__(self, check_valid=False, backend: SimplexBackend | None = None):
+        """
+        The backend defaults to an array-based SimplexStore; pass a SimplexTree for pointer-walk lookups and cofaces.
+        """
+        self.__store = SimplexStore() if backend is None else backend
         self.__check_valid = check_valid
-        pass
+        self.__adjacency = None
+        self.__filtration = None
+        self.__simplex_ordering = None
+        self.__simplex_to_order = None
+        self.__version = 0
 
     def __repr__(self) -> str:
         output = []
-        for p in self.__simplices:
-            for p_simplex in self.__simplices[p]:
-                output.append(f"{str(p_simplex)} w: {self.__weights[p_simplex]}")
+        for p in self.__store.dims:
+            for vertices, weight in zip(self.__store.p_vertices(p).tolist(), self.__store.p_weights(p).tolist()):
+                output.append(f"{str(Simplex(frozenset(vertices)))} w: {weight}")
         return "\n".join(output)
 
     def __contains__(self, item: Simplex) -> bool:
         if not isinstance(item, Simplex):
             raise ValueError(
                 "Simplicial complex only contains simplex, contains operation of non-simplex type prohibited.")
-        if item.dim not in self.__simplices:
-            return False
-        return item in self.__simplices[item.dim]
+        return self.__store.contains(item)
 
-    def __eq__(self, other: FilteredSimplicialComplex):
-        if self.__simplices != other.__simplices:
-            return False
-        if self.__weights != other.__weights:
+    def __eq__(self, other: FilteredSimplicialComplex | CappedComplex):
+        if not isinstance(other, FilteredSimplicialComplex):
+            return NotImplemented
+        if self.__store.dims != other.__store.dims:
             return False
+        for p in self.__store.dims:
+            keys, other_keys = simplex_keys(self.__store.p_vertices(p)), simplex_keys(other.__store.p_vertices(p))
+            order, other_order = np.argsort(keys), np.argsort(other_keys)
+            if not np.array_equal(keys[order], other_keys[other_order]):
+                return False
+            if not np.array_equal(self.__store.p_weights(p)[order], other.__store.p_weights(p)[other_order]):
+                return False
         return True
 
     @property
     def dim(self):
-        return max(self.__simplices.keys())
+        return max(self.__store.dims)
 
     @property
     def size(self):
-        size = 0
-        for simplices in self.__simplices.values():
-            size += len(simplices)
-        return size
+        return self.__store.size
+
+    @property
+    def backend_type(self) -> type:
+        return type(self.__store)
+
+    @property
+    def nbytes(self) -> int:
+        return self.__store.nbytes
+
+    @property
+    def version(self) -> int:
+        """
+        Incremented on every change, so that views and caches can tell when they are stale.
+        """
+        return self.__version
+
+    def __changed(self) -> None:
+        self.__filtration = None
+        self.__simplex_ordering = None
+        self.__simplex_to_order = None
+        self.__version += 1
 
     def p_simplices(self, p: int) -> Generator[Simplex, None, None]:
-        if p not in self.__simplices:
-            return
-        for p_simplex in self.__simplices[p]:
-            yield p_simplex
+        for vertices in self.__store.p_vertices(p).tolist():
+            yield Simplex(frozenset(vertices))
+
+    def get_cofaces(self, simplex: Simplex) -> Generator[Simplex, None, None]:
+        for vertices in self.__store.cofaces(simplex):
+            yield Simplex(frozenset(vertices))
 
-    def __add_simplex(self, simplex: Simplex, weight: float):
-        if simplex.dim not in self.__simplices:
-            self.__simplices[simplex.dim] = set()
-        self.__simplices[simplex.dim].add(simplex)
-        self.__weights[simplex] = weight
+    def p_simplex_vertices(self, p: int) -> np.ndarray:
+        """
+        The p-simplices as an (m, p + 1) array of sorted vertex rows, aligned with p_simplex_weights.
+        """
+        return self.__store.p_vertices(p)
+
+    def p_simplex_weights(self, p: int) -> np.ndarray:
+        return self.__store.p_weights(p)
 
     def add_simplex(self, simplex: Simplex, weight: float):
+        self.__changed()
         if simplex.dim == 0:
-            self.__add_simplex(simplex, weight)
+            self.__store.add(simplex, weight)
+            if self.__adjacency is not None:
+                self.__adjacency.add_vertex_count(max(simplex.get_vertices()) + 1)
             return
         if self.__check_valid:
             for facet in simplex.facets:
-                if simplex.dim - 1 not in self.__simplices:
-                    raise ValueError("Not all facets are in the complex, cannot add simplex.")
-                if facet not in self.__simplices[simplex.dim - 1]:
+                facet_weight = self.__store.get_weight(facet)
+                if facet_weight is None:
                     raise ValueError("Not all facets are in the complex, cannot add simplex.")
-                facet_weight = self.__weights[facet]
                 if facet_weight > weight:
                     raise ValueError("Not all facets have a lower weight.")
-        self.__add_simplex(simplex, weight)
+        self.__store.add(simplex, weight)
+        if simplex.dim == 1 and self.__adjacency is not None:
+            self.__adjacency.add_edges(np.array([simplex.get_sorted_vertices()]), np.array([weight]))
+
+    def add_simplices(self, vertices: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Bulk version of add_simplex for an (m, p + 1) array of vertex rows, all of the same dimension.
+        """
+        vertices = np.sort(np.asarray(vertices), axis=1)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), (vertices.shape[0],))
+        if self.__check_valid and vertices.shape[1] > 1:
+            for i in range(vertices.shape[1]):
+                facet_weights = self.__store.get_weights(np.delete(vertices, i, axis=1))
+                if np.isnan(facet_weights).any():
+                    raise ValueError("Not all facets are in the complex, cannot add simplex.")
+                if (facet_weights > weights).any():
+                    raise ValueError("Not all facets have a lower weight.")
+        self.__add_many(vertices, weights)
+
+    def add_edges(self, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Bulk insertion of the edges {sources[k], targets[k]}. Endpoints may come in either order.
+        """
+        sources, targets = np.asarray(sources), np.asarray(targets)
+        if (sources == targets).any():
+            raise ValueError("An edge needs two distinct vertices.")
+        self.add_simplices(np.column_stack([np.minimum(sources, targets), np.maximum(sources, targets)]), weights)
+
+    def __add_many(self, vertices: np.ndarray, weights: np.ndarray) -> None:
+        self.__changed()
+        self.__store.add_many(vertices, weights)
+        if self.__adjacency is None or vertices.shape[0] == 0:
+            return
+        if vertices.shape[1] == 1:
+            self.__adjacency.add_vertex_count(int(vertices.max()) + 1)
+        elif vertices.shape[1] == 2:
+            self.__adjacency.add_edges(vertices, weights)
 
     def get_weight(self, simplex: Simplex) -> float:
-        if simplex.dim not in self.__simplices:
+        weight = self.__store.get_weight(simplex)
+        if weight is None:
             raise ValueError("Simplex not in complex.")
-        if simplex not in self.__simplices[simplex.dim]:
-            raise ValueError("Simplex not in complex.")
-        return self.__weights[simplex]
+        return weight
 
     def p_simplex_count(self, p: int) -> int:
-        if p not in self.__simplices:
-            return 0
-        return len(self.__simplices[p])
+        return self.__store.p_count(p)
+
+    def __adjacency_index(self) -> AdjacencyIndex:
+        if self.__adjacency is None:
+            vertex_count = 0
+            for p in (0, 1):
+                vertices = self.__store.p_vertices(p)
+                if vertices.size:
+                    vertex_count = max(vertex_count, int(vertices.max()) + 1)
+            self.__adjacency = AdjacencyIndex(Adjacency.from_edges(self.__store.p_vertices(1),
+                                                                   self.__store.p_weights(1), vertex_count))
+        return self.__adjacency
 
     def get_edge_neighbours(self, vertex: int) -> Set[int]:
-        if 1 not in self.__simplices:
-            return set()
-        edge_set = set()
-        for edge in self.__simplices[1]:
-            if vertex in edge:
-                edge_set = edge_set.union(edge.get_vertices())
-        edge_set.discard(vertex)
-        return edge_set
+        return set(self.__adjacency_index().neighbours(vertex).tolist())
 
-    def reweight(self, simplex: Simplex, weight: float) -> None:
-        if simplex.dim not in self.__simplices:
+    def get_lower_neighbours(self, vertex: int) -> Set[int]:
+        return set(self.__adjacency_index().lower_neighbours(vertex).tolist())
+
+    def get_edge_weight(self, x: int, y: int) -> float:
+        weight = self.__adjacency_index().edge_weight(x, y)
+        if weight is None:
             raise ValueError("Simplex not in complex.")
-        if simplex not in self.__simplices[simplex.dim]:
+        return weight
+
+    def get_adjacency(self) -> Adjacency:
+        """
+        CSR arrays of the 1-skeleton indexed by vertex label. They are built once; edges added or reweighted later are
+        merged into them by sorted insertion, and neighbour queries read the pending edges without merging.
+        """
+        return self.__adjacency_index().adjacency()
+
+    def reweight(self, simplex: Simplex, weight: float) -> None:
+        if not self.__store.contains(simplex):
             raise ValueError("Simplex not in complex.")
-        self.__weights[simplex] = weight
+        self.__changed()
+        self.__store.set_weight(simplex, weight)
+        if simplex.dim == 1 and self.__adjacency is not None:
+            self.__adjacency.add_edges(np.array([simplex.get_sorted_vertices()]), np.array([weight]))
+
+    def get_filtration(self) -> Filtration:
+        """
+        Filtration order of the complex, cached until the complex changes. Ties are broken by dimension and then
+        lexicographically on the sorted vertices.
+        """
+        if self.__filtration is None:
+            p_tiebreaks = dict()
+            for p in self.__store.dims:
+                vertices = np.sort(self.__store.p_vertices(p), axis=1)
+                order = np.lexsort(vertices.T[::-1]) if p >= 0 else np.zeros(vertices.shape[0], dtype=np.int64)
+                p_tiebreaks[p] = np.empty_like(order)
+                p_tiebreaks[p][order] = np.arange(order.shape[0])
+            self.__filtration = Filtration.from_weights({p: self.__store.p_weights(p) for p in self.__store.dims},
+                                                        p_tiebreaks)
+        return self.__filtration
 
     def get_simplex_ordering(self) -> List[Simplex]:
-        simplex_list = list()
-        for simplices in self.__simplices.values():
-            simplex_list += simplices
-        simplex_list = sorted(simplex_list, key=lambda k: self.__weights[k])
-        return simplex_list
+        """
+        Simplices in filtration order. The list is cached until the complex changes and must not be modified.
+        """
+        if self.__simplex_ordering is None:
+            filtration = self.get_filtration()
+            vertices = {p: self.__store.p_vertices(p) for p in self.__store.dims}
+            self.__simplex_ordering = [Simplex(frozenset(vertices[p][row].tolist()))
+                                       for p, row in zip(filtration.dims.tolist(), filtration.rows.tolist())]
+        return self.__simplex_ordering
+
+    def get_simplex_to_order(self) -> Dict[Simplex, int]:
+        """
+        Position of every simplex in get_simplex_ordering, cached alongside it.
+        """
+        if self.__simplex_to_order is None:
+            self.__simplex_to_order = {simplex: i for i, simplex in enumerate(self.get_simplex_ordering())}
+        return self.__simplex_to_order
 
     def get_weight_ordering(self) -> List[float]:
-        return sorted(self.__weights.values())
-
-    def cap(self, weight_limit: float) -> FilteredSimplicialComplex:
-        fc = FilteredSimplicialComplex()
-        for simplex in self.get_simplex_ordering():
-            if self.__weights[simplex] > weight_limit:
-                break
-            fc.add_simplex(simplex, self.__weights[simplex])
-        return fc
+        return self.get_filtration().weights.tolist()
+
+    def get_weight_array(self) -> np.ndarray:
+        """
+        Weights in filtration order, shared with the cached filtration.
+        """
+        return self.get_filtration().weights
+
+    def cap(self, weight_limit: float, strict: bool = False) -> CappedComplex:
+        """
+        View of the simplices with weight at most weight_limit, or below it if strict. It costs a binary search per
+        dimension and shares the arrays of this complex, so it must not outlive changes to it.
+        """
+        return CappedComplex(self, weight_limit, strict)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Filtration:
+    """
+    Filtration order of a complex. Position k is the simplex in row rows[k] of p_simplex_vertices(dims[k]) and has
+    weight weights[k]; weights are non-decreasing and ties go to the lower dimension, so faces precede their cofaces.
+
+    Per dimension, p_orders[p] lists the rows by filtration order and p_ranks[p] is its inverse, which lets a prefix of
+    the filtration be cut with one binary search per dimension.
+
+    Simplices of equal weight and dimension are ordered by p_tiebreaks[p], a rank per row, or by row when it is not
+    given.
+    """
+    dims: np.ndarray
+    rows: np.ndarray
+    weights: np.ndarray
+    p_orders: Dict[int, np.ndarray]
+    p_ranks: Dict[int, np.ndarray]
+    p_sorted_weights: Dict[int, np.ndarray]
+
+    @staticmethod
+    def from_weights(p_weights: Dict[int, np.ndarray], p_tiebreaks: Dict[int, np.ndarray] | None = None) -> Filtration:
+        dims = sorted(p_weights)
+        p_tiebreaks = {p: np.arange(p_weights[p].shape[0]) for p in dims} if p_tiebreaks is None else p_tiebreaks
+        p_orders, p_ranks, p_sorted_weights = dict(), dict(), dict()
+        for p in dims:
+            order = np.lexsort((p_tiebreaks[p], p_weights[p]))
+            rank = np.empty_like(order)
+            rank[order] = np.arange(order.shape[0])
+            p_orders[p], p_ranks[p], p_sorted_weights[p] = order, rank, p_weights[p][order]
+        if not dims:
+            empty = np.empty(0, dtype=np.int64)
+            return Filtration(empty, empty, np.empty(0, dtype=np.float64), p_orders, p_ranks, p_sorted_weights)
+
+        all_dims = np.concatenate([np.full(p_weights[p].shape[0], p, dtype=np.int64) for p in dims])
+        all_rows = np.concatenate([np.arange(p_weights[p].shape[0], dtype=np.int64) for p in dims])
+        all_tiebreaks = np.concatenate([p_tiebreaks[p] for p in dims])
+        all_weights = np.concatenate([p_weights[p] for p in dims])
+        order = np.lexsort((all_tiebreaks, all_dims, all_weights))
+        dims, rows, weights = all_dims[order], all_rows[order], all_weights[order]
+        for array in (dims, rows, weights):
+            array.flags.writeable = False
+        return Filtration(dims, rows, weights, p_orders, p_ranks, p_sorted_weights)
+
+    @property
+    def size(self) -> int:
+        return self.weights.shape[0]
+
+    def prefix_length(self, weight_limit: float, strict: bool = False) -> int:
+        """
+        Number of simplices with weight at most weight_limit, or below it if strict.
+        """
+        return int(np.searchsorted(self.weights, weight_limit, side="left" if strict else "right"))
+
+    def p_prefix_length(self, p: int, weight_limit: float, strict: bool = False) -> int:
+        if p not in self.p_sorted_weights:
+            return 0
+        return int(np.searchsorted(self.p_sorted_weights[p], weight_limit, side="left" if strict else "right"))
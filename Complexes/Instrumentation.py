@@ -0,0 +1,111 @@
+from __future__ import annotations
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Dict, Generator
+
+# Handed out for every phase while instrumentation is off, so an uninstrumented run only pays for entering it.
+NO_PHASE = nullcontext()
+
+
+class Stats:
+    """
+    Per-phase wall time and counters of one instrumented computation. The reductions count:
+
+    - column_additions: number of column additions;
+    - pivot_lookups: number of lookups of a pivot in the pivot table;
+    - max_column_fill: largest number of non-zeros held by a column right after an addition;
+    - peak_working_size: largest number of non-zeros in the whole working matrix.
+
+    Every finished phase and the final summary are logged as structured events, with the numbers in the extra fields
+    of the log record.
+    """
+    owner: str
+    phases: Dict[str, float]
+    counters: Dict[str, int]
+    _logger: logging.Logger
+    __working_size: int
+
+    def __init__(self, owner: str, logger: logging.Logger):
+        self.owner = owner
+        self.phases = dict()
+        self.counters = dict()
+        self._logger = logger
+        self.__working_size = 0
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{name}: {seconds:.6f}s" for name, seconds in self.phases.items())
+        counters = ", ".join(f"{name}: {value}" for name, value in self.counters.items())
+        return f"Stats of {self.owner} ({phases}; {counters})"
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            self._logger.debug("%s: %s took %.6f s.", self.owner, name, seconds,
+                               extra={"owner": self.owner, "phase": name, "seconds": seconds})
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def maximum(self, name: str, value: int) -> None:
+        self.counters[name] = max(self.counters.get(name, 0), value)
+
+    def start_working_matrix(self, size: int) -> None:
+        """
+        Starts tracking the non-zeros of a freshly built working matrix of the given size.
+        """
+        self.__working_size = size
+        self.maximum("peak_working_size", size)
+        self.counters.setdefault("column_additions", 0)
+        self.counters.setdefault("pivot_lookups", 0)
+        self.counters.setdefault("max_column_fill", 0)
+
+    def column_added(self, before: int, after: int) -> None:
+        self.counters["column_additions"] += 1
+        self.__working_size += after - before
+        self.maximum("max_column_fill", after)
+        self.maximum("peak_working_size", self.__working_size)
+
+    def counted_add(self, add: Callable[[int, int], None], fill: Callable[[int], int]) -> Callable[[int, int], None]:
+        """
+        Wraps the column addition R_i <- R_i + R_j of an engine, with fill giving the non-zeros of a column.
+        """
+        def counted(i: int, j: int) -> None:
+            before = fill(i)
+            add(i, j)
+            self.column_added(before, fill(i))
+        return counted
+
+    def pivot_table(self) -> Dict[int, int]:
+        return CountingDict(self)
+
+    def log_summary(self) -> None:
+        self._logger.info("%s: %s.", self.owner, self, extra={"owner": self.owner, "phases": dict(self.phases),
+                                                               "counters": dict(self.counters)})
+
+    def as_dict(self) -> Dict[str, Dict]:
+        return {"phases": dict(self.phases), "counters": dict(self.counters)}
+
+
+class CountingDict(dict):
+    """
+    Pivot table that counts membership tests as pivot lookups.
+    """
+    __stats: Stats
+
+    def __init__(self, stats: Stats):
+        super().__init__()
+        self.__stats = stats
+
+    def __contains__(self, key) -> bool:
+        self.__stats.counters["pivot_lookups"] = self.__stats.counters.get("pivot_lookups", 0) + 1
+        return super().__contains__(key)
+
+
+def phase(stats: Stats | None, name: str) -> ContextManager:
+    return NO_PHASE if stats is None else stats.phase(name)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Generator, Hashable, FrozenSet, Set
+from typing import List, Generator, Hashable, FrozenSet, Set, Tuple
 from itertools import combinations
 
 
 class Simplex:
+    __slots__ = ("__vertices",)
     __vertices: FrozenSet[int]
 
     def __init__(self, vertices: Set[int] | FrozenSet[int]):
@@ -26,7 +27,9 @@ class Simplex:
         return hash(self.__vertices)
 
     def __eq__(self, other) -> bool:
-        return hash(self) == hash(other)
+        if not isinstance(other, Simplex):
+            return NotImplemented
+        return self.__vertices == other.__vertices
 
     def __contains__(self, item: Hashable) -> bool:
         return item in self.__vertices
@@ -76,3 +79,6 @@ class Simplex:
 
     def get_vertices(self) -> Set[int]:
         return set(self.__vertices)
+
+    def get_sorted_vertices(self) -> Tuple[int, ...]:
+        return tuple(sorted(self.__vertices))
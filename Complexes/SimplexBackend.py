@@ -0,0 +1,80 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+
+class SimplexBackend(ABC):
+    """
+    Storage used by the complexes. Simplices are passed in as iterables of vertex labels and handed back as arrays of
+    sorted vertex rows, so a backend never has to create Simplex objects.
+    """
+
+    @property
+    @abstractmethod
+    def dims(self) -> List[int]:
+        pass
+
+    @property
+    def size(self) -> int:
+        return sum(self.p_count(p) for p in self.dims)
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        pass
+
+    @abstractmethod
+    def add(self, vertices: Iterable[int], weight: float) -> None:
+        pass
+
+    def add_many(self, vertices: np.ndarray, weights: np.ndarray) -> None:
+        for row, weight in zip(np.asarray(vertices).tolist(), np.asarray(weights).tolist()):
+            self.add(row, weight)
+
+    @abstractmethod
+    def get_weight(self, vertices: Iterable[int]) -> float | None:
+        pass
+
+    @abstractmethod
+    def set_weight(self, vertices: Iterable[int], weight: float) -> None:
+        pass
+
+    def get_weights(self, vertices: np.ndarray) -> np.ndarray:
+        """
+        Weights of the rows of an (m, p + 1) vertex array, NaN for simplices that are missing.
+        """
+        weights = [self.get_weight(row) for row in np.asarray(vertices).tolist()]
+        return np.array([np.nan if weight is None else weight for weight in weights], dtype=np.float64)
+
+    def contains(self, vertices: Iterable[int]) -> bool:
+        return self.get_weight(vertices) is not None
+
+    @abstractmethod
+    def p_count(self, p: int) -> int:
+        pass
+
+    @abstractmethod
+    def p_vertices(self, p: int) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def p_weights(self, p: int) -> np.ndarray:
+        pass
+
+    def cofaces(self, vertices: Iterable[int]) -> List[Tuple[int, ...]]:
+        """
+        Proper cofaces of a simplex as sorted vertex tuples. The default scans every higher dimension.
+        """
+        vertices = sorted(vertices)
+        cofaces = []
+        for p in self.dims:
+            if p < len(vertices):
+                continue
+            rows = self.p_vertices(p)
+            mask = np.ones(rows.shape[0], dtype=bool)
+            for vertex in vertices:
+                mask &= (rows == vertex).any(axis=1)
+            cofaces += [tuple(row) for row in rows[mask].tolist()]
+        return cofaces
@@ -0,0 +1,240 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from Complexes.Combinatorial import simplex_key, simplex_keys
+from Complexes.SimplexBackend import SimplexBackend
+
+_INT32_MAX = 2 ** 31 - 1
+_INT64_MAX = 2 ** 63 - 1
+_MIN_PENDING = 256
+
+
+class _SimplexBlock:
+    """
+    All simplices of a single dimension. Rows [0, sorted_size) are ordered by key and searched by bisection, rows
+    appended since the last merge are found through the small pending dictionary.
+    """
+    __slots__ = ("vertices", "weights", "keys", "size", "sorted_size", "pending")
+
+    def __init__(self, p: int):
+        self.vertices = np.empty((0, p + 1), dtype=np.int32)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.size = 0
+        self.sorted_size = 0
+        self.pending = dict()
+
+    def reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        capacity = self.weights.shape[0]
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, 16)
+        vertices = np.empty((capacity, self.vertices.shape[1]), dtype=self.vertices.dtype)
+        vertices[:self.size] = self.vertices[:self.size]
+        weights = np.empty(capacity, dtype=np.float64)
+        weights[:self.size] = self.weights[:self.size]
+        keys = np.empty(capacity, dtype=self.keys.dtype)
+        keys[:self.size] = self.keys[:self.size]
+        self.vertices, self.weights, self.keys = vertices, weights, keys
+
+    def widen(self, max_vertex: int, max_key: int) -> None:
+        if max_vertex > _INT32_MAX and self.vertices.dtype == np.int32:
+            self.vertices = self.vertices.astype(np.int64)
+        if max_key > _INT64_MAX and self.keys.dtype != object:
+            self.keys = self.keys.astype(object)
+
+    def merge(self) -> None:
+        if self.sorted_size == self.size:
+            return
+        order = np.argsort(self.keys[:self.size], kind="stable")
+        self.vertices = self.vertices[order]
+        self.weights = self.weights[order]
+        self.keys = self.keys[order]
+        self.sorted_size = self.size
+        self.pending = dict()
+
+    def find(self, key: int) -> int:
+        row = self.pending.get(key)
+        if row is not None:
+            return row
+        if self.sorted_size == 0 or (key > _INT64_MAX and self.keys.dtype != object):
+            return -1
+        row = int(np.searchsorted(self.keys[:self.sorted_size], key))
+        if row < self.sorted_size and self.keys[row] == key:
+            return row
+        return -1
+
+
+class SimplexStore(SimplexBackend):
+    """
+    Compact storage of weighted simplices. Every p-simplex is a row of sorted vertex labels in a per-dimension NumPy
+    array and is identified by its combinatorial number system key, so equality is exact and no Simplex object is
+    created unless a caller asks for one.
+    """
+    __blocks: Dict[int, _SimplexBlock]
+
+    def __init__(self):
+        self.__blocks = dict()
+
+    def __block(self, p: int) -> _SimplexBlock:
+        if p not in self.__blocks:
+            self.__blocks[p] = _SimplexBlock(p)
+        return self.__blocks[p]
+
+    @staticmethod
+    def __normalise(vertices: Iterable[int]) -> Tuple[int, ...]:
+        return tuple(sorted(int(vertex) for vertex in vertices))
+
+    @property
+    def dims(self) -> List[int]:
+        return sorted(p for p, block in self.__blocks.items() if block.size > 0)
+
+    @property
+    def size(self) -> int:
+        return sum(block.size for block in self.__blocks.values())
+
+    @property
+    def nbytes(self) -> int:
+        total = 0
+        for block in self.__blocks.values():
+            total += block.vertices.nbytes + block.weights.nbytes + block.keys.nbytes
+        return total
+
+    def add(self, vertices: Iterable[int], weight: float) -> None:
+        vertices = self.__normalise(vertices)
+        key = simplex_key(vertices)
+        block = self.__block(len(vertices) - 1)
+        row = block.find(key)
+        if row >= 0:
+            block.weights[row] = weight
+            return
+        block.widen(max(vertices, default=0), key)
+        block.reserve(1)
+        block.vertices[block.size] = vertices
+        block.weights[block.size] = weight
+        block.keys[block.size] = key
+        block.pending[key] = block.size
+        block.size += 1
+        if len(block.pending) > max(_MIN_PENDING, block.sorted_size // 4):
+            block.merge()
+
+    def add_many(self, vertices: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Adds the rows of an (m, p + 1) vertex array with their weights. Existing simplices are reweighted and, as with
+        repeated calls to add, the last occurrence of a duplicate row wins.
+        """
+        vertices = np.sort(np.asarray(vertices), axis=1)
+        weights = np.asarray(weights, dtype=np.float64)
+        if vertices.shape[0] == 0:
+            return
+        keys = simplex_keys(vertices)
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = vertices.shape[0] - 1 - last
+        vertices, weights, keys = vertices[last], weights[last], keys[last]
+
+        block = self.__block(vertices.shape[1] - 1)
+        block.merge()
+        rows = self.__search(block, keys)
+        found = rows >= 0
+        block.weights[rows[found]] = weights[found]
+
+        new = ~found
+        count = int(new.sum())
+        if count == 0:
+            return
+        block.widen(int(vertices.max(initial=0)), _INT64_MAX + 1 if keys.dtype == object else 0)
+        block.reserve(count)
+        block.vertices[block.size:block.size + count] = vertices[new]
+        block.weights[block.size:block.size + count] = weights[new]
+        block.keys[block.size:block.size + count] = keys[new]
+        block.size += count
+        block.merge()
+
+    @staticmethod
+    def __search(block: _SimplexBlock, keys: np.ndarray) -> np.ndarray:
+        sorted_keys = block.keys[:block.sorted_size]
+        if keys.dtype == object and sorted_keys.dtype != object:
+            sorted_keys = sorted_keys.astype(object)
+        positions = np.searchsorted(sorted_keys, keys)
+        rows = np.full(keys.shape[0], -1, dtype=np.int64)
+        inside = positions < block.sorted_size
+        matched = np.zeros(keys.shape[0], dtype=bool)
+        matched[inside] = sorted_keys[positions[inside]] == keys[inside]
+        rows[matched] = positions[matched]
+        return rows
+
+    @staticmethod
+    def __read_only(view: np.ndarray) -> np.ndarray:
+        view.flags.writeable = False
+        return view
+
+    def find_rows(self, vertices: np.ndarray) -> np.ndarray:
+        """
+        Rows of the given (m, p + 1) simplices within p_vertices(p), or -1 for simplices not in the store.
+        """
+        vertices = np.sort(np.asarray(vertices), axis=1)
+        p = vertices.shape[1] - 1
+        if p not in self.__blocks:
+            return np.full(vertices.shape[0], -1, dtype=np.int64)
+        block = self.__blocks[p]
+        block.merge()
+        return self.__search(block, simplex_keys(vertices))
+
+    def get_weights(self, vertices: np.ndarray) -> np.ndarray:
+        rows = self.find_rows(vertices)
+        weights = np.full(rows.shape[0], np.nan, dtype=np.float64)
+        if (rows >= 0).any():
+            block = self.__blocks[np.asarray(vertices).shape[1] - 1]
+            weights[rows >= 0] = block.weights[rows[rows >= 0]]
+        return weights
+
+    def get_weight(self, vertices: Iterable[int]) -> float | None:
+        vertices = self.__normalise(vertices)
+        p = len(vertices) - 1
+        if p not in self.__blocks:
+            return None
+        block = self.__blocks[p]
+        row = block.find(simplex_key(vertices))
+        if row < 0:
+            return None
+        return float(block.weights[row])
+
+    def set_weight(self, vertices: Iterable[int], weight: float) -> None:
+        vertices = self.__normalise(vertices)
+        p = len(vertices) - 1
+        row = self.__blocks[p].find(simplex_key(vertices)) if p in self.__blocks else -1
+        if row < 0:
+            raise ValueError("Simplex not in store.")
+        self.__blocks[p].weights[row] = weight
+
+    def p_count(self, p: int) -> int:
+        if p not in self.__blocks:
+            return 0
+        return self.__blocks[p].size
+
+    def p_vertices(self, p: int) -> np.ndarray:
+        """
+        (m, p + 1) array of the p-simplices, one sorted row per simplex, in key order.
+        """
+        if p not in self.__blocks:
+            return np.empty((0, p + 1), dtype=np.int32)
+        block = self.__blocks[p]
+        block.merge()
+        return self.__read_only(block.vertices[:block.size])
+
+    def p_weights(self, p: int) -> np.ndarray:
+        if p not in self.__blocks:
+            return np.empty(0, dtype=np.float64)
+        block = self.__blocks[p]
+        block.merge()
+        return self.__read_only(block.weights[:block.size])
+
+    def p_keys(self, p: int) -> np.ndarray:
+        if p not in self.__blocks:
+            return np.empty(0, dtype=np.int64)
+        block = self.__blocks[p]
+        block.merge()
+        return self.__read_only(block.keys[:block.size])
@@ -1,7 +1,230 @@
-class SimplexTree:
+from __future__ import annotations
+import sys
+from itertools import combinations
+from typing import Dict, Generator, Iterable, List, Tuple
+
+import numpy as np
+
+from Complexes.SimplexBackend import SimplexBackend
+
+
+class _Node:
+    __slots__ = ("label", "parent", "children", "weight", "depth")
+
+    def __init__(self, label: int, parent: _Node | None, depth: int):
+        self.label = label
+        self.parent = parent
+        self.children: Dict[int, _Node] = dict()
+        self.weight: float | None = None
+        self.depth = depth
+
+    def vertices(self) -> Tuple[int, ...]:
+        vertices = []
+        node = self
+        while node.parent is not None:
+            vertices.append(node.label)
+            node = node.parent
+        return tuple(reversed(vertices))
+
+
+class SimplexTree(SimplexBackend):
     """
+    Trie over sorted vertex labels: the path from the root to a node at depth p + 1 spells a p-simplex and the node
+    holds its filtration value. Nodes sharing a label are chained in per-label lists so that cofaces are found by
+    walking up from those nodes instead of hashing vertex sets.
 
+    Nodes on the path of an inserted simplex whose own face was never added carry no weight and are not members.
     """
+    __root: _Node
+    __label_lists: Dict[int, List[_Node]]
+    __counts: Dict[int, int]
 
     def __init__(self):
-        pass
+        self.__root = _Node(-1, None, 0)
+        self.__label_lists = dict()
+        self.__counts = dict()
+
+    @staticmethod
+    def __normalise(vertices: Iterable[int]) -> Tuple[int, ...]:
+        return tuple(sorted(int(vertex) for vertex in vertices))
+
+    def __find(self, vertices: Tuple[int, ...]) -> _Node | None:
+        node = self.__root
+        for vertex in vertices:
+            node = node.children.get(vertex)
+            if node is None:
+                return None
+        return node
+
+    def __path(self, vertices: Tuple[int, ...]) -> _Node:
+        node = self.__root
+        for vertex in vertices:
+            child = node.children.get(vertex)
+            if child is None:
+                child = _Node(vertex, node, node.depth + 1)
+                node.children[vertex] = child
+                self.__label_lists.setdefault(vertex, []).append(child)
+            node = child
+        return node
+
+    def __walk(self, node: _Node, max_weight: float | None = None) -> Generator[_Node, None, None]:
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.weight is not None:
+                if max_weight is not None and current.weight > max_weight:
+                    continue
+                yield current
+            for label in sorted(current.children, reverse=True):
+                stack.append(current.children[label])
+
+    @property
+    def dims(self) -> List[int]:
+        return sorted(p for p, count in self.__counts.items() if count > 0)
+
+    @property
+    def nbytes(self) -> int:
+        total = 0
+        for nodes in self.__label_lists.values():
+            for node in nodes:
+                total += sys.getsizeof(node) + sys.getsizeof(node.children)
+        return total
+
+    def add(self, vertices: Iterable[int], weight: float) -> None:
+        node = self.__path(self.__normalise(vertices))
+        if node.weight is None:
+            self.__counts[node.depth - 1] = self.__counts.get(node.depth - 1, 0) + 1
+        node.weight = weight
+
+    def insert(self, vertices: Iterable[int], weight: float) -> None:
+        """
+        Adds a simplex together with every face that is not in the tree yet, all at the given weight.
+        """
+        vertices = self.__normalise(vertices)
+        for p in range(len(vertices)):
+            for face in combinations(vertices, p + 1):
+                node = self.__path(face)
+                if node.weight is None:
+                    self.__counts[p] = self.__counts.get(p, 0) + 1
+                    node.weight = weight
+
+    def get_weight(self, vertices: Iterable[int]) -> float | None:
+        node = self.__find(self.__normalise(vertices))
+        if node is None:
+            return None
+        return node.weight
+
+    def set_weight(self, vertices: Iterable[int], weight: float) -> None:
+        node = self.__find(self.__normalise(vertices))
+        if node is None or node.weight is None:
+            raise ValueError("Simplex not in tree.")
+        node.weight = weight
+
+    def p_count(self, p: int) -> int:
+        return self.__counts.get(p, 0)
+
+    def p_vertices(self, p: int) -> np.ndarray:
+        rows = [node.vertices() for node in self.__p_nodes(p)]
+        return np.array(rows, dtype=np.int64).reshape(len(rows), p + 1)
+
+    def p_weights(self, p: int) -> np.ndarray:
+        return np.array([node.weight for node in self.__p_nodes(p)], dtype=np.float64)
+
+    def __p_nodes(self, p: int) -> Generator[_Node, None, None]:
+        if p == -1:
+            if self.__root.weight is not None:
+                yield self.__root
+            return
+        stack = [self.__root]
+        while stack:
+            node = stack.pop()
+            if node.depth == p + 1:
+                if node.weight is not None:
+                    yield node
+                continue
+            for label in sorted(node.children, reverse=True):
+                stack.append(node.children[label])
+
+    def simplices(self, max_weight: float | None = None) -> Generator[Tuple[Tuple[int, ...], float], None, None]:
+        """
+        All simplices in lexicographic order with their weights. With max_weight, subtrees rooted at a simplex above
+        the cap are skipped, which is exact for a filtration since cofaces never come before their faces.
+        """
+        for node in self.__walk(self.__root, max_weight):
+            yield node.vertices(), node.weight
+
+    def facets(self, vertices: Iterable[int]) -> List[Tuple[int, ...]]:
+        """
+        Codimension one faces of a simplex that are in the tree.
+        """
+        vertices = self.__normalise(vertices)
+        facets = []
+        for i in range(len(vertices)):
+            facet = vertices[:i] + vertices[i + 1:]
+            node = self.__find(facet)
+            if node is not None and node.weight is not None:
+                facets.append(facet)
+        return facets
+
+    def cofaces(self, vertices: Iterable[int], codim: int | None = None) -> List[Tuple[int, ...]]:
+        """
+        Proper cofaces of a simplex, or only those of the given codimension.
+        """
+        vertices = self.__normalise(vertices)
+        cofaces = []
+        for node in self.__coface_roots(vertices):
+            for coface in self.__walk(node):
+                if coface.depth == len(vertices):
+                    continue
+                if codim is not None and coface.depth != len(vertices) + codim:
+                    continue
+                cofaces.append(coface.vertices())
+        return cofaces
+
+    def __coface_roots(self, vertices: Tuple[int, ...]) -> Generator[_Node, None, None]:
+        """
+        Nodes whose path contains the simplex and ends on its largest vertex. Every coface lies in the subtree of
+        exactly one of them.
+        """
+        if not vertices:
+            yield self.__root
+            return
+        for node in self.__label_lists.get(vertices[-1], []):
+            if node.depth < len(vertices):
+                continue
+            remaining = len(vertices) - 2
+            ancestor = node.parent
+            while remaining >= 0 and ancestor.parent is not None:
+                if ancestor.label == vertices[remaining]:
+                    remaining -= 1
+                elif ancestor.label < vertices[remaining]:
+                    break
+                ancestor = ancestor.parent
+            if remaining < 0:
+                yield node
+
+    def star(self, vertices: Iterable[int]) -> List[Tuple[int, ...]]:
+        vertices = self.__normalise(vertices)
+        if not self.contains(vertices):
+            return []
+        return [vertices] + self.cofaces(vertices)
+
+    def link(self, vertices: Iterable[int]) -> List[Tuple[int, ...]]:
+        vertices = self.__normalise(vertices)
+        excluded = set(vertices)
+        return [tuple(v for v in coface if v not in excluded) for coface in self.cofaces(vertices)]
+
+    def maximal_simplices(self) -> List[Tuple[int, ...]]:
+        """
+        Simplices that are not a face of any other simplex.
+        """
+        maximal = []
+        for node in self.__walk(self.__root):
+            if node.depth == 0:
+                continue
+            if any(child.weight is not None for child in node.children.values()):
+                continue
+            vertices = node.vertices()
+            if not self.cofaces(vertices, codim=1):
+                maximal.append(vertices)
+        return maximal
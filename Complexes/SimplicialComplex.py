@@ -1,56 +1,55 @@
 from __future__ import annotations
 from typing import Dict
 from Complexes.Simplex import *
+from Complexes.SimplexStore import SimplexStore
 
 
 class SimplicialComplex:
-    __simplices: Dict[int, Set[Simplex]]  # Key represents simplex dimension.
+    __store: SimplexStore  # Weights are unused and kept at zero.
     __check_valid: bool
 
     def __init__(self, check_valid=False):
-        self.__simplices = dict()
+        self.__store = SimplexStore()
         self.__check_valid = check_valid
         pass
 
     def __repr__(self):
         output = []
-        for p in self.__simplices:
-            for p_simplex in self.__simplices[p]:
-                output.append(str(p_simplex))
+        for p in self.__store.dims:
+            for vertices in self.__store.p_vertices(p).tolist():
+                output.append(str(Simplex(frozenset(vertices))))
         return "\n".join(output)
 
     def __contains__(self, item: Simplex) -> bool:
         if not isinstance(item, Simplex):
             raise ValueError(
                 "Simplicial complex only contains simplex, contains operation of non-simplex type prohibited.")
-        if item.dim not in self.__simplices:
-            return False
-        return item in self.__simplices[item.dim]
+        return self.__store.contains(item)
 
     @property
     def dim(self):
-        return max(self.__simplices.keys())
+        return max(self.__store.dims)
 
     @property
     def size(self):
-        size = 0
-        for simplices in self.__simplices.values():
-            size += len(simplices)
-        return size
+        return self.__store.size
 
-    def __add_vertex(self, simplex: Simplex):
-        if simplex.dim not in self.__simplices:
-            self.__simplices[simplex.dim] = set()
-        self.__simplices[simplex.dim].add(simplex)
+    def p_simplices(self, p: int) -> Generator[Simplex, None, None]:
+        for vertices in self.__store.p_vertices(p).tolist():
+            yield Simplex(frozenset(vertices))
+
+    def p_simplex_vertices(self, p: int):
+        return self.__store.p_vertices(p)
+
+    def p_simplex_count(self, p: int) -> int:
+        return self.__store.p_count(p)
 
     def add_simplex(self, simplex: Simplex):
         if simplex.dim == 0:
-            self.__add_vertex(simplex)
+            self.__store.add(simplex, 0)
             return
         if self.__check_valid:
             for facet in simplex.facets:
-                if simplex.dim - 1 not in self.__simplices:
-                    raise ValueError("Not all facets are in the complex, cannot add simplex.")
-                if facet not in self.__simplices[simplex.dim - 1]:
+                if not self.__store.contains(facet):
                     raise ValueError("Not all facets are in the complex, cannot add simplex.")
-        self.__add_vertex(simplex)
+        self.__store.add(simplex, 0)
@@ -1,30 +1,67 @@
 from __future__ import annotations
+import logging
 from abc import ABC, abstractmethod
 from typing import List, Callable
 
+from Complexes import Instrumentation
+from Complexes.CappedComplex import CappedComplex
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.Instrumentation import Stats
 from Complexes.SimplicialComplex import *
 from numpy import ndarray
 
 
 class VRBase(ABC):
+    """
+    With instrument set, compute records the time of the skeleton and expansion phases and the number of simplices of
+    every dimension, available from get_stats.
+    """
     _points: List[ndarray]
     _complex: FilteredSimplicialComplex | None
-    _metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float]
+    _metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float] | str
     _epsilon: float
     _is_skeleton_constructed: bool
+    _stats: Stats | None
+    _logger: logging.Logger
 
     def __init__(self, points: List[ndarray], epsilon: float,
-                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float]):
+                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float] | str, instrument: bool = False):
         self._points = points
         self._complex = None
         self._metric = metric
         self._epsilon = epsilon
         self._is_skeleton_constructed = False
+        self._logger = logging.getLogger(__name__)
+        self._stats = Stats(type(self).__name__, self._logger) if instrument else None
 
-    def get_complex(self) -> FilteredSimplicialComplex:
+    def get_complex(self, epsilon: float | None = None) -> FilteredSimplicialComplex | CappedComplex:
+        """
+        The complex as built, or a view of it at a smaller scale. Build once with the largest epsilon of interest (or
+        inf for the full Rips filtration) and take views for every smaller scale instead of rebuilding. Like the
+        skeleton builders, the view keeps the simplices of weight below epsilon, so it equals a rebuild at epsilon.
+        """
+        if epsilon is None:
+            return self._complex
+        if epsilon > self._epsilon:
+            raise ValueError("Complex was only built up to a smaller epsilon.")
+        return self._complex.cap(epsilon, strict=True)
+
+    def compute(self, max_dim: int) -> FilteredSimplicialComplex:
+        with Instrumentation.phase(self._stats, "skeleton"):
+            self.compute_skeleton()
+        with Instrumentation.phase(self._stats, "expansion"):
+            self.compute_expansion(max_dim)
+        if self._stats is not None:
+            for p in range(self._complex.dim + 1 if self._complex.size else 0):
+                self._stats.count(f"{p}-simplices", self._complex.p_simplex_count(p))
+            self._stats.log_summary()
         return self._complex
 
+    def get_stats(self) -> Stats:
+        if self._stats is None:
+            raise ValueError("Instrumentation is off, pass instrument=True.")
+        return self._stats
+
     @abstractmethod
     def compute_skeleton(self):
         pass
@@ -10,8 +10,8 @@ from Complexes.VR.Base import VRBase
 
 class ExpansionBruteForce(VRBase, ABC):
     def __init__(self, points: List[ndarray], epsilon: float,
-                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float]):
-        super().__init__(points, epsilon, metric)
+                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float], instrument: bool = False):
+        super().__init__(points, epsilon, metric, instrument)
 
     def compute_expansion(self, dim: int):
         if not self._is_skeleton_constructed:
@@ -1,7 +1,6 @@
 from __future__ import annotations
 from abc import ABC
-from itertools import combinations
-from typing import List, Callable, Set, Hashable
+from typing import List, Callable, Dict
 
 from numpy import ndarray
 
@@ -12,47 +11,46 @@ from Complexes.VR.Base import VRBase
 
 class Incremental(VRBase, ABC):
     def __init__(self, points: List[ndarray], epsilon: float,
-                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float]):
-        super().__init__(points, epsilon, metric)
+                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float] | str, instrument: bool = False):
+        super().__init__(points, epsilon, metric, instrument)
         self.__new_complex = FilteredSimplicialComplex()
-
-    def lower_neighbours(self, v: int) -> Set[int]:
-        edge_neighbours = self._complex.get_edge_neighbours(v)
-        lower_edge_neighbours = set()
-        for neighbour in edge_neighbours:
-            if neighbour < v:
-                lower_edge_neighbours.add(neighbour)
-        return lower_edge_neighbours
-
-    def add_cofaces(self, level: int, simplex: Simplex, lower_neighbours: Set[int]):
-        stack = [(simplex, lower_neighbours)]
+        self.__lower_neighbours = dict()
+
+    def lower_neighbours(self, v: int) -> Dict[int, float]:
+        """
+        Lower neighbours of v with the weights of their edges to v, read once from the adjacency of the skeleton.
+        """
+        if v not in self.__lower_neighbours:
+            adjacency = self._complex.get_adjacency()
+            self.__lower_neighbours[v] = dict(zip(adjacency.lower_neighbours(v).tolist(),
+                                                  adjacency.lower_weights(v).tolist()))
+        return self.__lower_neighbours[v]
+
+    def add_cofaces(self, level: int, simplex: Simplex, lower_neighbours: Dict[int, float]):
+        """
+        The lower neighbours map each candidate vertex to the largest weight of its edges into the simplex, so the
+        weight of every coface is known when it is pushed.
+        """
+        stack = [(simplex, self._complex.get_weight(simplex), lower_neighbours)]
         while stack:
-            current_simplex, current_neighbours = stack.pop()
-            self.__new_complex.add_simplex(current_simplex, 0)
+            current_simplex, current_weight, current_neighbours = stack.pop()
+            self.__new_complex.add_simplex(current_simplex, current_weight)
 
             if current_simplex.dim < level:
-                for neighbour in current_neighbours:
+                for neighbour, neighbour_weight in current_neighbours.items():
                     coface = current_simplex + neighbour
-                    new_lower_neighbours = current_neighbours.intersection(self.lower_neighbours(neighbour))
-                    stack.append((coface, new_lower_neighbours))
-
-    def compute_weights(self):
-        for edge in self.__new_complex.p_simplices(1):
-            (vertex_x, vertex_y) = edge.get_vertices()
-            weight = self._metric(self._points[vertex_x], self._points[vertex_y])
-            self.__new_complex.reweight(edge, weight)
-
-        for p in range(2, self.__new_complex.dim + 1):
-            for p_simplex in self.__new_complex.p_simplices(p):
-                weight = max(self.__new_complex.get_weight(facet) for facet in p_simplex.facets)
-                self.__new_complex.reweight(p_simplex, weight)
+                    neighbour_lower_neighbours = self.lower_neighbours(neighbour)
+                    new_lower_neighbours = {
+                        vertex: max(weight, neighbour_lower_neighbours[vertex])
+                        for vertex, weight in current_neighbours.items() if vertex in neighbour_lower_neighbours
+                    }
+                    stack.append((coface, max(current_weight, neighbour_weight), new_lower_neighbours))
 
     def compute_expansion(self, dim: int):
         if self._complex.p_simplex_count(0) == 0:
             return
         for simplex in self._complex.p_simplices(0):
             (vertex,) = simplex.get_vertices()
-            lower_neighbours = self.lower_neighbours(vertex)
-            self.add_cofaces(dim, simplex, lower_neighbours)
-        self.compute_weights()
+            self.add_cofaces(dim, simplex, self.lower_neighbours(vertex))
         self._complex = self.__new_complex
+        self.__lower_neighbours = dict()
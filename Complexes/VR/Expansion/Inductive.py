@@ -1,43 +1,43 @@
 from __future__ import annotations
 from abc import ABC
-from itertools import combinations
-from typing import List, Callable, Set, Hashable
+from typing import List, Callable, Dict
 
+import numpy as np
 from numpy import ndarray
 
-from Complexes.Simplex import Simplex
 from Complexes.VR.Base import VRBase
 
 
 class Inductive(VRBase, ABC):
     def __init__(self, points: List[ndarray], epsilon: float,
-                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float]):
-        super().__init__(points, epsilon, metric)
+                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float] | str, instrument: bool = False):
+        super().__init__(points, epsilon, metric, instrument)
 
-    def lower_neighbours(self, v: int) -> Set[int]:
-        edge_neighbours = self._complex.get_edge_neighbours(v)
-        lower_edge_neighbours = set()
-        for neighbour in edge_neighbours:
-            if neighbour < v:
-                lower_edge_neighbours.add(neighbour)
-        return lower_edge_neighbours
-
-    def compute_weights(self):
-        for p in range(2, self._complex.dim + 1):
-            for p_simplex in self._complex.p_simplices(p):
-                weight = max(self._complex.get_weight(facet) for facet in p_simplex.facets)
-                self._complex.reweight(p_simplex, weight)
+    def lower_neighbours(self, v: int) -> Dict[int, float]:
+        """
+        Lower neighbours of v with the weights of their edges to v.
+        """
+        adjacency = self._complex.get_adjacency()
+        return dict(zip(adjacency.lower_neighbours(v).tolist(), adjacency.lower_weights(v).tolist()))
 
     def compute_expansion(self, dim: int):
+        lower_neighbours = [self.lower_neighbours(v) for v in range(self._complex.get_adjacency().vertex_count)]
         for simplex_dim in range(2, dim + 1):
-            stack = list(self._complex.p_simplices(simplex_dim - 1))
-            for simplex in self._complex.p_simplices(simplex_dim - 1):
+            cofaces, weights = [], []
+            simplices = self._complex.p_simplex_vertices(simplex_dim - 1).tolist()
+            simplex_weights = self._complex.p_simplex_weights(simplex_dim - 1).tolist()
+            for simplex, simplex_weight in zip(simplices, simplex_weights):
                 common_lower_neighbours = None
                 for vertex in simplex:
                     if common_lower_neighbours is None:
-                        common_lower_neighbours = self.lower_neighbours(vertex)
+                        common_lower_neighbours = set(lower_neighbours[vertex])
                     else:
-                        common_lower_neighbours = common_lower_neighbours.intersection(self.lower_neighbours(vertex))
+                        common_lower_neighbours.intersection_update(lower_neighbours[vertex])
                 for neighbour in common_lower_neighbours:
-                    self._complex.add_simplex(simplex + neighbour, 0)
-        self.compute_weights()
+                    # The coface is born when its last edge appears, i.e. at the heaviest edge to the new vertex.
+                    weight = max(simplex_weight, *(lower_neighbours[vertex][neighbour] for vertex in simplex))
+                    cofaces.append(simplex + [neighbour])
+                    weights.append(weight)
+            if not cofaces:
+                break
+            self._complex.add_simplices(np.array(cofaces), np.array(weights))
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import os
+from abc import ABC
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from Complexes.Adjacency import Adjacency
+from Complexes.VR.Base import VRBase
+
+_ARRAY_NAMES = ("indptr", "indices", "weights", "lower_end")
+_worker_adjacency: Adjacency | None = None
+_worker_memory: List[SharedMemory] = []
+
+
+def expand_vertices(adjacency: Adjacency, vertices: np.ndarray, dim: int) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """
+    All simplices of dimension 2 to dim whose largest vertex is in vertices, with their VR weights. A simplex is grown
+    by adding lower neighbours common to all its vertices; next to each candidate neighbour we carry the largest weight
+    of its edges into the simplex, so every coface is born with its filtration value.
+    """
+    rows: Dict[int, List[Tuple[int, ...]]] = {p: [] for p in range(2, dim + 1)}
+    weights: Dict[int, List[float]] = {p: [] for p in range(2, dim + 1)}
+    for vertex in vertices.tolist():
+        stack = [((vertex,), 0.0, adjacency.lower_neighbours(vertex), adjacency.lower_weights(vertex))]
+        while stack:
+            simplex, weight, candidates, candidate_weights = stack.pop()
+            p = len(simplex) - 1
+            if p >= 2:
+                rows[p].append(simplex)
+                weights[p].append(weight)
+            if p == dim:
+                continue
+            for neighbour, neighbour_weight in zip(candidates.tolist(), candidate_weights.tolist()):
+                coface_weight = max(weight, neighbour_weight)
+                _, here, there = np.intersect1d(candidates, adjacency.lower_neighbours(neighbour),
+                                                assume_unique=True, return_indices=True)
+                coface_candidate_weights = np.maximum(candidate_weights[here], adjacency.lower_weights(neighbour)[there])
+                stack.append((simplex + (neighbour,), coface_weight, candidates[here], coface_candidate_weights))
+    return {p: (np.array(rows[p], dtype=np.int64).reshape(-1, p + 1), np.array(weights[p], dtype=np.float64))
+            for p in rows}
+
+
+def _attach(specs: List[Tuple[str, Tuple[int, ...], str]]) -> None:
+    global _worker_adjacency
+    arrays = []
+    for name, shape, dtype in specs:
+        memory = SharedMemory(name=name)
+        _worker_memory.append(memory)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+    _worker_adjacency = Adjacency(*arrays)
+
+
+def _expand_shard(vertices: np.ndarray, dim: int) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    return expand_vertices(_worker_adjacency, vertices, dim)
+
+
+class Parallel(VRBase, ABC):
+    """
+    Expansion sharded over worker processes. Every simplex is generated from its largest vertex, so the vertices can
+    be split freely; the CSR adjacency is placed in shared memory once and each worker returns its simplices as arrays
+    that are merged with bulk inserts.
+    """
+    _workers: int | None = None
+    _shards_per_worker: int = 4
+
+    def compute_expansion(self, dim: int):
+        if not self._is_skeleton_constructed:
+            raise ReferenceError("Skeleton not constructed.")
+        if dim < 2:
+            return
+        adjacency = self._complex.get_adjacency()
+        vertices = self._complex.p_simplex_vertices(0).ravel()
+        workers = self._workers or os.cpu_count() or 1
+        shard_count = max(1, min(len(vertices), workers * self._shards_per_worker))
+        # Striding spreads the high-degree and low-degree vertices evenly over the shards.
+        shards = [vertices[i::shard_count] for i in range(shard_count)]
+
+        if workers == 1:
+            results = [expand_vertices(adjacency, shard, dim) for shard in shards]
+        else:
+            results = self.__expand_in_pool(adjacency, shards, dim, workers)
+
+        for p in range(2, dim + 1):
+            rows = np.concatenate([result[p][0] for result in results])
+            if rows.shape[0] == 0:
+                break
+            self._complex.add_simplices(rows, np.concatenate([result[p][1] for result in results]))
+
+    @staticmethod
+    def __expand_in_pool(adjacency: Adjacency, shards: List[np.ndarray], dim: int,
+                         workers: int) -> List[Dict[int, Tuple[np.ndarray, np.ndarray]]]:
+        memories, specs = [], []
+        try:
+            for name in _ARRAY_NAMES:
+                array = getattr(adjacency, name)
+                memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+                memories.append(memory)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[...] = array
+                specs.append((memory.name, array.shape, array.dtype.str))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(specs,)) as executor:
+                return list(executor.map(_expand_shard, shards, [dim] * len(shards)))
+        finally:
+            for memory in memories:
+                memory.close()
+                memory.unlink()
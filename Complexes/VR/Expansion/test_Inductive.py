@@ -0,0 +1,46 @@
+from itertools import combinations
+from unittest import TestCase
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from Complexes.Combinatorial import simplex_keys
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Expansion.Inductive import Inductive
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+
+
+class InductiveVR(Vectorized, Inductive):
+    pass
+
+
+class IncrementalVR(Vectorized, Incremental):
+    pass
+
+
+def p_simplices(filtered_complex, p):
+    vertices, weights = filtered_complex.p_simplex_vertices(p), filtered_complex.p_simplex_weights(p)
+    order = np.argsort(simplex_keys(vertices))
+    return vertices[order], weights[order]
+
+
+class TestInductive(TestCase):
+    def test_weights_match(self):
+        # A cluster of repeated points and some grid ties make many cofaces share their heaviest edge.
+        rng = np.random.default_rng(0)
+        points = np.r_[rng.random((30, 2)), np.zeros((3, 2)),
+                       np.array([[i, j] for i in range(3) for j in range(3)], dtype=float) / 4]
+        distances = cdist(points, points)
+        inductive = InductiveVR(list(points), 0.45, "euclidean").compute(4)
+        incremental = IncrementalVR(list(points), 0.45, "euclidean").compute(4)
+        self.assertEqual(inductive.dim, 4)
+        for p in range(inductive.dim + 1):
+            vertices, weights = p_simplices(inductive, p)
+            incremental_vertices, incremental_weights = p_simplices(incremental, p)
+            np.testing.assert_array_equal(vertices, incremental_vertices)
+            np.testing.assert_array_equal(weights, incremental_weights)
+            if p >= 2:
+                # The weight the old post-pass gave: the heaviest edge of the simplex.
+                heaviest = np.array([max(distances[u, v] for u, v in combinations(simplex, 2))
+                                     for simplex in vertices.tolist()])
+                np.testing.assert_allclose(weights, heaviest, rtol=1e-12)
@@ -0,0 +1,54 @@
+from multiprocessing.shared_memory import SharedMemory
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from Complexes.VR.Expansion import Parallel as parallel_module
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Expansion.Parallel import Parallel
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+
+
+class IncrementalVR(Vectorized, Incremental):
+    pass
+
+
+class ParallelVR(Vectorized, Parallel):
+    pass
+
+
+class TestParallel(TestCase):
+    def test_matches_incremental(self):
+        created = []
+
+        class RecordingSharedMemory(SharedMemory):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                if kwargs.get("create"):
+                    created.append(self.name)
+
+        points = list(np.random.default_rng(0).random((40, 3)))
+        expected = IncrementalVR(points, 0.5, "euclidean").compute(4)
+        for workers in (1, 2):
+            vr = ParallelVR(points, 0.5, "euclidean")
+            vr._workers = workers
+            with patch.object(parallel_module, "SharedMemory", RecordingSharedMemory):
+                result = vr.compute(4)
+            self.assertEqual(result.dim, 4)
+            # Equality compares the vertex rows and the weights of every dimension.
+            self.assertEqual(result, expected)
+
+        # Only the pool puts the adjacency in shared memory, and every block it made is gone afterwards.
+        self.assertEqual(len(created), len(parallel_module._ARRAY_NAMES))
+        for name in created:
+            with self.assertRaises(FileNotFoundError):
+                SharedMemory(name=name)
+
+    def test_few_vertices(self):
+        # More workers than vertices, and a skeleton without edges.
+        for points, epsilon in ((list(np.random.default_rng(1).random((3, 2))), 2.0),
+                                (list(np.random.default_rng(2).random((5, 2))), 0.0)):
+            vr = ParallelVR(points, epsilon, "euclidean")
+            vr._workers = 2
+            self.assertEqual(vr.compute(3), IncrementalVR(points, epsilon, "euclidean").compute(3))
@@ -12,8 +12,8 @@ from Complexes.VR.Base import VRBase
 
 class SkeletonBruteForce(VRBase, ABC):
     def __init__(self, points: List[ndarray], epsilon: float,
-                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float]):
-        super().__init__(points, epsilon, metric)
+                 metric: Callable[[ndarray[float, ...], ndarray[float, ...]], float], instrument: bool = False):
+        super().__init__(points, epsilon, metric, instrument)
 
     def compute_skeleton(self):
         self._complex = FilteredSimplicialComplex()
@@ -1,10 +1,9 @@
 from __future__ import annotations
 from abc import ABC
 
-from numpy import array
+import numpy as np
 
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
-from Complexes.Simplex import Simplex
 from Complexes.VR.Base import VRBase
 from sklearn import neighbors
 
@@ -12,13 +11,13 @@ from sklearn import neighbors
 class Sklearn(VRBase, ABC):
     def compute_skeleton(self):
         self._complex = FilteredSimplicialComplex()
-        for i, _ in enumerate(self._points):
-            self._complex.add_simplex(Simplex({i}), 0)
+        points = np.array(self._points)
+        self._complex.add_simplices(np.arange(len(points)).reshape(-1, 1), np.zeros(len(points)))
 
-        points = array(self._points)
-        neighbours = neighbors.NearestNeighbors(radius=self._epsilon).fit(points)
-        distances_list, indices_list = neighbours.radius_neighbors(points)
-        for i, (distances, indices) in enumerate(zip(distances_list, indices_list)):
-            for distance, j in zip(distances[1:], indices[1:]):
-                self._complex.add_simplex(Simplex({i, j}), distance)
+        # A callable metric is passed through; sklearn calls it on pairs of points like SkeletonBruteForce does.
+        neighbours = neighbors.NearestNeighbors(radius=self._epsilon, metric=self._metric).fit(points)
+        graph = neighbours.radius_neighbors_graph(mode="distance").tocoo()
+        # The radius query keeps distances equal to epsilon, the other skeleton builders do not.
+        upper = (graph.row < graph.col) & (graph.data < self._epsilon)
+        self._complex.add_edges(graph.row[upper], graph.col[upper], graph.data[upper])
         self._is_skeleton_constructed = True
@@ -0,0 +1,86 @@
+from __future__ import annotations
+from abc import ABC
+from typing import Tuple
+
+import numpy as np
+
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.VR.Base import VRBase
+
+METRICS = ("euclidean", "chebyshev", "manhattan", "cosine", "precomputed")
+
+
+class Vectorized(VRBase, ABC):
+    """
+    Skeleton built from the pairwise distance matrix one tile at a time, so only _tile_size^2 distances are held in
+    memory and no Python call is made per pair. The metric has to be one of METRICS; with "precomputed" the points are
+    the rows of a square distance matrix.
+    """
+    _tile_size: int = 1024
+
+    def compute_skeleton(self):
+        if not isinstance(self._metric, str) or self._metric not in METRICS:
+            raise ValueError(f"Vectorized skeleton requires a metric name from {METRICS}.")
+        points = np.asarray(self._points, dtype=np.float64)
+        n = points.shape[0]
+        points = points.reshape(n, -1)
+        if self._metric == "precomputed" and points.shape[1] != n:
+            raise ValueError("Precomputed distances must be a square matrix.")
+
+        self._complex = FilteredSimplicialComplex()
+        self._complex.add_simplices(np.arange(n).reshape(n, 1), np.zeros(n))
+
+        prepared = self.__prepare(points)
+        # The Gram-matrix form of the Euclidean distance is only accurate to rounding, so candidate edges are taken
+        # with a little slack and filtered again on the exact distance.
+        threshold = self._epsilon * (1 + 1e-9) + 1e-12 if self._metric == "euclidean" else self._epsilon
+        sources, targets, weights = [], [], []
+        for start in range(0, n, self._tile_size):
+            stop = min(start + self._tile_size, n)
+            for other_start in range(start, n, self._tile_size):
+                other_stop = min(other_start + self._tile_size, n)
+                distances = self.__tile(prepared, start, stop, other_start, other_stop)
+                i, j = np.nonzero(distances < threshold)
+                i, j = i + start, j + other_start
+                upper = i < j
+                sources.append(i[upper])
+                targets.append(j[upper])
+                weights.append(distances[i[upper] - start, j[upper] - other_start])
+
+        if sources:
+            edges = np.column_stack([np.concatenate(sources), np.concatenate(targets)])
+            weights = np.concatenate(weights)
+            if self._metric == "euclidean":
+                weights = np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+                edges, weights = edges[weights < self._epsilon], weights[weights < self._epsilon]
+            self._complex.add_simplices(edges, weights)
+        self._is_skeleton_constructed = True
+
+    def __prepare(self, points: np.ndarray) -> Tuple[np.ndarray, ...]:
+        if self._metric == "euclidean":
+            return points, np.einsum("ij,ij->i", points, points)
+        if self._metric == "cosine":
+            norms = np.linalg.norm(points, axis=1, keepdims=True)
+            return (np.divide(points, norms, out=np.zeros_like(points), where=norms > 0),)
+        return (points,)
+
+    def __tile(self, prepared: Tuple[np.ndarray, ...], start: int, stop: int, other_start: int,
+               other_stop: int) -> np.ndarray:
+        points = prepared[0]
+        block, other = points[start:stop], points[other_start:other_stop]
+        if self._metric == "precomputed":
+            return block[:, other_start:other_stop]
+        if self._metric == "euclidean":
+            squared_norms = prepared[1]
+            squared = squared_norms[start:stop, None] + squared_norms[None, other_start:other_stop] - 2 * block @ other.T
+            return np.sqrt(np.maximum(squared, 0))
+        if self._metric == "cosine":
+            return 1 - block @ other.T
+        distances = np.zeros((stop - start, other_stop - other_start))
+        for k in range(points.shape[1]):
+            difference = np.abs(block[:, k, None] - other[None, :, k])
+            if self._metric == "chebyshev":
+                np.maximum(distances, difference, out=distances)
+            else:
+                distances += difference
+        return distances
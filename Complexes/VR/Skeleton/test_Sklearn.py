@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.Combinatorial import simplex_keys
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Skeleton.Sklearn import Sklearn
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+
+
+class SklearnVR(Sklearn, Incremental):
+    pass
+
+
+class VectorizedVR(Vectorized, Incremental):
+    pass
+
+
+def edges(vr):
+    filtered_complex = vr.get_complex()
+    vertices, weights = filtered_complex.p_simplex_vertices(1), filtered_complex.p_simplex_weights(1)
+    order = np.argsort(simplex_keys(vertices))
+    return vertices[order], weights[order]
+
+
+class TestSklearn(TestCase):
+    def assert_same_skeleton(self, points, epsilon, metric, reference_metric=None):
+        sklearn_vr = SklearnVR(points, epsilon, metric)
+        vectorized_vr = VectorizedVR(points, epsilon, reference_metric or metric)
+        sklearn_vr.compute(1)
+        vectorized_vr.compute(1)
+        self.assertEqual(sklearn_vr.get_complex().p_simplex_count(0), len(points))
+        sklearn_edges, sklearn_weights = edges(sklearn_vr)
+        vectorized_edges, vectorized_weights = edges(vectorized_vr)
+        np.testing.assert_array_equal(sklearn_edges, vectorized_edges)
+        np.testing.assert_allclose(sklearn_weights, vectorized_weights, rtol=1e-12, atol=1e-12)
+
+    def test_matches_vectorized(self):
+        points = np.random.default_rng(0).random((60, 3))
+        # Repeated points are joined by edges of weight 0.
+        points = list(np.r_[points, points[[3, 3, 17]]])
+        for metric in ("euclidean", "chebyshev", "manhattan"):
+            self.assert_same_skeleton(points, 0.4, metric)
+
+    def test_epsilon_is_strict(self):
+        # Grid neighbours sit at exactly epsilon and are not joined.
+        grid = [np.array([i, j], dtype=float) for i in range(5) for j in range(5)]
+        self.assert_same_skeleton(grid, 1.0, "manhattan")
+        self.assert_same_skeleton(grid, 2.0, "manhattan")
+        self.assert_same_skeleton(grid, 1.0, "euclidean")
+
+    def test_callable_metric(self):
+        points = list(np.random.default_rng(1).random((30, 2)))
+        self.assert_same_skeleton(points, 0.3, lambda x, y: float(np.abs(x - y).max()), "chebyshev")
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from Complexes.Combinatorial import simplex_keys
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Skeleton.Vectorized import METRICS, Vectorized
+
+# scipy names for the metrics of Vectorized.
+SCIPY_METRICS = {"euclidean": "euclidean", "chebyshev": "chebyshev", "manhattan": "cityblock", "cosine": "cosine"}
+
+
+class VR(Vectorized, Incremental):
+    # Small tiles so that a handful of points spans several of them, with a ragged last one.
+    _tile_size = 3
+
+
+def expected_skeleton(distances, epsilon):
+    i, j = np.nonzero(np.triu(distances < epsilon, 1))
+    edges = np.column_stack([i, j])
+    order = np.argsort(simplex_keys(edges))
+    return edges[order], distances[i, j][order]
+
+
+class TestVectorized(TestCase):
+    def test_matches_cdist(self):
+        rng = np.random.default_rng(0)
+        # 11 points in 3 dimensions with one repeated point, so some distances are exactly 0.
+        points = rng.random((11, 3)) - 0.3
+        points[7] = points[2]
+        for metric in METRICS:
+            if metric == "precomputed":
+                distances = cdist(points, points)
+                inputs = list(distances)
+            else:
+                distances = cdist(points, points, SCIPY_METRICS[metric])
+                inputs = list(points)
+            # The median distance leaves about half the edges in.
+            epsilon = float(np.median(distances[np.triu_indices(11, 1)]))
+            vr = VR(inputs, epsilon, metric)
+            vr.compute(1)
+            filtered_complex = vr.get_complex()
+            self.assertEqual(filtered_complex.p_simplex_count(0), 11)
+            vertices, weights = filtered_complex.p_simplex_vertices(1), filtered_complex.p_simplex_weights(1)
+            order = np.argsort(simplex_keys(vertices))
+            expected_edges, expected_weights = expected_skeleton(distances, epsilon)
+            np.testing.assert_array_equal(vertices[order], expected_edges, err_msg=metric)
+            np.testing.assert_allclose(weights[order], expected_weights, rtol=1e-12, atol=1e-12, err_msg=metric)
+
+    def test_epsilon_is_strict(self):
+        # Grid neighbours at exactly epsilon are not joined, in the same tile or across tiles.
+        grid = np.array([[i, j] for i in range(4) for j in range(4)], dtype=float)
+        for metric in ("euclidean", "manhattan", "chebyshev"):
+            vr = VR(list(grid), 1.0, metric)
+            vr.compute(1)
+            self.assertEqual(vr.get_complex().p_simplex_count(1), 0)
+            vr = VR(list(grid), 1.5, metric)
+            vr.compute(1)
+            distances = cdist(grid, grid, SCIPY_METRICS[metric])
+            self.assertEqual(vr.get_complex().p_simplex_count(1), expected_skeleton(distances, 1.5)[0].shape[0])
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            VR(list(np.zeros((4, 2))), 1.0, lambda x, y: 0.0).compute(1)
+        with self.assertRaises(ValueError):
+            VR(list(np.zeros((4, 3))), 1.0, "precomputed").compute(1)
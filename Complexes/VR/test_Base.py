@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+
+
+class VR(Vectorized, Incremental):
+    pass
+
+
+class TestVRBase(TestCase):
+    def test_view_matches_rebuild(self):
+        # On a unit grid many edges and triangles share their weight, so the view is cut right at the ties.
+        grid = [np.array([i, j], dtype=float) for i in range(3) for j in range(3)]
+        full = VR(grid, np.inf, "euclidean")
+        full.compute(2)
+        for epsilon in (0.5, 1.0, np.sqrt(2), 1.5, 2.0, np.sqrt(5), 3.0):
+            rebuilt = VR(grid, epsilon, "euclidean").compute(2)
+            view = full.get_complex(epsilon)
+            self.assertEqual(view.size, rebuilt.size)
+            self.assertTrue(view.materialise() == rebuilt)
+        self.assertEqual(full.get_complex(1.0).size, 9)
+
+        # A view of a complex built at a finite epsilon, taken at that epsilon, is the whole complex.
+        partial = VR(grid, 2.0, "euclidean")
+        partial.compute(2)
+        self.assertEqual(partial.get_complex(2.0).size, partial.get_complex().size)
+        self.assertTrue(partial.get_complex(np.sqrt(2)).materialise() == VR(grid, np.sqrt(2), "euclidean").compute(2))
+        with self.assertRaises(ValueError):
+            partial.get_complex(2.5)
@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+from PersistentHomology.PersHom1 import PersHom1
+from PersistentHomology.PersHom2 import PersHom2
+from PersistentHomology.PersHom3 import PersHom3
+from PersistentHomology.PersHom4 import PersHom4
+
+
+class VR(Vectorized, Incremental):
+    pass
+
+
+class TestInstrumentation(TestCase):
+    def test_stats(self):
+        points = np.random.default_rng(2).random((15, 2))
+        vr = VR(list(points), np.inf, "euclidean", instrument=True)
+        vr.compute(2)
+        vr_stats = vr.get_stats()
+        self.assertEqual(set(vr_stats.phases), {"skeleton", "expansion"})
+        self.assertEqual(vr_stats.counters, {"0-simplices": 15, "1-simplices": 105, "2-simplices": 455})
+
+        plain = PersHom3(vr.get_complex())
+        plain.compute()
+        with self.assertRaises(ValueError):
+            plain.get_stats()
+        for engine in (PersHom1, PersHom2, PersHom3, PersHom4):
+            pers_hom = engine(vr.get_complex(), instrument=True)
+            with self.assertLogs("PersistentHomology.PersHomBase", level="DEBUG") as logs:
+                pers_hom.compute()
+            self.assertEqual(pers_hom.get_pers_diag(), plain.get_pers_diag())
+            stats = pers_hom.get_stats()
+            # PersHom4 adds its points while reducing.
+            self.assertEqual(set(stats.phases) - {"diagram"}, {"boundary", "reduction"})
+            self.assertGreater(stats.counters["column_additions"], 0)
+            self.assertGreaterEqual(stats.counters["pivot_lookups"], stats.counters["column_additions"])
+            self.assertGreater(stats.counters["max_column_fill"], 0)
+            self.assertGreaterEqual(stats.counters["peak_working_size"], 2 * 105 + 3 * 455)
+            self.assertEqual(logs.records[-1].counters, stats.counters)
+            self.assertEqual(logs.records[0].phase, "reduction")
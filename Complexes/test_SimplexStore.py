@@ -0,0 +1,210 @@
+from itertools import combinations
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.Adjacency import Adjacency
+from Complexes.Combinatorial import simplex_key, simplex_keys, key_to_vertices
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.Simplex import Simplex
+from Complexes.SimplexStore import SimplexStore
+from Complexes.SimplexTree import SimplexTree
+
+
+class TestCombinatorial(TestCase):
+    def test_keys_are_a_bijection(self):
+        keys = [simplex_key(vertices) for vertices in combinations(range(12), 3)]
+        self.assertEqual(sorted(keys), list(range(len(keys))))
+
+    def test_inverse(self):
+        for vertices in combinations(range(9), 4):
+            self.assertEqual(key_to_vertices(simplex_key(vertices), 3), vertices)
+
+    def test_vectorised_keys_match(self):
+        vertices = np.array(list(combinations(range(10), 3)))
+        self.assertEqual(simplex_keys(vertices).tolist(), [simplex_key(row) for row in vertices.tolist()])
+
+    def test_large_labels_do_not_overflow(self):
+        vertices = np.array([[10 ** 6, 10 ** 6 + 1, 10 ** 6 + 2, 10 ** 6 + 3, 10 ** 6 + 4]])
+        self.assertEqual(simplex_keys(vertices)[0], simplex_key(vertices[0].tolist()))
+
+
+class TestSimplexStore(TestCase):
+    def setUp(self):
+        self.store = SimplexStore()
+
+    def test_add_and_lookup(self):
+        for i, vertices in enumerate(combinations(range(30), 2)):
+            self.store.add(vertices, i)
+        self.assertEqual(self.store.p_count(1), 435)
+        self.assertEqual(self.store.get_weight((1, 0)), 0)
+        self.assertEqual(self.store.get_weight((29, 28)), 434)
+        self.assertIsNone(self.store.get_weight((30, 0)))
+
+    def test_readd_reweights(self):
+        self.store.add((1, 2), 1.0)
+        self.store.add((2, 1), 3.0)
+        self.assertEqual(self.store.p_count(1), 1)
+        self.assertEqual(self.store.get_weight((1, 2)), 3.0)
+
+    def test_add_many(self):
+        self.store.add((0, 1), 5.0)
+        self.store.add_many(np.array([[1, 0], [2, 1], [1, 2]]), np.array([1.0, 2.0, 4.0]))
+        self.assertEqual(self.store.p_count(1), 2)
+        self.assertEqual(self.store.get_weight((0, 1)), 1.0)
+        self.assertEqual(self.store.get_weight((1, 2)), 4.0)
+        self.assertEqual(self.store.find_rows(np.array([[2, 1], [0, 2]]))[1], -1)
+
+    def test_empty_simplex(self):
+        self.store.add((), -1)
+        self.assertEqual(self.store.dims, [-1])
+        self.assertEqual(self.store.get_weight(()), -1)
+
+
+class TestFilteredSimplicialComplex(TestCase):
+    def test_equality_is_collision_free(self):
+        self.assertNotEqual(Simplex({-1}), Simplex({-2}))
+        self.assertEqual(Simplex({1, 2}), Simplex(frozenset({2, 1})))
+
+    def test_ordering(self):
+        fc = FilteredSimplicialComplex(check_valid=True)
+        fc.add_simplex(Simplex({0}), 0)
+        fc.add_simplex(Simplex({1}), 0)
+        fc.add_simplex(Simplex({0, 1}), 2)
+        fc.add_simplex(Simplex({2}), 1)
+        self.assertEqual(fc.get_simplex_ordering(), [Simplex({0}), Simplex({1}), Simplex({2}), Simplex({0, 1})])
+        self.assertEqual(fc.get_weight_ordering(), [0, 0, 1, 2])
+        with self.assertRaises(ValueError):
+            fc.add_simplex(Simplex({0, 3}), 3)
+
+    def test_ordering_is_cached_and_lexicographic(self):
+        fc = FilteredSimplicialComplex()
+        for i in range(4):
+            fc.add_simplex(Simplex({i}), 0)
+        # Colex order would put {0, 3} after {1, 2}.
+        for edge in ({1, 2}, {0, 3}, {2, 3}, {0, 1}):
+            fc.add_simplex(Simplex(edge), 1)
+        ordering = fc.get_simplex_ordering()
+        self.assertEqual(ordering[4:], [Simplex({0, 1}), Simplex({0, 3}), Simplex({1, 2}), Simplex({2, 3})])
+        self.assertIs(fc.get_simplex_ordering(), ordering)
+        self.assertEqual(fc.get_simplex_to_order()[Simplex({0, 3})], 5)
+
+        fc.reweight(Simplex({0, 3}), 2)
+        self.assertEqual(fc.get_simplex_to_order()[Simplex({0, 3})], 7)
+        self.assertEqual(fc.get_weight_array().tolist(), fc.get_weight_ordering())
+
+    def test_cap(self):
+        fc = FilteredSimplicialComplex()
+        for i in range(4):
+            fc.add_simplex(Simplex({i}), i)
+        capped = fc.cap(1.5)
+        self.assertEqual(capped.size, 2)
+        self.assertIn(Simplex({1}), capped)
+        self.assertNotIn(Simplex({2}), capped)
+        strict = fc.cap(1, strict=True)
+        self.assertEqual(strict.size, 1)
+        self.assertNotIn(Simplex({1}), strict)
+        self.assertEqual(strict.get_weight_ordering(), [0])
+        self.assertEqual(fc.cap(1).size, 2)
+        # A view of a view keeps the tighter of the two bounds.
+        self.assertEqual(fc.cap(1).cap(1, strict=True).size, 1)
+        self.assertEqual(strict.cap(1).size, 1)
+        self.assertEqual(strict.cap(3).size, 1)
+
+    def test_adjacency(self):
+        fc = FilteredSimplicialComplex()
+        for i in range(4):
+            fc.add_simplex(Simplex({i}), 0)
+        fc.add_simplex(Simplex({0, 2}), 1.0)
+        fc.add_simplex(Simplex({2, 3}), 2.0)
+        fc.add_simplex(Simplex({1, 2}), 3.0)
+        self.assertEqual(fc.get_edge_neighbours(2), {0, 1, 3})
+        self.assertEqual(fc.get_lower_neighbours(2), {0, 1})
+        adjacency = fc.get_adjacency()
+        self.assertEqual(adjacency.neighbours(2).tolist(), [0, 1, 3])
+        self.assertEqual(adjacency.lower_neighbours(2).tolist(), [0, 1])
+        self.assertEqual(adjacency.lower_weights(2).tolist(), [1.0, 3.0])
+        fc.reweight(Simplex({1, 2}), 4.0)
+        self.assertEqual(fc.get_adjacency().lower_weights(2).tolist(), [1.0, 4.0])
+        self.assertEqual(fc.get_edge_weight(2, 1), 4.0)
+        with self.assertRaises(ValueError):
+            fc.get_edge_weight(0, 1)
+        fc.add_edges(np.array([3, 1]), np.array([0, 0]), np.array([5.0, 6.0]))
+        self.assertEqual(fc.get_lower_neighbours(3), {0, 2})
+        self.assertEqual(fc.get_edge_weight(0, 1), 6.0)
+
+    def test_interleaved_adjacency(self):
+        # Edges added one at a time, in bulk and reweighted between queries are all seen, whether they are still
+        # pending or have been merged into the arrays.
+        rng = np.random.default_rng(0)
+        fc = FilteredSimplicialComplex()
+        fc.add_simplices(np.arange(30).reshape(-1, 1), np.zeros(30))
+        expected = dict()
+        fc.get_adjacency()
+        for step in range(600):
+            if step % 100 == 99:
+                edges = np.sort(rng.choice(40, (300, 2)), axis=1)
+                edges = edges[edges[:, 0] != edges[:, 1]]
+                weights = rng.random(edges.shape[0])
+                fc.add_simplices(edges[:, 1:], np.zeros(edges.shape[0]))
+                fc.add_edges(edges[:, 0], edges[:, 1], weights)
+                expected.update(zip(map(tuple, edges.tolist()), weights.tolist()))
+            else:
+                x, y = sorted(rng.choice(30, 2, replace=False).tolist())
+                weight = float(rng.random())
+                if (x, y) in expected and step % 3 == 0:
+                    fc.reweight(Simplex({x, y}), weight)
+                else:
+                    fc.add_simplex(Simplex({x, y}), weight)
+                expected[(x, y)] = weight
+            vertex = int(rng.integers(40))
+            neighbours = {w for edge in expected if vertex in edge for w in edge if w != vertex}
+            self.assertEqual(fc.get_edge_neighbours(vertex), neighbours)
+            self.assertEqual(fc.get_lower_neighbours(vertex), {w for w in neighbours if w < vertex})
+            for w in neighbours:
+                self.assertEqual(fc.get_edge_weight(vertex, w), expected[tuple(sorted((vertex, w)))])
+            if step % 50 == 0:
+                adjacency = fc.get_adjacency()
+                vertex_count = int(fc.p_simplex_vertices(0).max()) + 1
+                rebuilt = Adjacency.from_edges(fc.p_simplex_vertices(1), fc.p_simplex_weights(1), vertex_count)
+                for name in ("indptr", "indices", "weights", "lower_end"):
+                    np.testing.assert_array_equal(getattr(adjacency, name), getattr(rebuilt, name))
+
+    def test_cap_view(self):
+        fc = FilteredSimplicialComplex()
+        for i in range(3):
+            fc.add_simplex(Simplex({i}), 0)
+        fc.add_simplex(Simplex({0, 1}), 1)
+        fc.add_simplex(Simplex({1, 2}), 2)
+        fc.add_simplex(Simplex({0, 2}), 3)
+        fc.add_simplex(Simplex({0, 1, 2}), 3)
+        view = fc.cap(2)
+        self.assertEqual(view.size, 5)
+        self.assertEqual(view.get_weight_ordering(), [0, 0, 0, 1, 2])
+        self.assertEqual(view.get_simplex_ordering()[3:], [Simplex({0, 1}), Simplex({1, 2})])
+        self.assertEqual(view.p_simplex_vertices(1).tolist(), [[0, 1], [1, 2]])
+        self.assertEqual(view.cap(1).size, 4)
+        self.assertTrue(view.materialise() == view.cap(2).materialise())
+
+        # Queries of the parent are answered for the view alone.
+        self.assertEqual(view.get_edge_neighbours(0), {1})
+        self.assertEqual(view.get_lower_neighbours(2), {1})
+        self.assertEqual(view.get_edge_weight(2, 1), 2)
+        with self.assertRaises(ValueError):
+            view.get_edge_weight(0, 2)
+        self.assertEqual(set(view.get_cofaces(Simplex({1}))), {Simplex({0, 1}), Simplex({1, 2})})
+        self.assertTrue(view == view.materialise())
+        self.assertTrue(view.materialise() == view)
+        self.assertFalse(view == fc)
+        self.assertTrue(fc.cap(3) == fc)
+        with self.assertRaises(TypeError):
+            view.add_simplex(Simplex({0, 2}), 2)
+
+        tree = FilteredSimplicialComplex(backend=SimplexTree())
+        for i in range(3):
+            tree.add_simplex(Simplex({i}), i)
+        self.assertIs(tree.cap(1).materialise().backend_type, SimplexTree)
+
+        fc.add_simplex(Simplex({3}), 0)
+        with self.assertRaises(ReferenceError):
+            view.get_weight_ordering()
@@ -0,0 +1,45 @@
+from itertools import combinations
+from unittest import TestCase
+
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.Simplex import Simplex
+from Complexes.SimplexTree import SimplexTree
+
+
+class TestSimplexTree(TestCase):
+    def setUp(self):
+        self.tree = SimplexTree()
+        self.tree.insert((0, 1, 2), 2.0)
+        self.tree.insert((2, 3), 3.0)
+        self.tree.set_weight((0,), 0.0)
+
+    def test_lookup(self):
+        self.assertEqual(self.tree.get_weight((2, 1, 0)), 2.0)
+        self.assertEqual(self.tree.get_weight((0,)), 0.0)
+        self.assertIsNone(self.tree.get_weight((0, 3)))
+        self.assertEqual([self.tree.p_count(p) for p in range(3)], [4, 4, 1])
+
+    def test_cofaces(self):
+        self.assertEqual(sorted(self.tree.cofaces((2,))), [(0, 1, 2), (0, 2), (1, 2), (2, 3)])
+        self.assertEqual(sorted(self.tree.cofaces((1,), codim=1)), [(0, 1), (1, 2)])
+        self.assertEqual(sorted(self.tree.link((2,))), [(0,), (0, 1), (1,), (3,)])
+
+    def test_facets(self):
+        self.assertEqual(sorted(self.tree.facets((0, 1, 2))), [(0, 1), (0, 2), (1, 2)])
+        self.assertEqual(sorted(self.tree.maximal_simplices()), [(0, 1, 2), (2, 3)])
+
+    def test_capped_iteration(self):
+        self.assertEqual(sorted(vertices for vertices, _ in self.tree.simplices(2.0)),
+                         [(0,), (0, 1), (0, 1, 2), (0, 2), (1,), (1, 2), (2,)])
+
+    def test_backend_matches_store(self):
+        tree_complex = FilteredSimplicialComplex(check_valid=True, backend=SimplexTree())
+        store_complex = FilteredSimplicialComplex(check_valid=True)
+        for p in range(4):
+            for vertices in combinations(range(6), p + 1):
+                tree_complex.add_simplex(Simplex(set(vertices)), p)
+                store_complex.add_simplex(Simplex(set(vertices)), p)
+        self.assertTrue(tree_complex == store_complex)
+        self.assertEqual(tree_complex.get_weight_ordering(), store_complex.get_weight_ordering())
+        self.assertEqual(sorted(map(str, tree_complex.get_cofaces(Simplex({0, 1, 2})))),
+                         sorted(map(str, store_complex.get_cofaces(Simplex({0, 1, 2})))))
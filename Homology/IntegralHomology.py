@@ -1,10 +1,141 @@
+from __future__ import annotations
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sparse
+
+from Complexes.Combinatorial import simplex_keys
 from Complexes.SimplicialComplex import SimplicialComplex
+from Homology.SNFIntSparse import SNFIntSparse
+
+PRIMES = (2, 3, 5, 7, 2 ** 31 - 1)
+
+
+def _column_add(indices: np.ndarray, values: np.ndarray, other_indices: np.ndarray, other_values: np.ndarray,
+                factor: int, prime: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The sparse column (indices, values) plus factor times the other one, modulo prime.
+    """
+    merged, inverse = np.unique(np.concatenate([indices, other_indices]), return_inverse=True)
+    # Values stay below the prime, which is below 2^31, so every product fits in int64.
+    summed = np.zeros(merged.shape[0], dtype=np.int64)
+    np.add.at(summed, inverse, np.concatenate([values, other_values * factor % prime]))
+    summed %= prime
+    keep = summed != 0
+    return merged[keep], summed[keep]
+
+
+def rank_mod_p(boundaries: Dict[int, sparse.csc_matrix], prime: int) -> Dict[int, int]:
+    """
+    Rank over Z/prime of every boundary operator. The transposes are reduced column by column from the lowest
+    dimension up, as in persistent cohomology: a (p + 1)-simplex that is the pivot of a reduced coboundary column of
+    a p-simplex has a coboundary column that reduces to zero and is skipped (clearing). Coboundaries of the few low
+    dimensional simplices are long but the many top dimensional ones mostly get cleared, which is the cheap way round
+    for Rips-like complexes.
+    """
+    ranks = dict()
+    cleared = np.empty(0, dtype=np.int64)
+    for p in sorted(boundaries):
+        coboundary = boundaries[p].T.tocsc()
+        skip = np.zeros(coboundary.shape[1], dtype=bool)
+        skip[cleared] = True
+        low: Dict[int, Tuple[np.ndarray, np.ndarray]] = dict()
+        for j in np.flatnonzero(~skip).tolist():
+            start, stop = coboundary.indptr[j], coboundary.indptr[j + 1]
+            indices = coboundary.indices[start:stop].astype(np.int64)
+            values = coboundary.data[start:stop].astype(np.int64) % prime
+            order = np.argsort(indices)
+            indices, values = indices[order], values[order]
+            while indices.shape[0] and int(indices[-1]) in low:
+                pivot_indices, pivot_values = low[int(indices[-1])]
+                factor = (prime - int(values[-1])) * pow(int(pivot_values[-1]), -1, prime) % prime
+                indices, values = _column_add(indices, values, pivot_indices, pivot_values, factor, prime)
+            if indices.shape[0]:
+                low[int(indices[-1])] = (indices, values)
+        ranks[p] = len(low)
+        cleared = np.array(sorted(low), dtype=np.int64)
+    return ranks
 
 
 class IntegralHomology:
+    """
+    Betti numbers and torsion coefficients of a simplicial complex with integer coefficients.
+
+    The boundary operators are sparse and their ranks are taken modulo each of the primes. The rank over Q is the
+    largest of them, and a boundary operator whose rank drops modulo some prime has torsion in its cokernel; only
+    those operators go through the sparse Smith normal form. Torsion whose order has no factor among the primes keeps
+    all the ranks equal and is not seen, so pass exact to run the Smith normal form on every operator.
+    """
     __complex: SimplicialComplex
+    __primes: Tuple[int, ...]
+    __exact: bool
+    __boundaries: Dict[int, sparse.csc_matrix] | None
+    __betti_numbers: List[int] | None
+    __torsion: List[List[int]] | None
+    _logger: logging.Logger
 
-    def __init__(self, simplicial_complex: SimplicialComplex):
+    def __init__(self, simplicial_complex: SimplicialComplex, primes: Sequence[int] = PRIMES, exact: bool = False):
         self.__complex = simplicial_complex
+        self.__primes = tuple(primes)
+        self.__exact = exact
+        self.__boundaries = None
+        self.__betti_numbers = None
+        self.__torsion = None
+        self._logger = logging.getLogger(__name__)
+
+    def boundary(self, p: int) -> sparse.csc_matrix:
+        """
+        The oriented boundary operator from p-chains to (p - 1)-chains, with the simplices of each dimension in the
+        order of p_simplex_vertices.
+        """
+        vertices = np.asarray(self.__complex.p_simplex_vertices(p))
+        if p == 0 or vertices.shape[0] == 0:
+            return sparse.csc_matrix((self.__complex.p_simplex_count(p - 1) if p > 0 else 0, vertices.shape[0]),
+                                     dtype=np.int64)
+        vertices = np.sort(vertices, axis=1)
+        facet_keys = np.stack([simplex_keys(np.delete(vertices, k, axis=1)) for k in range(p + 1)], axis=1)
+        keys = simplex_keys(np.sort(self.__complex.p_simplex_vertices(p - 1), axis=1))
+        order = np.argsort(keys, kind="stable")
+        positions = np.searchsorted(keys[order], facet_keys.ravel())
+        if (positions >= keys.shape[0]).any() or (keys[order][positions] != facet_keys.ravel()).any():
+            raise ValueError(f"Complex is missing a facet of a {p}-simplex.")
+        rows = order[positions]
+        columns = np.repeat(np.arange(vertices.shape[0]), p + 1)
+        signs = np.tile(np.where(np.arange(p + 1) % 2 == 0, 1, -1), vertices.shape[0])
+        return sparse.csc_matrix((signs, (rows, columns)), shape=(keys.shape[0], vertices.shape[0]), dtype=np.int64)
+
+    def compute(self) -> None:
+        dim = self.__complex.dim
+        self.__boundaries = {p: self.boundary(p) for p in range(1, dim + 1)}
+        self._logger.info("Boundary operators constructed.")
+
+        ranks = {prime: rank_mod_p(self.__boundaries, prime) for prime in self.__primes}
+        rational = {p: max(ranks[prime][p] for prime in self.__primes) for p in self.__boundaries}
+        self._logger.info(f"Ranks modulo {self.__primes} computed.")
+
+        # Torsion of H_p comes from the invariant factors of the boundary of the (p + 1)-simplices.
+        torsion = [[] for _ in range(dim + 1)]
+        for p, boundary in self.__boundaries.items():
+            if self.__exact or any(ranks[prime][p] < rational[p] for prime in self.__primes):
+                snf = SNFIntSparse(boundary)
+                snf.compute_snf()
+                torsion[p - 1] = [factor for factor in snf.invariant_factors if factor > 1]
+                self._logger.info(f"Smith normal form of the boundary of the {p}-simplices computed.")
+
+        self.__betti_numbers = [self.__complex.p_simplex_count(p) - rational.get(p, 0) - rational.get(p + 1, 0)
+                                for p in range(dim + 1)]
+        self.__torsion = torsion
+
+    @property
+    def betti_numbers(self) -> List[int]:
+        assert self.__betti_numbers is not None, "Homology has not been computed."
+        return list(self.__betti_numbers)
 
-    
\ No newline at end of file
+    @property
+    def torsion(self) -> List[List[int]]:
+        """
+        For every dimension p, the torsion coefficients of H_p: H_p is Z^b_p plus the sum of the Z/t.
+        """
+        assert self.__torsion is not None, "Homology has not been computed."
+        return [list(coefficients) for coefficients in self.__torsion]
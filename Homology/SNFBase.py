@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import List
+
 import numpy as np
 import logging
 
@@ -6,11 +8,13 @@ import logging
 class SNFBase(ABC):
     _matrix: np.matrix
     _snf_matrix: np.matrix | None
+    _invariant_factors: List[int] | None
     _logger: logging.Logger
 
     def __init__(self, matrix: np.matrix):
         self._matrix = matrix
         self._snf_matrix = None
+        self._invariant_factors = None
         self._logger = logging.getLogger(__name__)
 
     @abstractmethod
@@ -24,4 +28,19 @@ class SNFBase(ABC):
 
     @property
     def original_matrix(self) -> np.matrix:
-        return self._matrix.copy()
\ No newline at end of file
+        return self._matrix.copy()
+
+    @property
+    def invariant_factors(self) -> List[int]:
+        """
+        The non-zero diagonal entries of the Smith normal form, positive and each dividing the next.
+        """
+        if self._invariant_factors is None:
+            assert self._snf_matrix is not None, "Smith normal form matrix has not been computed."
+            diagonal = np.asarray(self._snf_matrix.diagonal()).ravel().tolist()
+            self._invariant_factors = sorted(abs(int(entry)) for entry in diagonal if entry != 0)
+        return list(self._invariant_factors)
+
+    @property
+    def rank(self) -> int:
+        return len(self.invariant_factors)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+import heapq
+import math
+from abc import ABC
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sparse
+
+from Homology.SNFBase import SNFBase
+
+# Dense int64 arithmetic is only trusted while every entry stays below this bound.
+_INT64_SAFE = 2 ** 62
+
+
+class SNFIntSparse(SNFBase, ABC):
+    """
+    Smith normal form of a sparse integer matrix, given as an np.matrix or a scipy sparse matrix.
+
+    Rows are dicts of Python ints, so entries cannot overflow. Unit pivots are eliminated first, Markowitz-style: the
+    column with the fewest entries that has a +-1 in it, on the shortest such row, which keeps the fill-in low. A unit
+    pivot contributes an invariant factor of 1 and its row and column drop out. Only what is left without units, in
+    practice a small block, is made dense and diagonalised with gcd steps, in int64 for as long as the entries stay
+    well inside its range and in Python ints after that.
+
+    The Smith normal form matrix is a scipy sparse diagonal matrix unless the input was an np.matrix.
+    """
+    __rows: Dict[int, Dict[int, int]]
+    __cols: Dict[int, Set[int]]
+    __shape: Tuple[int, int]
+
+    def __init__(self, input_matrix: np.matrix[int, ...] | sparse.spmatrix):
+        super().__init__(input_matrix)
+        coo = sparse.coo_matrix(input_matrix)
+        self.__shape = coo.shape
+        self.__rows = dict()
+        self.__cols = dict()
+        for row, col, value in zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist()):
+            entries = self.__rows.setdefault(row, dict())
+            entries[col] = entries.get(col, 0) + int(value)
+        for row, entries in list(self.__rows.items()):
+            for col, value in list(entries.items()):
+                if value == 0:
+                    del entries[col]
+                else:
+                    self.__cols.setdefault(col, set()).add(row)
+            if not entries:
+                del self.__rows[row]
+        self._logger.info("Matrix initialised into correct data type.")
+
+    def __unit_row(self, col: int) -> int | None:
+        best, best_count = None, None
+        for row in self.__cols[col]:
+            if abs(self.__rows[row][col]) == 1 and (best is None or len(self.__rows[row]) < best_count):
+                best, best_count = row, len(self.__rows[row])
+        return best
+
+    def __eliminate(self, row: int, col: int) -> Set[int]:
+        """
+        Clears the column of a unit pivot with row operations, then drops its row and column; column operations would
+        clear the row without touching anything else. Returns the columns whose entries changed.
+        """
+        pivot_row = self.__rows.pop(row)
+        unit = pivot_row.pop(col)
+        touched = set(pivot_row)
+        for other in self.__cols.pop(col) - {row}:
+            entries = self.__rows[other]
+            factor = entries.pop(col) * unit
+            for other_col, value in pivot_row.items():
+                updated = entries.get(other_col, 0) - factor * value
+                if updated:
+                    entries[other_col] = updated
+                    self.__cols[other_col].add(other)
+                else:
+                    entries.pop(other_col, None)
+                    self.__cols[other_col].discard(other)
+            if not entries:
+                del self.__rows[other]
+        for other_col in pivot_row:
+            self.__cols[other_col].discard(row)
+        return touched
+
+    def __eliminate_units(self) -> int:
+        unit_count = 0
+        heap = [(len(rows), col) for col, rows in self.__cols.items()]
+        heapq.heapify(heap)
+        while heap:
+            count, col = heapq.heappop(heap)
+            if col not in self.__cols or len(self.__cols[col]) != count:
+                continue
+            if count == 0:
+                del self.__cols[col]
+                continue
+            row = self.__unit_row(col)
+            if row is None:
+                # Left for the residual block unless an elimination changes the column again.
+                continue
+            for touched in self.__eliminate(row, col):
+                heapq.heappush(heap, (len(self.__cols[touched]), touched))
+            unit_count += 1
+        return unit_count
+
+    @staticmethod
+    def __fits(matrix: np.ndarray, target: np.ndarray, source: np.ndarray, factor: int) -> bool:
+        if matrix.dtype == object:
+            return True
+        bound = abs(factor) * int(np.abs(source).max(initial=0)) + int(np.abs(target).max(initial=0))
+        return bound < _INT64_SAFE
+
+    @staticmethod
+    def __diagonalise(matrix: np.ndarray) -> List[int]:
+        """
+        Diagonal of an equivalent matrix, by repeatedly taking the smallest entry as the pivot and reducing its row
+        and column modulo it; a non-zero remainder is a smaller entry and becomes the next pivot.
+        """
+        diagonal = []
+        while matrix.size and matrix.any():
+            nonzero = np.argwhere(matrix != 0)
+            magnitudes = np.abs(matrix[nonzero[:, 0], nonzero[:, 1]])
+            row, col = nonzero[int(np.argmin(magnitudes))].tolist()
+            pivot = int(matrix[row, col])
+            done = True
+            for other in np.flatnonzero(matrix[:, col]).tolist():
+                if other == row:
+                    continue
+                factor = int(matrix[other, col]) // pivot
+                if not SNFIntSparse.__fits(matrix, matrix[other], matrix[row], factor):
+                    matrix = matrix.astype(object)
+                matrix[other] -= factor * matrix[row]
+                done &= matrix[other, col] == 0
+            for other in np.flatnonzero(matrix[row]).tolist():
+                if other == col:
+                    continue
+                factor = int(matrix[row, other]) // pivot
+                if not SNFIntSparse.__fits(matrix, matrix[:, other], matrix[:, col], factor):
+                    matrix = matrix.astype(object)
+                matrix[:, other] -= factor * matrix[:, col]
+                done &= matrix[row, other] == 0
+            if done:
+                diagonal.append(abs(pivot))
+                matrix = np.delete(np.delete(matrix, row, axis=0), col, axis=1)
+        return diagonal
+
+    @staticmethod
+    def __divisibility_chain(diagonal: List[int]) -> List[int]:
+        """
+        diag(a, b) is equivalent to diag(gcd(a, b), lcm(a, b)), which turns any diagonal into invariant factors.
+        """
+        factors = sorted(diagonal)
+        for i in range(len(factors)):
+            for j in range(i + 1, len(factors)):
+                a, b = factors[i], factors[j]
+                if b % a:
+                    gcd = math.gcd(a, b)
+                    factors[i], factors[j] = gcd, a // gcd * b
+        return factors
+
+    def compute_snf(self):
+        unit_count = self.__eliminate_units()
+        self._logger.info(f"Eliminated {unit_count} unit pivots, {len(self.__rows)} rows left.")
+
+        rows = sorted(self.__rows)
+        cols = sorted(self.__cols)
+        col_position = {col: i for i, col in enumerate(cols)}
+        residual = np.zeros((len(rows), len(cols)), dtype=np.int64)
+        if any(abs(value) >= _INT64_SAFE for entries in self.__rows.values() for value in entries.values()):
+            residual = residual.astype(object)
+        for i, row in enumerate(rows):
+            for col, value in self.__rows[row].items():
+                residual[i, col_position[col]] = value
+        factors = [1] * unit_count + self.__divisibility_chain(self.__diagonalise(residual))
+        self._invariant_factors = sorted(factors)
+        self._logger.info("SNF computed.")
+
+    @property
+    def snf_matrix(self) -> np.matrix | sparse.csr_matrix:
+        """
+        Built from the invariant factors when first asked for, in the form of the input.
+        """
+        assert self._invariant_factors is not None, "Smith normal form matrix has not been computed."
+        if self._snf_matrix is None:
+            factors = self._invariant_factors
+            index = np.arange(len(factors))
+            if isinstance(self._matrix, np.matrix):
+                fits = not factors or factors[-1] < _INT64_SAFE
+                matrix = np.zeros(self.__shape, dtype=np.int64 if fits else object)
+                matrix[index, index] = factors
+                self._snf_matrix = np.matrix(matrix)
+            else:
+                if factors and factors[-1] >= _INT64_SAFE:
+                    raise OverflowError("Invariant factors exceed int64, use invariant_factors instead.")
+                self._snf_matrix = sparse.csr_matrix((np.array(factors, dtype=np.int64), (index, index)),
+                                                     shape=self.__shape)
+            self._logger.info("SNF matrix casted to the data type of the input.")
+        return self._snf_matrix.copy()
@@ -24,12 +24,13 @@ class SNFIntSymPy(SNFBase, ABC):
 
     @staticmethod
     def __snf_input_matrix_to_np_matrix(input_matrix: sp.Matrix) -> np.matrix[int, ...]:
-        np_matrix = np.matrix(input_matrix)
+        np_matrix = np.matrix([[int(entry) for entry in row] for row in input_matrix.tolist()], dtype=object)
+        np_matrix = np_matrix.reshape(input_matrix.shape)
         return np_matrix
 
     def compute_snf(self):
-        snf = sp.matrices.normalforms.smith_normal_form(self.__snf_input_matrix)
+        snf = smith_normal_form(self.__snf_input_matrix)
         self._logger.info("SNF computed.")
-        print(snf)
+        self._snf_matrix = self.__snf_input_matrix_to_np_matrix(snf)
         self._logger.info("SNF matrix casted to np.matrix data type.")
 
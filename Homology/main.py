@@ -1,6 +1,7 @@
 import numpy as np
 import logging
 
+from Homology.SNFIntSparse import SNFIntSparse
 from Homology.SNFIntStd import SNFIntStd
 from Homology.SNFIntSymPy import SNFIntSymPy
 
@@ -8,5 +9,6 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
     mat = np.matrix(np.random.randint(-1, 1, (50, 50)))
     # mat = np.matrix([[1, 2, 3], [3, 4, 3]])
-    obj = SNFIntSymPy(mat)
+    obj = SNFIntSparse(mat)
     obj.compute_snf()
+    print(obj.invariant_factors)
@@ -0,0 +1,51 @@
+from itertools import combinations
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.Simplex import Simplex
+from Complexes.SimplicialComplex import SimplicialComplex
+from Homology.IntegralHomology import IntegralHomology, rank_mod_p
+from PersistentHomology.Differential import random_complex
+
+
+def closure(top_simplices) -> SimplicialComplex:
+    simplicial_complex = SimplicialComplex(check_valid=True)
+    faces = {face for simplex in top_simplices for k in range(1, len(simplex) + 1)
+             for face in combinations(sorted(simplex), k)}
+    for face in sorted(faces, key=len):
+        simplicial_complex.add_simplex(Simplex(set(face)))
+    return simplicial_complex
+
+
+# Six-vertex projective plane and seven-vertex torus.
+PROJECTIVE_PLANE = [(0, 1, 2), (0, 2, 3), (0, 3, 4), (0, 4, 5), (0, 5, 1), (1, 2, 4), (2, 3, 5), (3, 4, 1), (4, 5, 2),
+                    (5, 1, 3)]
+TORUS = [tuple((vertex + shift) % 7 for vertex in triangle) for shift in range(7) for triangle in [(0, 1, 3), (0, 2, 3)]]
+
+
+class TestIntegralHomology(TestCase):
+    def homology(self, simplicial_complex, exact=False):
+        homology = IntegralHomology(simplicial_complex, exact=exact)
+        homology.compute()
+        return homology.betti_numbers, homology.torsion
+
+    def test_surfaces(self):
+        for exact in (False, True):
+            self.assertEqual(self.homology(closure(combinations(range(4), 3)), exact), ([1, 0, 1], [[], [], []]))
+            self.assertEqual(self.homology(closure(PROJECTIVE_PLANE), exact), ([1, 0, 0], [[], [2], []]))
+            self.assertEqual(self.homology(closure(TORUS), exact), ([1, 2, 1], [[], [], []]))
+
+    def test_ranks_modulo_primes(self):
+        homology = IntegralHomology(closure(PROJECTIVE_PLANE))
+        boundaries = {p: homology.boundary(p) for p in (1, 2)}
+        self.assertEqual(rank_mod_p(boundaries, 2), {1: 5, 2: 9})
+        self.assertEqual(rank_mod_p(boundaries, 3), {1: 5, 2: 10})
+        self.assertEqual(np.linalg.matrix_rank(boundaries[2].toarray()), 10)
+
+    def test_fast_path_matches_exact(self):
+        for seed in range(30):
+            simplices = random_complex(np.random.default_rng(seed), max_vertices=7)
+            simplices.pop((), None)
+            simplicial_complex = closure(simplices)
+            self.assertEqual(self.homology(simplicial_complex), self.homology(simplicial_complex, exact=True))
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import numpy as np
+import scipy.sparse as sparse
+
+from Homology.SNFIntSparse import SNFIntSparse
+from Homology.SNFIntSymPy import SNFIntSymPy
+from PersistentHomology.Benchmark import full_simplex
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+
+
+class TestSNFIntSparse(TestCase):
+    def test_matches_sympy(self):
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            rows, cols = rng.integers(1, 7, 2)
+            matrix = np.matrix(rng.integers(-4, 5, (rows, cols)) * (rng.random((rows, cols)) < 0.6))
+            engine, reference = SNFIntSparse(matrix), SNFIntSymPy(matrix)
+            engine.compute_snf()
+            reference.compute_snf()
+            self.assertEqual(engine.invariant_factors, reference.invariant_factors)
+            self.assertEqual(engine.snf_matrix.shape, matrix.shape)
+
+    def test_torsion(self):
+        # Its columns span a sublattice of index 2 of their span, the torsion a boundary of the projective plane has.
+        boundary = sparse.csr_matrix(np.array([[1, 1], [1, -1], [0, 0]]))
+        engine = SNFIntSparse(boundary)
+        engine.compute_snf()
+        self.assertEqual(engine.invariant_factors, [1, 2])
+        self.assertEqual(engine.snf_matrix.toarray().tolist(), [[1, 0], [0, 2], [0, 0]])
+
+    def test_large_entries_do_not_overflow(self):
+        matrix = np.matrix([[2 ** 40, 3], [5, 2 ** 41]])
+        engine = SNFIntSparse(matrix)
+        engine.compute_snf()
+        self.assertEqual(engine.invariant_factors, [1, 2 ** 81 - 15])
+
+    def test_sparse_boundary(self):
+        # The full simplex on 9 vertices is acyclic up to one component: rank (2^9 - 1 - 1) / 2 and no torsion.
+        boundary = BoundaryMatrix.from_complex(full_simplex(9, 0))
+        matrix = sparse.csc_matrix((boundary.data.astype(np.int64), boundary.indices, boundary.indptr),
+                                   shape=(boundary.size, boundary.size))
+        engine = SNFIntSparse(matrix)
+        engine.compute_snf()
+        self.assertEqual(engine.invariant_factors, [1] * 255)
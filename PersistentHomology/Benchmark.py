@@ -0,0 +1,201 @@
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+from PersistentHomology.PersHom1 import PersHom1
+from PersistentHomology.PersHom2 import PersHom2
+from PersistentHomology.PersHom3 import PersHom3
+from PersistentHomology.PersHom4 import PersHom4
+
+
+class _VR(Vectorized, Incremental):
+    pass
+
+
+def full_simplex(size: int, seed: int) -> FilteredSimplicialComplex:
+    """
+    Every face of the simplex on size vertices, weighted by its vertex count.
+    """
+    fc = FilteredSimplicialComplex()
+    for k in range(1, size + 1):
+        faces = np.array(list(itertools.combinations(range(size), k)), dtype=np.int64)
+        fc.add_simplices(faces, np.full(faces.shape[0], k, dtype=np.float64))
+    return fc
+
+
+def _rips(points: np.ndarray, max_dim: int = 2, metric: str = "euclidean") -> FilteredSimplicialComplex:
+    vr = _VR(list(points), np.inf, metric)
+    return vr.compute(max_dim)
+
+
+def vr_uniform(size: int, seed: int) -> FilteredSimplicialComplex:
+    return _rips(np.random.default_rng(seed).random((size, 2)))
+
+
+def vr_torus(size: int, seed: int) -> FilteredSimplicialComplex:
+    angles = np.random.default_rng(seed).random((size, 2)) * 2 * np.pi
+    radius = 2 + np.cos(angles[:, 1])
+    return _rips(np.column_stack([radius * np.cos(angles[:, 0]), radius * np.sin(angles[:, 0]), np.sin(angles[:, 1])]))
+
+
+def vr_sphere(size: int, seed: int) -> FilteredSimplicialComplex:
+    points = np.random.default_rng(seed).normal(size=(size, 3))
+    return _rips(points / np.linalg.norm(points, axis=1, keepdims=True))
+
+
+def erdos_renyi(size: int, seed: int, probability: float = 0.3) -> FilteredSimplicialComplex:
+    """
+    Clique complex of G(size, probability) with uniform random edge weights, up to triangles.
+    """
+    rng = np.random.default_rng(seed)
+    distances = np.triu(rng.random((size, size)), 1)
+    distances[np.triu(rng.random((size, size)) >= probability, 1)] = np.inf
+    distances = distances + distances.T
+    return _rips(distances, metric="precomputed")
+
+
+def flat_ties(size: int, seed: int) -> FilteredSimplicialComplex:
+    """
+    Complete graph and its triangles with every weight equal, so the order is decided by tie-breaking alone.
+    """
+    distances = np.ones((size, size)) - np.eye(size)
+    return _rips(distances, metric="precomputed")
+
+
+# Workload name to builder and the sizes run by default.
+WORKLOADS: Dict[str, Tuple[Callable[[int, int], FilteredSimplicialComplex], Tuple[int, ...]]] = {
+    "full_simplex": (full_simplex, (8, 10)),
+    "vr_uniform": (vr_uniform, (20, 30)),
+    "vr_torus": (vr_torus, (20, 30)),
+    "vr_sphere": (vr_sphere, (20, 30)),
+    "erdos_renyi": (erdos_renyi, (30, 45)),
+    "flat_ties": (flat_ties, (15, 20)),
+}
+
+ENGINES: Dict[str, Callable] = {
+    "PersHom1": PersHom1,
+    "PersHom2": PersHom2,
+    "PersHom3": PersHom3,
+    "PersHom4": PersHom4,
+}
+
+
+def _run(engine: Callable, fc: FilteredSimplicialComplex):
+    pers_hom = engine(fc)
+    pers_hom.compute()
+    return pers_hom
+
+
+def run_benchmark(workloads: Sequence[str] | None = None, engines: Sequence[str] | None = None,
+                  sizes: Sequence[int] | None = None, repeats: int = 3, warmup: int = 1, seed: int = 0) -> List[Dict]:
+    """
+    Times construction plus compute of every engine on every workload. Each measurement is preceded by warmup
+    untimed runs; peak memory is taken in a separate traced run so that tracing does not slow the timed ones.
+    """
+    results = []
+    for workload in workloads or WORKLOADS:
+        builder, default_sizes = WORKLOADS[workload]
+        for size in sizes or default_sizes:
+            fc = builder(size, seed)
+            fc.get_filtration()
+            for name in engines or ENGINES:
+                engine = ENGINES[name]
+                for _ in range(warmup):
+                    _run(engine, fc)
+                times = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    pers_hom = _run(engine, fc)
+                    times.append(time.perf_counter() - start)
+                tracemalloc.start()
+                _run(engine, fc)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                results.append({
+                    "workload": workload,
+                    "size": size,
+                    "engine": name,
+                    "simplices": fc.size,
+                    "points": len(pers_hom.get_pers_diag()),
+                    "times": times,
+                    "median": statistics.median(times),
+                    "min": min(times),
+                    "peak_bytes": peak,
+                })
+    return results
+
+
+def save_results(results: List[Dict], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump({"results": results}, file, indent=2)
+
+
+def load_results(path: str) -> List[Dict]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float = 0.25,
+            memory_tolerance: float = 0.25) -> List[Dict]:
+    """
+    Regressions against a baseline: runs whose median time or peak memory grew by more than the tolerance, or whose
+    number of diagram points changed. Runs missing from the baseline are not compared.
+    """
+    reference = {(result["workload"], result["size"], result["engine"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        key = (result["workload"], result["size"], result["engine"])
+        if key not in reference:
+            continue
+        old = reference[key]
+        for metric, allowed in (("median", tolerance), ("peak_bytes", memory_tolerance)):
+            if result[metric] > old[metric] * (1 + allowed):
+                regressions.append({"workload": key[0], "size": key[1], "engine": key[2], "metric": metric,
+                                    "baseline": old[metric], "current": result[metric],
+                                    "ratio": result[metric] / old[metric] if old[metric] else np.inf})
+        if result["points"] != old["points"]:
+            regressions.append({"workload": key[0], "size": key[1], "engine": key[2], "metric": "points",
+                                "baseline": old["points"], "current": result["points"], "ratio": np.nan})
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the persistent homology engines.")
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS))
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES))
+    parser.add_argument("--sizes", nargs="+", type=int)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", help="Where to write the results as JSON.")
+    parser.add_argument("--baseline", help="Results JSON to compare against; regressions give exit status 1.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.workloads, args.engines, args.sizes, args.repeats, args.warmup)
+    for result in results:
+        print(f"{result['workload']:>12} {result['size']:>4} {result['engine']:>8}: "
+              f"{result['median'] * 1000:9.2f} ms {result['peak_bytes'] / 2 ** 20:8.2f} MiB")
+    if args.output:
+        save_results(results, args.output)
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.tolerance, args.tolerance)
+        for regression in regressions:
+            print(f"Regression in {regression['workload']} {regression['size']} {regression['engine']}: "
+                  f"{regression['metric']} {regression['baseline']} -> {regression['current']}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
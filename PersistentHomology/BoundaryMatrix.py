@@ -0,0 +1,114 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from Complexes.Combinatorial import simplex_keys
+
+
+@dataclass(frozen=True)
+class BoundaryMatrix:
+    """
+    Boundary matrix of a filtered complex in compressed sparse column form, with rows and columns in filtration order.
+    The rows of column j are indices[indptr[j]:indptr[j + 1]] in increasing order and data holds the signs of the
+    oriented boundary, (-1)^k for the facet without the k-th vertex. Memory is linear in the number of non-zeros,
+    which is p + 1 for a p-simplex (one for a vertex if the complex has the empty simplex).
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    dims: np.ndarray
+    weights: np.ndarray
+
+    @staticmethod
+    def from_complex(filtered_complex) -> BoundaryMatrix:
+        """
+        Works with anything exposing get_filtration and p_simplex_vertices, such as a FilteredSimplicialComplex or a
+        CappedComplex.
+        """
+        filtration = filtered_complex.get_filtration()
+        size = filtration.size
+        p_positions = dict()
+        for p in filtration.p_orders:
+            positions = np.empty(filtration.p_orders[p].shape[0], dtype=np.int64)
+            mask = filtration.dims == p
+            positions[filtration.rows[mask]] = np.flatnonzero(mask)
+            p_positions[p] = positions
+
+        columns: List[np.ndarray] = []
+        rows: List[np.ndarray] = []
+        signs: List[np.ndarray] = []
+        for p in filtration.p_orders:
+            if p < 0 or p == 0 and -1 not in p_positions:
+                continue
+            if p - 1 not in p_positions:
+                raise ValueError(f"Complex is missing a facet of a {p}-simplex.")
+            vertices = np.sort(filtered_complex.p_simplex_vertices(p), axis=1)
+            if p == 0:
+                # Every vertex has the empty simplex as its only facet.
+                facet_rows = np.zeros((vertices.shape[0], 1), dtype=np.int64)
+            else:
+                facet_keys = np.stack([simplex_keys(np.delete(vertices, k, axis=1)) for k in range(p + 1)], axis=1)
+                facet_rows = BoundaryMatrix.__find_rows(filtered_complex.p_simplex_vertices(p - 1), facet_keys, p)
+            columns.append(np.repeat(p_positions[p], p + 1))
+            rows.append(p_positions[p - 1][facet_rows].ravel())
+            signs.append(np.tile(np.where(np.arange(p + 1) % 2 == 0, 1, -1).astype(np.int8), vertices.shape[0]))
+
+        if columns:
+            columns, rows, signs = np.concatenate(columns), np.concatenate(rows), np.concatenate(signs)
+        else:
+            columns, rows, signs = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8)
+        order = np.lexsort((rows, columns))
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=size), out=indptr[1:])
+        return BoundaryMatrix(indptr, rows[order].astype(np.int32), signs[order], filtration.dims.copy(),
+                              filtration.weights.copy())
+
+    @staticmethod
+    def __find_rows(facet_vertices: np.ndarray, facet_keys: np.ndarray, p: int) -> np.ndarray:
+        """
+        Rows of p_simplex_vertices(p - 1) holding the facets with the given keys.
+        """
+        keys = simplex_keys(np.sort(facet_vertices, axis=1))
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        positions = np.searchsorted(sorted_keys, facet_keys.ravel())
+        found = positions < sorted_keys.shape[0]
+        found[found] = sorted_keys[positions[found]] == facet_keys.ravel()[found]
+        if not found.all():
+            raise ValueError(f"Complex is missing a facet of a {p}-simplex.")
+        return order[positions].reshape(facet_keys.shape)
+
+    @property
+    def size(self) -> int:
+        return self.dims.shape[0]
+
+    @property
+    def nnz(self) -> int:
+        return self.indices.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.indptr, self.indices, self.data, self.dims, self.weights))
+
+    def column(self, j: int) -> np.ndarray:
+        return self.indices[self.indptr[j]:self.indptr[j + 1]]
+
+    def column_signs(self, j: int) -> np.ndarray:
+        return self.data[self.indptr[j]:self.indptr[j + 1]]
+
+    def p_columns(self, p: int) -> np.ndarray:
+        """
+        Columns of the p-simplices in filtration order.
+        """
+        return np.flatnonzero(self.dims == p)
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Z2 boundary matrix as a dense array; only meant for small complexes.
+        """
+        dense = np.zeros((self.size, self.size))
+        columns = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        dense[self.indices, columns] = 1
+        return dense
@@ -0,0 +1,247 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import heapq
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+
+class Column(ABC):
+    """
+    A Z2 column of a boundary matrix: the set of row indices holding a one. All columns of a matrix have the same
+    type and are created with the row count of the matrix.
+    """
+
+    @classmethod
+    @abstractmethod
+    def from_indices(cls, indices: Iterable[int], size: int) -> Column:
+        pass
+
+    @property
+    @abstractmethod
+    def low(self) -> int | None:
+        """
+        The largest row index in the column, None if the column is zero.
+        """
+        pass
+
+    @abstractmethod
+    def add(self, other: Column) -> None:
+        """
+        self <- self + other
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def indices(self) -> np.ndarray:
+        """
+        The row indices in increasing order.
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Number of non-zeros.
+        """
+        pass
+
+    def __bool__(self) -> bool:
+        return self.low is not None
+
+
+class SetColumn(Column):
+    """
+    Python set with a lazy max-heap of its entries beside it. Entries added to the set are pushed on the heap and
+    entries cancelled from the set are only dropped from the heap when they reach the top, so the pivot is the first
+    entry of the heap still in the set. The heap is rebuilt when stale entries outnumber live ones.
+    """
+    __entries: Set[int]
+    __heap: List[int]  # Negated entries, some of them possibly no longer in the set.
+
+    def __init__(self, entries: Set[int]):
+        self.__entries = entries
+        self.__rebuild()
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int], size: int) -> SetColumn:
+        return cls(set(int(i) for i in indices))
+
+    def __rebuild(self) -> None:
+        self.__heap = [-entry for entry in self.__entries]
+        heapq.heapify(self.__heap)
+
+    @property
+    def low(self) -> int | None:
+        heap, entries = self.__heap, self.__entries
+        while heap and -heap[0] not in entries:
+            heapq.heappop(heap)
+        return -heap[0] if heap else None
+
+    def add(self, other: SetColumn) -> None:
+        added = other.__entries - self.__entries
+        self.__entries ^= other.__entries
+        if len(self.__heap) + len(added) > 2 * len(self.__entries) + 16:
+            self.__rebuild()
+            return
+        for entry in added:
+            heapq.heappush(self.__heap, -entry)
+
+    def clear(self) -> None:
+        self.__entries = set()
+        self.__heap = []
+
+    def indices(self) -> np.ndarray:
+        return np.array(sorted(self.__entries), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+class SortedArrayColumn(Column):
+    """
+    Sorted int64 array; the pivot is the last entry and addition is a merge that drops the common entries.
+    """
+    __entries: np.ndarray
+
+    def __init__(self, entries: np.ndarray):
+        self.__entries = entries
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int], size: int) -> SortedArrayColumn:
+        return cls(np.unique(np.fromiter(indices, dtype=np.int64)))
+
+    @property
+    def low(self) -> int | None:
+        if self.__entries.shape[0] == 0:
+            return None
+        return int(self.__entries[-1])
+
+    def add(self, other: SortedArrayColumn) -> None:
+        self.__entries = np.setxor1d(self.__entries, other.__entries, assume_unique=True)
+
+    def clear(self) -> None:
+        self.__entries = np.empty(0, dtype=np.int64)
+
+    def indices(self) -> np.ndarray:
+        return self.__entries
+
+    def __len__(self) -> int:
+        return self.__entries.shape[0]
+
+
+class HeapColumn(Column):
+    """
+    Lazy max-heap: addition pushes the entries of the other column and entries that occur an even number of times are
+    only cancelled when they reach the top.
+    """
+    __heap: List[int]
+
+    def __init__(self, heap: List[int]):
+        self.__heap = heap
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int], size: int) -> HeapColumn:
+        heap = [-int(i) for i in set(int(i) for i in indices)]
+        heapq.heapify(heap)
+        return cls(heap)
+
+    @property
+    def low(self) -> int | None:
+        heap = self.__heap
+        while heap:
+            top = heap[0]
+            heapq.heappop(heap)
+            if heap and heap[0] == top:
+                heapq.heappop(heap)
+                continue
+            heapq.heappush(heap, top)
+            return -top
+        return None
+
+    def add(self, other: HeapColumn) -> None:
+        for entry in other.__prune():
+            heapq.heappush(self.__heap, entry)
+
+    def clear(self) -> None:
+        self.__heap = []
+
+    def __prune(self) -> List[int]:
+        """
+        Cancels all paired entries, leaving the heap with distinct entries only.
+        """
+        counts: Dict[int, int] = dict()
+        for entry in self.__heap:
+            counts[entry] = counts.get(entry, 0) ^ 1
+        if len(counts) != len(self.__heap):
+            self.__heap = [entry for entry, odd in counts.items() if odd]
+            heapq.heapify(self.__heap)
+        return self.__heap
+
+    def indices(self) -> np.ndarray:
+        return np.sort(-np.array(self.__prune(), dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.__prune())
+
+
+class BitColumn(Column):
+    """
+    Bit vector packed into uint64 words. Addition is a word-wise xor up to the highest non-zero word of either column,
+    which is tracked so the pivot search only scans downwards from it.
+    """
+    __words: np.ndarray
+    __top: int
+
+    def __init__(self, words: np.ndarray):
+        self.__words = words
+        self.__top = words.shape[0] - 1
+        self.__settle()
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int], size: int) -> BitColumn:
+        indices = np.fromiter(indices, dtype=np.int64)
+        words = np.zeros((size + 63) // 64, dtype=np.uint64)
+        np.bitwise_xor.at(words, indices >> 6, np.left_shift(np.uint64(1), (indices & 63).astype(np.uint64)))
+        return cls(words)
+
+    def __settle(self) -> None:
+        nonzero = np.flatnonzero(self.__words[:self.__top + 1])
+        self.__top = int(nonzero[-1]) if nonzero.shape[0] else -1
+
+    @property
+    def low(self) -> int | None:
+        if self.__top < 0:
+            return None
+        return self.__top * 64 + int(self.__words[self.__top]).bit_length() - 1
+
+    def add(self, other: BitColumn) -> None:
+        end = other.__top + 1
+        np.bitwise_xor(self.__words[:end], other.__words[:end], out=self.__words[:end])
+        if end > self.__top:
+            self.__top = end - 1
+        if self.__top == other.__top:
+            self.__settle()
+
+    def clear(self) -> None:
+        self.__words[:self.__top + 1] = 0
+        self.__top = -1
+
+    def indices(self) -> np.ndarray:
+        bits = np.unpackbits(self.__words[:self.__top + 1].view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits)
+
+    def __len__(self) -> int:
+        return int(np.unpackbits(self.__words[:self.__top + 1].view(np.uint8)).sum())
+
+
+COLUMN_TYPES = {
+    "set": SetColumn,
+    "sorted": SortedArrayColumn,
+    "heap": HeapColumn,
+    "bit": BitColumn,
+}
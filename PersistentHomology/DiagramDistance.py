@@ -0,0 +1,257 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial import cKDTree
+
+if TYPE_CHECKING:
+    from PersistentHomology.PersHomBase import PersDiag
+
+METRICS = ("bottleneck", "wasserstein")
+
+
+def _split(diag: PersDiag, dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The finite points of a dimension as an (n, 2) array and the sorted births of its essential points.
+    """
+    mask = diag.dims == dim
+    born, die = diag.born[mask], diag.die[mask]
+    finite = np.isfinite(die)
+    points = np.column_stack([born[finite], die[finite]])
+    # Points on the diagonal are at distance zero from it and never change a distance.
+    points = points[points[:, 1] > points[:, 0]]
+    return points, np.sort(born[~finite])
+
+
+def _diagonal_distance(points: np.ndarray, internal_p: float) -> np.ndarray:
+    half = (points[:, 1] - points[:, 0]) / 2
+    return half if np.isinf(internal_p) else half * 2 ** (1 / internal_p)
+
+
+def _hopcroft_karp(left_count: int, right_count: int, neighbours: List[np.ndarray]) -> int:
+    """
+    Size of a maximum matching of a bipartite graph given by the right neighbours of each left vertex.
+    """
+    match_left = [-1] * left_count
+    match_right = [-1] * right_count
+    adjacency = [row.tolist() for row in neighbours]
+    size = 0
+    while True:
+        # Layer the free left vertices and the alternating paths leaving them.
+        layer = [-1] * left_count
+        queue = deque()
+        for u in range(left_count):
+            if match_left[u] == -1:
+                layer[u] = 0
+                queue.append(u)
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                w = match_right[v]
+                if w == -1:
+                    found = True
+                elif layer[w] == -1:
+                    layer[w] = layer[u] + 1
+                    queue.append(w)
+        if not found:
+            return size
+
+        # Vertex-disjoint shortest augmenting paths, found with an explicit stack.
+        pointer = [0] * left_count
+        for root in range(left_count):
+            if match_left[root] != -1:
+                continue
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if pointer[u] == len(adjacency[u]):
+                    layer[u] = -1
+                    stack.pop()
+                    continue
+                v = adjacency[u][pointer[u]]
+                pointer[u] += 1
+                w = match_right[v]
+                if w == -1:
+                    for depth in range(len(stack) - 1, -1, -1):
+                        u = stack[depth]
+                        v = adjacency[u][pointer[u] - 1]
+                        match_right[v], match_left[u] = u, v
+                    size += 1
+                    break
+                if layer[w] == layer[u] + 1:
+                    stack.append(w)
+
+
+def _bottleneck_finite(points: np.ndarray, other: np.ndarray) -> float:
+    if points.shape[0] == 0 and other.shape[0] == 0:
+        return 0.0
+    diagonal, other_diagonal = _diagonal_distance(points, np.inf), _diagonal_distance(other, np.inf)
+    upper = float(max(diagonal.max(initial=0), other_diagonal.max(initial=0)))
+    # Only pairs closer than the cost of sending everything to the diagonal can matter.
+    if points.shape[0] and other.shape[0]:
+        pairs = cKDTree(points).sparse_distance_matrix(cKDTree(other), upper, p=np.inf, output_type="ndarray")
+        rows, cols, distances = pairs["i"], pairs["j"], pairs["v"]
+    else:
+        rows, cols, distances = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    candidates = np.unique(np.concatenate([[0, upper], distances, diagonal, other_diagonal]))
+
+    def feasible(radius: float) -> bool:
+        # A perfect matching of the diagonal-augmented graph exists if and only if the points too far from the
+        # diagonal can be matched within radius on either side (Mendelsohn-Dulmage).
+        close = distances <= radius
+        for heavy, near, far, far_count in ((diagonal > radius, rows[close], cols[close], other.shape[0]),
+                                            (other_diagonal > radius, cols[close], rows[close], points.shape[0])):
+            heavy_points = np.flatnonzero(heavy)
+            if heavy_points.shape[0] == 0:
+                continue
+            relabel = np.full(heavy.shape[0], -1)
+            relabel[heavy_points] = np.arange(heavy_points.shape[0])
+            keep = relabel[near] >= 0
+            order = np.argsort(relabel[near[keep]], kind="stable")
+            starts = np.searchsorted(relabel[near[keep]][order], np.arange(heavy_points.shape[0] + 1))
+            targets = far[keep][order]
+            neighbours = [targets[starts[k]:starts[k + 1]] for k in range(heavy_points.shape[0])]
+            if _hopcroft_karp(heavy_points.shape[0], far_count, neighbours) < heavy_points.shape[0]:
+                return False
+        return True
+
+    low, high = 0, candidates.shape[0] - 1
+    while low < high:
+        middle = (low + high) // 2
+        if feasible(candidates[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return float(candidates[low])
+
+
+def bottleneck(diag: PersDiag, other: PersDiag, dim: int) -> float:
+    """
+    Bottleneck distance between the p-points of two diagrams with the L-infinity ground metric. The candidate values
+    come from a k-d tree range query, and each step of the binary search over them is a Hopcroft-Karp matching.
+    """
+    return _bottleneck(_split(diag, dim), _split(other, dim))
+
+
+def _bottleneck(split: Tuple[np.ndarray, np.ndarray], other_split: Tuple[np.ndarray, np.ndarray]) -> float:
+    (points, essential), (other, other_essential) = split, other_split
+    if essential.shape[0] != other_essential.shape[0]:
+        return np.inf
+    essential_distance = float(np.abs(essential - other_essential).max(initial=0))
+    return max(essential_distance, _bottleneck_finite(points, other))
+
+
+def _auction(cost: np.ndarray, delta: float) -> float:
+    """
+    Minimum cost of a perfect assignment, to within a relative error delta, by a Jacobi auction with epsilon scaling.
+    """
+    size = cost.shape[0]
+    benefit = -cost
+    prices = np.zeros(size)
+    scale = max(float(cost[np.isfinite(cost)].max(initial=0)), 1e-12)
+    epsilon = scale / 4
+    rows = np.arange(size)
+    while True:
+        owner = np.full(size, -1)
+        assigned = np.full(size, -1)
+        unassigned = rows
+        while unassigned.shape[0]:
+            values = benefit[unassigned] - prices
+            best = np.argmax(values, axis=1)
+            best_values = values[np.arange(unassigned.shape[0]), best]
+            values[np.arange(unassigned.shape[0]), best] = -np.inf
+            second_values = values.max(axis=1)
+            # A bidder with a single allowed object bids as if the next best were worse than any real assignment.
+            second_values = np.where(np.isfinite(second_values), second_values, best_values - scale)
+            bids = prices[best] + best_values - second_values + epsilon
+
+            # Every object takes its highest bid and releases its previous owner.
+            order = np.lexsort((bids, best))
+            last = np.r_[best[order][1:] != best[order][:-1], True]
+            objects, bidders, winning = best[order][last], unassigned[order][last], bids[order][last]
+            released = owner[objects]
+            assigned[released[released >= 0]] = -1
+            owner[objects] = bidders
+            assigned[bidders] = objects
+            prices[objects] = winning
+            unassigned = np.flatnonzero(assigned == -1)
+
+        total = float(cost[rows, assigned].sum())
+        if size * epsilon <= delta * total or total == 0 or epsilon < 1e-12:
+            return total
+        epsilon /= 5
+
+
+def _wasserstein(split: Tuple[np.ndarray, np.ndarray], other_split: Tuple[np.ndarray, np.ndarray], order: float,
+                 internal_p: float, delta: float | None) -> float:
+    (points, essential), (other, other_essential) = split, other_split
+    if essential.shape[0] != other_essential.shape[0]:
+        return np.inf
+    total = float((np.abs(essential - other_essential) ** order).sum())
+    n, m = points.shape[0], other.shape[0]
+    if n + m:
+        # Rows are the points and the diagonal copies of the other points, columns the other points and the
+        # diagonal copies of the points. A point may only go to its own diagonal copy and copies match for free.
+        cost = np.full((n + m, m + n), np.inf)
+        if n and m:
+            difference = np.abs(points[:, None, :] - other[None, :, :])
+            ground = difference.max(axis=2) if np.isinf(internal_p) else \
+                (difference ** internal_p).sum(axis=2) ** (1 / internal_p)
+            cost[:n, :m] = ground ** order
+        cost[np.arange(n), m + np.arange(n)] = _diagonal_distance(points, internal_p) ** order
+        cost[n + np.arange(m), np.arange(m)] = _diagonal_distance(other, internal_p) ** order
+        cost[n:, m:] = 0
+        if delta is None:
+            rows, cols = linear_sum_assignment(cost)
+            total += float(cost[rows, cols].sum())
+        else:
+            total += _auction(cost, delta)
+    return total ** (1 / order)
+
+
+def wasserstein(diag: PersDiag, other: PersDiag, dim: int, order: float = 1, internal_p: float = np.inf,
+                delta: float | None = None) -> float:
+    """
+    p-Wasserstein distance between the p-points of two diagrams, with an L-internal_p ground metric. By default the
+    optimal matching is exact (scipy's linear_sum_assignment); with delta it is found by an auction with epsilon
+    scaling, whose result to the power order is within a relative error delta of the exact value.
+    """
+    return _wasserstein(_split(diag, dim), _split(other, dim), order, internal_p, delta)
+
+
+def _pair_distances(args) -> List[float]:
+    splits, pairs, metric, order, internal_p, delta = args
+    if metric == "bottleneck":
+        return [_bottleneck(splits[i], splits[j]) for i, j in pairs]
+    return [_wasserstein(splits[i], splits[j], order, internal_p, delta) for i, j in pairs]
+
+
+def pairwise_distances(diagrams: Sequence[PersDiag], dim: int, metric: str = "bottleneck", order: float = 1,
+                       internal_p: float = np.inf, delta: float | None = None, workers: int = 1) -> np.ndarray:
+    """
+    Symmetric matrix of distances between all pairs of diagrams. Each diagram is split into arrays once; with more
+    than one worker the pairs are shared out over processes.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Metric must be one of {METRICS}.")
+    splits = [_split(diag, dim) for diag in diagrams]
+    count = len(splits)
+    pairs = [(i, j) for i in range(count) for j in range(i + 1, count)]
+    if workers == 1 or len(pairs) < 2:
+        distances = _pair_distances((splits, pairs, metric, order, internal_p, delta))
+    else:
+        chunks = [pairs[k::workers * 4] for k in range(workers * 4)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_pair_distances, [(splits, chunk, metric, order, internal_p, delta)
+                                                          for chunk in chunks]))
+        pairs = [pair for chunk in chunks for pair in chunk]
+        distances = [distance for result in results for distance in result]
+    matrix = np.zeros((count, count))
+    if pairs:
+        rows, cols = np.array(pairs).T
+        matrix[rows, cols] = matrix[cols, rows] = distances
+    return matrix
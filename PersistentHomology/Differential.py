@@ -0,0 +1,317 @@
+from __future__ import annotations
+import argparse
+import itertools
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.Simplex import Simplex
+from PersistentHomology.PersHom1 import PersHom1
+from PersistentHomology.PersHom2 import PersHom2
+from PersistentHomology.Columns import COLUMN_TYPES
+from PersistentHomology.PersHom3 import PersHom3, VARIANTS
+from PersistentHomology.PersHom4 import PersHom4
+from PersistentHomology.PersHom5 import PersHom5
+from PersistentHomology.PersHomZp import PersHomZp
+from PersistentHomology.PersHomZ2Old import PersHomZ2Old
+
+# A complex as a map from sorted vertex tuples to weights, closed under taking faces.
+Simplices = Dict[Tuple[int, ...], float]
+# A diagram as the multiset of its (dim, born, die) points off the diagonal.
+Normalised = Counter
+
+
+def normalise(points: Sequence[Tuple[int, float, float]]) -> Normalised:
+    """
+    Points of zero persistence are dropped: which simplices they pair depends on how weight ties are broken, while
+    the remaining (dim, born, die) multiset does not. Indices are left out for the same reason.
+    """
+    return Counter((int(dim), float(born), float(die)) for dim, born, die in points if die > born)
+
+
+def finite(diagram: Normalised) -> Normalised:
+    return Counter({point: count for point, count in diagram.items() if np.isfinite(point[2])})
+
+
+def _pers_hom(engine: Callable) -> Callable[[FilteredSimplicialComplex], Normalised]:
+    """
+    Runs an engine with essential classes on, so that the infinite bars are compared as well.
+    """
+    def run(fc: FilteredSimplicialComplex) -> Normalised:
+        pers_hom = engine(fc, essential=True)
+        pers_hom.compute()
+        diag = pers_hom.get_pers_diag()
+        return normalise(zip(diag.dims.tolist(), diag.born.tolist(), diag.die.tolist()))
+    return run
+
+
+def _pers_hom_z2_old(fc: FilteredSimplicialComplex) -> Normalised:
+    pers_hom = PersHomZ2Old(fc)
+    pers_hom.compute()
+    # Its diagrams are keyed by the dimension of the simplex that kills a class, one above that of the class.
+    return normalise((dim - 1, point.born, point.die) for point, dim in pers_hom.get_pers_diags().points)
+
+
+ENGINES: Dict[str, Callable[[FilteredSimplicialComplex], Normalised]] = {
+    "PersHom1": _pers_hom(PersHom1),
+    "PersHom2": _pers_hom(PersHom2),
+    # Every reduction variant with every column representation.
+    **{f"PersHom3-{variant}-{column_type}": _pers_hom(
+        lambda fc, variant=variant, column_type=column_type, **options: PersHom3(fc, variant, column_type, **options))
+       for variant in VARIANTS for column_type in COLUMN_TYPES},
+    "PersHom4": _pers_hom(PersHom4),
+    "PersHomZ2Old": _pers_hom_z2_old,
+    # The field-generic reduction must agree with the Z2 ones when run over Z2.
+    "PersHomZp": _pers_hom(lambda fc, **options: PersHomZp(fc, 2, **options)),
+}
+# Engines without essential classes, compared with the finite bars of the reference only.
+FINITE_ONLY = {"PersHomZ2Old"}
+
+
+def _below(diagram: Normalised, max_dim: int) -> Normalised:
+    return Counter({point: count for point, count in diagram.items() if point[0] <= max_dim})
+
+
+def _rips_pers_hom(distances: np.ndarray, max_dim: int) -> Normalised:
+    # The (max_dim + 1)-skeleton kills every class up to max_dim that dies; the classes it adds above are dropped.
+    return _below(_pers_hom(PersHom3)(to_complex(rips_complex(distances, max_dim + 1))), max_dim)
+
+
+def _pers_hom_5(distances: np.ndarray, max_dim: int) -> Normalised:
+    return _below(_pers_hom(lambda d, **options: PersHom5(d, max_dim, **options))(distances), max_dim)
+
+
+# Engines that take a distance matrix and the top homology dimension rather than a complex.
+DISTANCE_ENGINES: Dict[str, Callable[[np.ndarray, int], Normalised]] = {
+    "PersHom3": _rips_pers_hom,
+    "PersHom5": _pers_hom_5,
+}
+
+
+def random_complex(rng: np.random.Generator, max_vertices: int = 8, max_dim: int = 3, levels: int = 4,
+                   empty_simplex: bool | None = None) -> Simplices:
+    """
+    Closure of a few random simplices. Weights are drawn from a handful of levels, so ties between simplices of
+    different dimensions are common, and every simplex weighs at least as much as its faces.
+    """
+    vertex_count = int(rng.integers(1, max_vertices + 1))
+    top = [tuple(sorted(rng.choice(vertex_count, int(rng.integers(1, min(max_dim + 1, vertex_count) + 1)),
+                                   replace=False).tolist()))
+           for _ in range(int(rng.integers(1, 2 * vertex_count + 1)))]
+    faces = {face for simplex in top for k in range(1, len(simplex) + 1)
+             for face in itertools.combinations(simplex, k)}
+    simplices = dict()
+    for face in sorted(faces, key=len):
+        lower = max((simplices[sub] for sub in itertools.combinations(face, len(face) - 1) if sub), default=0)
+        simplices[face] = float(lower + rng.integers(0, levels) * (rng.random() < 0.5))
+    if empty_simplex if empty_simplex is not None else rng.random() < 0.3:
+        simplices[()] = -1.0
+    return simplices
+
+
+def random_distances(rng: np.random.Generator, max_vertices: int = 8, levels: int = 4) -> np.ndarray:
+    """
+    Symmetric distance matrix on a few points with entries drawn from a handful of levels, so that many edges tie and
+    some points sit at distance zero from each other.
+    """
+    vertex_count = int(rng.integers(1, max_vertices + 1))
+    distances = rng.integers(0, levels, (vertex_count, vertex_count)).astype(np.float64)
+    distances = np.triu(distances, 1)
+    return distances + distances.T
+
+
+def rips_complex(distances: np.ndarray, max_dim: int) -> Simplices:
+    """
+    Every set of at most max_dim + 1 points, weighted by its largest distance.
+    """
+    vertex_count = distances.shape[0]
+    return {simplex: float(distances[np.ix_(simplex, simplex)].max())
+            for k in range(1, min(max_dim + 1, vertex_count) + 1)
+            for simplex in itertools.combinations(range(vertex_count), k)}
+
+
+def relabel(simplices: Simplices, permutation: Sequence[int]) -> Simplices:
+    """
+    The same filtration with vertex v renamed permutation[v]; only the order in which ties are broken changes.
+    """
+    return {tuple(sorted(permutation[v] for v in simplex)): weight for simplex, weight in simplices.items()}
+
+
+def to_complex(simplices: Simplices) -> FilteredSimplicialComplex:
+    fc = FilteredSimplicialComplex(check_valid=True)
+    for simplex in sorted(simplices, key=len):
+        fc.add_simplex(Simplex(set(simplex)), simplices[simplex])
+    return fc
+
+
+def diagrams(simplices: Simplices, engines: Dict[str, Callable] | None = None) -> Dict[str, Normalised]:
+    fc = to_complex(simplices)
+    return {name: engine(fc) for name, engine in (engines or ENGINES).items()}
+
+
+def disagreement(simplices: Simplices, engines: Dict[str, Callable] | None = None, reference: str = "PersHom1",
+                 permutation: Dict[int, int] | None = None) -> List[str]:
+    """
+    Engines whose diagram differs from the reference, or that raise, on the given complex. With a permutation of the
+    vertices, the reference is also run on the relabelled complex and reported as "relabelled" if its diagram moves.
+    """
+    engines = engines or ENGINES
+    runs = {name: (engine, simplices) for name, engine in engines.items()}
+    if permutation is not None:
+        runs["relabelled"] = (engines[reference], relabel(simplices, permutation))
+    results = dict()
+    for name, (engine, complex_simplices) in runs.items():
+        try:
+            results[name] = engine(to_complex(complex_simplices))
+        except Exception as error:
+            results[name] = error
+    expected = results[reference]
+    return [name for name, result in results.items() if isinstance(result, Exception)
+            or result != (finite(expected) if name in FINITE_ONLY else expected)]
+
+
+def _maximal(simplices: Simplices) -> List[Tuple[int, ...]]:
+    faces = {sub for simplex in simplices if len(simplex) > 1
+             for sub in itertools.combinations(simplex, len(simplex) - 1)}
+    return [simplex for simplex in simplices if simplex not in faces]
+
+
+def shrink(simplices: Simplices, fails: Callable[[Simplices], bool]) -> Simplices:
+    """
+    Greedily makes a failing complex smaller while it keeps failing: maximal simplices are removed, which keeps the
+    complex closed under faces, and weights are lowered to those of their highest face to merge filtration steps.
+    """
+    assert fails(simplices), "Only a failing complex can be shrunk."
+    changed = True
+    while changed:
+        changed = False
+        for simplex in sorted(_maximal(simplices), key=len, reverse=True):
+            candidate = {other: weight for other, weight in simplices.items() if other != simplex}
+            if candidate and fails(candidate):
+                simplices, changed = candidate, True
+        for simplex in sorted(simplices, key=len):
+            if not simplex:
+                continue
+            faces = [sub for sub in itertools.combinations(simplex, len(simplex) - 1) if sub in simplices]
+            lower = max((simplices[sub] for sub in faces), default=0.0)
+            # Cofaces weigh at least the old weight, so lowering never breaks monotonicity.
+            if simplices[simplex] > lower:
+                candidate = dict(simplices)
+                candidate[simplex] = lower
+                if fails(candidate):
+                    simplices, changed = candidate, True
+    return simplices
+
+
+@dataclass(frozen=True)
+class Failure:
+    trial: int
+    engines: Tuple[str, ...]
+    simplices: Simplices
+    diagrams: Dict[str, Normalised]
+
+
+def check(trials: int, seed: int = 0, engines: Dict[str, Callable] | None = None, reference: str = "PersHom1",
+          relabelled: bool = True, **parameters) -> List[Failure]:
+    """
+    Runs every engine on trials random complexes and returns the shrunk failing ones. With relabelled, the reference
+    is also run with the vertices permuted, which must not change its diagram.
+    """
+    engines = engines or ENGINES
+    failures = []
+    for trial in range(trials):
+        rng = np.random.default_rng([seed, trial])
+        simplices = random_complex(rng, **parameters)
+        permutation = None
+        if relabelled:
+            vertices = sorted({v for simplex in simplices for v in simplex})
+            permutation = dict(zip(vertices, rng.permutation(vertices).tolist()))
+        failing = disagreement(simplices, engines, reference, permutation)
+        if not failing:
+            continue
+        involved = {name: engines[name] for name in (reference, *failing) if name in engines}
+        shrunk = shrink(simplices, lambda candidate: bool(
+            set(failing) & set(disagreement(candidate, involved, reference, permutation))))
+        failures.append(Failure(trial=trial, engines=tuple(failing), simplices=shrunk,
+                                diagrams=diagrams(shrunk, involved)))
+    return failures
+
+
+def distance_disagreement(distances: np.ndarray, max_dim: int, engines: Dict[str, Callable] | None = None,
+                          reference: str = "PersHom3") -> List[str]:
+    """
+    Engines whose diagram on the distance matrix differs from the reference, or that raise.
+    """
+    results = dict()
+    for name, engine in (engines or DISTANCE_ENGINES).items():
+        try:
+            results[name] = engine(distances, max_dim)
+        except Exception as error:
+            results[name] = error
+    expected = results[reference]
+    return [name for name, result in results.items() if isinstance(result, Exception) or result != expected]
+
+
+def check_distances(trials: int, seed: int = 0, engines: Dict[str, Callable] | None = None,
+                    reference: str = "PersHom3", max_dim: int = 2, **parameters) -> List[Failure]:
+    """
+    Runs every distance engine on trials random distance matrices up to homology dimension max_dim. A failing matrix
+    is shrunk by dropping points while it keeps failing and is reported as its Rips complex.
+    """
+    engines = engines or DISTANCE_ENGINES
+    failures = []
+    for trial in range(trials):
+        distances = random_distances(np.random.default_rng([seed, trial]), **parameters)
+        failing = distance_disagreement(distances, max_dim, engines, reference)
+        if not failing:
+            continue
+        involved = {name: engines[name] for name in (reference, *failing) if name in engines}
+        changed = True
+        while changed:
+            changed = False
+            for vertex in range(distances.shape[0] - 1, -1, -1):
+                candidate = np.delete(np.delete(distances, vertex, axis=0), vertex, axis=1)
+                if candidate.shape[0] and set(failing) & set(distance_disagreement(candidate, max_dim, involved,
+                                                                                   reference)):
+                    distances, changed = candidate, True
+        failures.append(Failure(trial=trial, engines=tuple(failing), simplices=rips_complex(distances, max_dim + 1),
+                                diagrams={name: engine(distances, max_dim) for name, engine in involved.items()}))
+    return failures
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cross-check the persistent homology engines on random complexes.")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--distances", action="store_true",
+                        help="Compare the distance matrix engines on random Rips filtrations instead.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES) + list(DISTANCE_ENGINES))
+    parser.add_argument("--reference", choices=list(ENGINES) + list(DISTANCE_ENGINES))
+    args = parser.parse_args(argv)
+
+    available = DISTANCE_ENGINES if args.distances else ENGINES
+    reference = args.reference or ("PersHom3" if args.distances else "PersHom1")
+    unknown = (set(args.engines or ()) | {reference}) - set(available)
+    if unknown:
+        parser.error(f"Unknown engines for this workload: {', '.join(sorted(unknown))}.")
+    engines = {name: available[name] for name in set(args.engines or available) | {reference}}
+    if args.distances:
+        failures = check_distances(args.trials, args.seed, engines, reference)
+    else:
+        failures = check(args.trials, args.seed, engines, reference)
+    for failure in failures:
+        print(f"Trial {failure.trial}: {', '.join(failure.engines)} disagree on")
+        for simplex, weight in sorted(failure.simplices.items(), key=lambda item: (len(item[0]), item[0])):
+            print(f"    {simplex} w: {weight}")
+        for name, diagram in failure.diagrams.items():
+            print(f"    {name}: {sorted(diagram.elements())}")
+    print(f"{len(failures)} of {args.trials} trials failed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
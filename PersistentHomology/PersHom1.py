@@ -2,41 +2,37 @@ from __future__ import annotations
 from typing import List, Dict
 
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
-from Complexes.Simplex import Simplex
-from PersistentHomology.PersHomBase import PersHomBase, PersDiag, PersPoint
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+from PersistentHomology.PersHomBase import PersHomBase, PersPoint
 import numpy as np
 
 
 class PersHom1(PersHomBase):
-    __simplex_ordering: List[Simplex]
+    """
+    Standard reduction. Columns are sorted arrays of row indices, so memory is linear in the number of non-zeros.
+    """
     __simplex_count: int
     __weights: List[float]
-    __boundary_matrix: np.ndarray
-    __working_matrix: np.ndarray | None
+    __boundary_matrix: BoundaryMatrix
+    __working_matrix: List[np.ndarray] | None
+    __reduction_matrix: List[np.ndarray] | None
 
-    def __init__(self, filtered_complex: FilteredSimplicialComplex):
-        super().__init__()
-        self.__simplex_ordering = filtered_complex.get_simplex_ordering()
-        self.__simplex_to_order = dict()
-        for i, simplex in enumerate(self.__simplex_ordering):
-            self.__simplex_to_order[simplex] = i
-        self.__simplex_count = len(self.__simplex_ordering)
-        self.__weights = filtered_complex.get_weight_ordering()
-        self.__boundary_matrix = np.zeros((len(self.__simplex_ordering), len(self.__simplex_ordering)))
-        for i, simplex in enumerate(self.__simplex_ordering):
-            for facet in simplex.facets:
-                if facet not in self.__simplex_to_order:
-                    if facet.dim != -1:
-                        raise Exception()
-                    continue
-                j = self.__simplex_to_order[facet]
-                self.__boundary_matrix[j][i] = 1
+    def __init__(self, filtered_complex: FilteredSimplicialComplex, essential: bool = False,
+                 representatives: bool = False, instrument: bool = False):
+        super().__init__(essential, representatives, instrument)
+        with self._phase("boundary"):
+            self.__boundary_matrix = BoundaryMatrix.from_complex(filtered_complex)
+        self.__simplex_count = self.__boundary_matrix.size
+        self.__weights = self.__boundary_matrix.weights.tolist()
         self.__working_matrix = None
+        self.__reduction_matrix = None
+        if instrument:
+            self.__add_col = self._stats.counted_add(self.__add_col, lambda i: self.__working_matrix[i].shape[0])
 
     def __get_last_in_col(self, i: int) -> int | None:
-        if np.all(self.__working_matrix[:, i] == 0):
+        if self.__working_matrix[i].shape[0] == 0:
             return None
-        return max(j for j, val in enumerate(self.__working_matrix[:, i]) if val == 1)
+        return int(self.__working_matrix[i][-1])
 
     def __add_col(self, i: int, j: int) -> None:
         """
@@ -44,33 +40,51 @@ class PersHom1(PersHomBase):
         """
         assert i < self.__simplex_count and j < self.__simplex_count, "Column index out of range."
         assert self.__working_matrix is not None, "Working matrix is not initialised."
-        self.__working_matrix[:, i] = np.mod(self.__working_matrix[:, i] + self.__working_matrix[:, j], 2)
+        self.__working_matrix[i] = np.setxor1d(self.__working_matrix[i], self.__working_matrix[j], assume_unique=True)
+        if self.__reduction_matrix is not None:
+            self.__reduction_matrix[i] = np.setxor1d(self.__reduction_matrix[i], self.__reduction_matrix[j],
+                                                     assume_unique=True)
 
     def compute(self) -> None:
-        low: Dict[int, int] = dict()
-        self.__working_matrix = self.__boundary_matrix.copy()
+        low: Dict[int, int] = self._pivot_table()
+        with self._phase("reduction"):
+            self.__working_matrix = [self.__boundary_matrix.column(i) for i in range(self.__simplex_count)]
+            self.__reduction_matrix = None
+            if self._representatives and self._essential:
+                self.__reduction_matrix = [np.array([i]) for i in range(self.__simplex_count)]
+            if self._stats is not None:
+                self._stats.start_working_matrix(sum(column.shape[0] for column in self.__working_matrix))
 
-        for i in range(self.__simplex_count):
-            last_in_col = self.__get_last_in_col(i)
-            if last_in_col is None:
-                continue
-            if last_in_col not in low:
-                low[last_in_col] = i
-                continue
-            while last_in_col in low and last_in_col is not None:
-                competing_col = low[last_in_col]
-                self.__add_col(i, competing_col)
+            for i in range(self.__simplex_count):
                 last_in_col = self.__get_last_in_col(i)
-            if last_in_col is not None:
-                low[last_in_col] = i
+                if last_in_col is None:
+                    continue
+                if last_in_col not in low:
+                    low[last_in_col] = i
+                    continue
+                while last_in_col in low and last_in_col is not None:
+                    competing_col = low[last_in_col]
+                    self.__add_col(i, competing_col)
+                    last_in_col = self.__get_last_in_col(i)
+                if last_in_col is not None:
+                    low[last_in_col] = i
 
-        self._pers_diag = PersDiag()
-        for row, col in low.items():
-            pers_point = PersPoint(
-                born_index=row,
-                die_index=col,
-                born=self.__weights[row],
-                die=self.__weights[col],
-                dim=self.__simplex_ordering[row].dim
-            )
-            self._pers_diag.add_point(pers_point)
+        with self._phase("diagram"):
+            self._new_pers_diag()
+            for row, col in low.items():
+                pers_point = PersPoint(
+                    born_index=row,
+                    die_index=col,
+                    born=self.__weights[row],
+                    die=self.__weights[col],
+                    dim=int(self.__boundary_matrix.dims[row])
+                )
+                self._add_point(pers_point, self.__working_matrix[col])
+            if self._essential:
+                paired = set(low.keys()) | set(low.values())
+                for i in range(self.__simplex_count):
+                    if i not in paired:
+                        self._add_essential(i, self.__weights[i], int(self.__boundary_matrix.dims[i]),
+                                            self.__reduction_matrix[i] if self._representatives else None)
+        if self._stats is not None:
+            self._stats.log_summary()
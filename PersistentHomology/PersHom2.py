@@ -2,75 +2,86 @@ from __future__ import annotations
 from typing import List, Dict, Set
 
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
-from Complexes.Simplex import Simplex
-from PersistentHomology.PersHomBase import PersHomBase, PersDiag, PersPoint
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+from PersistentHomology.Columns import Column, COLUMN_TYPES
+from PersistentHomology.PersHomBase import PersHomBase, PersPoint
 import numpy as np
 
 
 class PersHom2(PersHomBase):
-    __simplex_ordering: List[Simplex]
     __simplex_count: int
     __weights: List[float]
-    __boundary_matrix: List[Set[int]]
-    __working_matrix: List[Set[int]] | None
+    __boundary_matrix: BoundaryMatrix
+    __working_matrix: List[Column] | None
+    __reduction_matrix: List[Column] | None
+    __column_type: type
 
-    def __init__(self, filtered_complex: FilteredSimplicialComplex):
-        super().__init__()
-        self.__simplex_ordering = filtered_complex.get_simplex_ordering()
-        self.__simplex_to_order = dict()
-        for i, simplex in enumerate(self.__simplex_ordering):
-            self.__simplex_to_order[simplex] = i
-        self.__simplex_count = len(self.__simplex_ordering)
-        self.__weights = filtered_complex.get_weight_ordering()
-        self.__boundary_matrix = []
-        for i, simplex in enumerate(self.__simplex_ordering):
-            self.__boundary_matrix.append(set())
-            for facet in simplex.facets:
-                if facet not in self.__simplex_to_order:
-                    if facet.dim != -1:
-                        raise Exception()
-                    continue
-                j = self.__simplex_to_order[facet]
-                self.__boundary_matrix[i].add(j)
+    def __init__(self, filtered_complex: FilteredSimplicialComplex, column_type: str = "set", essential: bool = False,
+                 representatives: bool = False, instrument: bool = False):
+        super().__init__(essential, representatives, instrument)
+        if column_type not in COLUMN_TYPES:
+            raise ValueError(f"Column type must be one of {tuple(COLUMN_TYPES)}.")
+        self.__column_type = COLUMN_TYPES[column_type]
+        with self._phase("boundary"):
+            self.__boundary_matrix = BoundaryMatrix.from_complex(filtered_complex)
+        self.__simplex_count = self.__boundary_matrix.size
+        self.__weights = self.__boundary_matrix.weights.tolist()
         self.__working_matrix = None
+        self.__reduction_matrix = None
+        if instrument:
+            self.__add_col = self._stats.counted_add(self.__add_col, lambda i: len(self.__working_matrix[i]))
 
     def __get_last_in_col(self, i: int) -> int | None:
-        if not self.__working_matrix[i]:
-            return None
-        return max(j for j in self.__working_matrix[i])
+        return self.__working_matrix[i].low
 
     def __add_col(self, i: int, j: int) -> None:
         """
         R_i <- R_i + R_j
         """
-        for k in self.__working_matrix[j]:
-            if k not in self.__working_matrix[i]:
-                self.__working_matrix[i].add(k)
-                continue
-            self.__working_matrix[i].remove(k)
+        self.__working_matrix[i].add(self.__working_matrix[j])
+        if self.__reduction_matrix is not None:
+            self.__reduction_matrix[i].add(self.__reduction_matrix[j])
 
     def compute(self) -> None:
-        low: Dict[int, int] = dict()
-        self.__working_matrix = list()
-        for i in self.__boundary_matrix:
-            self.__working_matrix.append(i.copy())
+        low: Dict[int, int] = self._pivot_table()
+        with self._phase("reduction"):
+            self.__working_matrix = list()
+            for i in range(self.__simplex_count):
+                self.__working_matrix.append(
+                    self.__column_type.from_indices(self.__boundary_matrix.column(i).tolist(), self.__simplex_count))
+            # V is only needed for the representatives of essential classes; finite classes use their column of R.
+            self.__reduction_matrix = None
+            if self._representatives and self._essential:
+                self.__reduction_matrix = [self.__column_type.from_indices([i], self.__simplex_count)
+                                           for i in range(self.__simplex_count)]
+            if self._stats is not None:
+                self._stats.start_working_matrix(sum(len(column) for column in self.__working_matrix))
 
-        for i in range(self.__simplex_count):
-            last_in_col = self.__get_last_in_col(i)
-            while last_in_col in low and last_in_col is not None:
-                competing_col = low[last_in_col]
-                self.__add_col(i, competing_col)
+            for i in range(self.__simplex_count):
                 last_in_col = self.__get_last_in_col(i)
-            if last_in_col is not None:
-                low[last_in_col] = i
+                while last_in_col in low and last_in_col is not None:
+                    competing_col = low[last_in_col]
+                    self.__add_col(i, competing_col)
+                    last_in_col = self.__get_last_in_col(i)
+                if last_in_col is not None:
+                    low[last_in_col] = i
 
-        self._pers_diag = PersDiag()
-        for row, col in low.items():
-            pers_point = PersPoint(
-                born_index=row,
-                die_index=col,
-                born=self.__weights[row],
-                die=self.__weights[col],
-                dim=self.__simplex_ordering[row].dim
-            )
-            self._pers_diag.add_point(pers_point)
+        with self._phase("diagram"):
+            self._new_pers_diag()
+            for row, col in low.items():
+                pers_point = PersPoint(
+                    born_index=row,
+                    die_index=col,
+                    born=self.__weights[row],
+                    die=self.__weights[col],
+                    dim=int(self.__boundary_matrix.dims[row])
+                )
+                self._add_point(pers_point, self.__working_matrix[col])
+            if self._essential:
+                paired = set(low.keys()) | set(low.values())
+                for i in range(self.__simplex_count):
+                    if i not in paired:
+                        self._add_essential(i, self.__weights[i], int(self.__boundary_matrix.dims[i]),
+                                            self.__reduction_matrix[i] if self._representatives else None)
+        if self._stats is not None:
+            self._stats.log_summary()
@@ -2,81 +2,164 @@ from __future__ import annotations
 from typing import List, Dict, Set
 
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
-from Complexes.Simplex import Simplex
-from PersistentHomology.PersHomBase import PersHomBase, PersDiag, PersPoint
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+from PersistentHomology.Columns import Column, COLUMN_TYPES
+from PersistentHomology.PersHomBase import PersHomBase, PersPoint
 import numpy as np
 
 
+VARIANTS = ("standard", "twist", "chunk")
+
+
 class PersHom3(PersHomBase):
-    __simplex_ordering: List[Simplex]
-    __simplex_to_order: Dict[Simplex, int]
+    """
+    Z2 reduction with a choice of variant:
+
+    - standard: columns reduced left to right, as in PersHom2;
+    - twist: dimensions reduced from the top down, and the column of every simplex that appears as a pivot is cleared
+      without being reduced, since it is known to reduce to zero;
+    - chunk: the columns of each dimension are split into chunks of _chunk_size, reduced within their chunk first and
+      then reduced globally. A column whose pivot stays inside its own chunk is final after the local pass, so only
+      the remaining columns take part in the global one.
+    """
+    _chunk_size: int | None = None
+
     __simplex_count: int
     __dim: int
     __weights: List[float]
-    __boundary_matrix: List[Set[int]]
-    __working_matrix: List[Set[int]] | None
-
-    def __init__(self, filtered_complex: FilteredSimplicialComplex):
-        super().__init__()
-        self.__simplex_ordering = filtered_complex.get_simplex_ordering()
-        self.__simplex_to_order = dict()
-        for i, simplex in enumerate(self.__simplex_ordering):
-            self.__simplex_to_order[simplex] = i
-        self.__simplex_count = len(self.__simplex_ordering)
+    __boundary_matrix: BoundaryMatrix
+    __working_matrix: List[Column] | None
+    __reduction_matrix: List[Column] | None
+    __column_type: type
+    __p_columns: Dict[int, List[int]]
+    __variant: str
+
+    def __init__(self, filtered_complex: FilteredSimplicialComplex, variant: str = "twist", column_type: str = "set",
+                 essential: bool = False, representatives: bool = False, instrument: bool = False):
+        super().__init__(essential, representatives, instrument)
+        if variant not in VARIANTS:
+            raise ValueError(f"Variant must be one of {VARIANTS}.")
+        if column_type not in COLUMN_TYPES:
+            raise ValueError(f"Column type must be one of {tuple(COLUMN_TYPES)}.")
+        self.__column_type = COLUMN_TYPES[column_type]
+        self.__variant = variant
+        with self._phase("boundary"):
+            self.__boundary_matrix = BoundaryMatrix.from_complex(filtered_complex)
+        self.__simplex_count = self.__boundary_matrix.size
         self.__dim = filtered_complex.dim
-        self.__weights = filtered_complex.get_weight_ordering()
-        self.__boundary_matrix = []
-        for i, simplex in enumerate(self.__simplex_ordering):
-            self.__boundary_matrix.append(set())
-            for facet in simplex.facets:
-                if facet not in self.__simplex_to_order:
-                    if facet.dim != -1:
-                        raise Exception()
-                    continue
-                j = self.__simplex_to_order[facet]
-                self.__boundary_matrix[i].add(j)
+        self.__weights = self.__boundary_matrix.weights.tolist()
+        self.__p_columns = dict()
+        for p in np.unique(self.__boundary_matrix.dims).tolist():
+            self.__p_columns[p] = self.__boundary_matrix.p_columns(p).tolist()
         self.__working_matrix = None
+        self.__reduction_matrix = None
+        if instrument:
+            self.__add_col = self._stats.counted_add(self.__add_col, lambda i: len(self.__working_matrix[i]))
 
     def __get_last_in_col(self, i: int) -> int | None:
-        if not self.__working_matrix[i]:
-            return None
-        return max(j for j in self.__working_matrix[i])
+        return self.__working_matrix[i].low
 
     def __add_col(self, i: int, j: int) -> None:
         """
         R_i <- R_i + R_j
         """
-        for k in self.__working_matrix[j]:
-            if k not in self.__working_matrix[i]:
-                self.__working_matrix[i].add(k)
-                continue
-            self.__working_matrix[i].remove(k)
+        self.__working_matrix[i].add(self.__working_matrix[j])
+        if self.__reduction_matrix is not None:
+            self.__reduction_matrix[i].add(self.__reduction_matrix[j])
 
-    def compute(self) -> None:
-        low: Dict[int, int] = dict()
-        self.__working_matrix = list()
-        for i in self.__boundary_matrix:
-            self.__working_matrix.append(i.copy())
+    def __reduce(self, i: int, low: Dict[int, int], lowest: int = 0) -> int | None:
+        """
+        Adds the columns of low to column i until its pivot is free or below lowest, and returns the pivot.
+        """
+        last_in_col = self.__get_last_in_col(i)
+        while last_in_col is not None and last_in_col >= lowest and last_in_col in low:
+            self.__add_col(i, low[last_in_col])
+            last_in_col = self.__get_last_in_col(i)
+        return last_in_col
 
-        for dim in range(self.__dim, -1, -1):
-            for i in range(self.__simplex_count):
-                if self.__simplex_ordering[i].dim == dim:
-                    last_in_col = self.__get_last_in_col(i)
-                    while last_in_col in low and last_in_col is not None:
-                        competing_col = low[last_in_col]
-                        self.__add_col(i, competing_col)
-                        last_in_col = self.__get_last_in_col(i)
-                    if last_in_col is not None:
+    def __compute_standard(self, low: Dict[int, int]) -> None:
+        for i in range(self.__simplex_count):
+            last_in_col = self.__reduce(i, low)
+            if last_in_col is not None:
+                low[last_in_col] = i
+
+    def __compute_twist(self, low: Dict[int, int]) -> None:
+        cleared: Set[int] = set()
+        for dim in sorted(self.__p_columns, reverse=True):
+            for i in self.__p_columns[dim]:
+                if i in cleared:
+                    continue
+                last_in_col = self.__reduce(i, low)
+                if last_in_col is not None:
+                    low[last_in_col] = i
+                    cleared.add(last_in_col)
+
+    def __compute_chunk(self, low: Dict[int, int]) -> None:
+        cleared: Set[int] = set()
+        for dim in sorted(self.__p_columns, reverse=True):
+            columns = self.__p_columns[dim]
+            chunk_size = self._chunk_size or max(1, int(np.sqrt(len(columns))))
+            unfinished = []
+            for start in range(0, len(columns), chunk_size):
+                chunk = [i for i in columns[start:start + chunk_size] if i not in cleared]
+                if not chunk:
+                    continue
+                # Every column with a pivot at or after the first column of the chunk lies in the chunk, so such a
+                # pivot is final once it is free.
+                chunk_start = chunk[0]
+                for i in chunk:
+                    last_in_col = self.__reduce(i, low, chunk_start)
+                    if last_in_col is None:
+                        continue
+                    if last_in_col >= chunk_start:
                         low[last_in_col] = i
-                        self.__working_matrix[last_in_col] = set()
-
-        self._pers_diag = PersDiag()
-        for row, col in low.items():
-            pers_point = PersPoint(
-                born_index=row,
-                die_index=col,
-                born=self.__weights[row],
-                die=self.__weights[col],
-                dim=self.__simplex_ordering[row].dim
-            )
-            self._pers_diag.add_point(pers_point)
+                        cleared.add(last_in_col)
+                    else:
+                        unfinished.append(i)
+            for i in unfinished:
+                last_in_col = self.__reduce(i, low)
+                if last_in_col is not None:
+                    low[last_in_col] = i
+                    cleared.add(last_in_col)
+
+    def compute(self) -> None:
+        low: Dict[int, int] = self._pivot_table()
+        with self._phase("reduction"):
+            self.__working_matrix = list()
+            for i in range(self.__simplex_count):
+                self.__working_matrix.append(
+                    self.__column_type.from_indices(self.__boundary_matrix.column(i).tolist(), self.__simplex_count))
+            # V is only needed for the representatives of essential classes; finite classes use their column of R.
+            self.__reduction_matrix = None
+            if self._representatives and self._essential:
+                self.__reduction_matrix = [self.__column_type.from_indices([i], self.__simplex_count)
+                                           for i in range(self.__simplex_count)]
+            if self._stats is not None:
+                self._stats.start_working_matrix(sum(len(column) for column in self.__working_matrix))
+
+            if self.__variant == "standard":
+                self.__compute_standard(low)
+            elif self.__variant == "twist":
+                self.__compute_twist(low)
+            else:
+                self.__compute_chunk(low)
+
+        with self._phase("diagram"):
+            self._new_pers_diag()
+            for row, col in low.items():
+                pers_point = PersPoint(
+                    born_index=row,
+                    die_index=col,
+                    born=self.__weights[row],
+                    die=self.__weights[col],
+                    dim=int(self.__boundary_matrix.dims[row])
+                )
+                self._add_point(pers_point, self.__working_matrix[col])
+            if self._essential:
+                paired = set(low.keys()) | set(low.values())
+                for i in range(self.__simplex_count):
+                    if i not in paired:
+                        self._add_essential(i, self.__weights[i], int(self.__boundary_matrix.dims[i]),
+                                            self.__reduction_matrix[i] if self._representatives else None)
+        if self._stats is not None:
+            self._stats.log_summary()
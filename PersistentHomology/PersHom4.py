@@ -2,40 +2,35 @@ from __future__ import annotations
 from typing import List, Dict, Set
 
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
-from Complexes.Simplex import Simplex
-from PersistentHomology.PersHomBase import PersHomBase, PersDiag, PersPoint
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+from PersistentHomology.PersHomBase import PersHomBase, PersPoint
 import numpy as np
-import bisect
 
 
 class PersHom4(PersHomBase):
-    __simplex_ordering: List[Simplex]
-    __simplex_to_order: Dict[Simplex, int]
+    """
+    Persistent cohomology by reduction of the coboundary matrix. Representatives are cocycles: the simplices of the
+    reduced cochain of the column that gives the point, so the born simplex and later ones of the same dimension. The
+    cochain of an essential class is a cocycle of the whole complex; that of a finite class is one up to its death.
+    """
+    __dims: np.ndarray
     __simplex_count: int
     __dim: int
     __weights: List[float]
     __boundary_matrix: List[Set[int]]
     __working_matrix: List[Set[int]] | None
+    __reduction_matrix: List[Set[int]] | None
 
-    def __init__(self, filtered_complex: FilteredSimplicialComplex):
-        super().__init__()
-        self.__simplex_ordering = filtered_complex.get_simplex_ordering()
-        self.__simplex_to_order = dict()
-        for i, simplex in enumerate(self.__simplex_ordering):
-            self.__simplex_to_order[simplex] = i
-        self.__simplex_count = len(self.__simplex_ordering)
+    def __init__(self, filtered_complex: FilteredSimplicialComplex, essential: bool = False,
+                 representatives: bool = False, instrument: bool = False):
+        super().__init__(essential, representatives, instrument)
+        with self._phase("boundary"):
+            boundary_matrix = BoundaryMatrix.from_complex(filtered_complex)
+        self.__simplex_count = boundary_matrix.size
+        self.__dims = boundary_matrix.dims
         self.__dim = filtered_complex.dim
-        self.__weights = filtered_complex.get_weight_ordering()
-        self.__boundary_matrix = []
-        for i, simplex in enumerate(self.__simplex_ordering):
-            self.__boundary_matrix.append(set())
-            for facet in simplex.facets:
-                if facet not in self.__simplex_to_order:
-                    if facet.dim != -1:
-                        raise Exception()
-                    continue
-                j = self.__simplex_to_order[facet]
-                self.__boundary_matrix[i].add(j)
+        self.__weights = boundary_matrix.weights.tolist()
+        self.__boundary_matrix = [set(boundary_matrix.column(i).tolist()) for i in range(self.__simplex_count)]
         self.__coboundary_matrix = list()
         for i in range(self.__simplex_count):
             self.__coboundary_matrix.append(set())
@@ -44,6 +39,9 @@ class PersHom4(PersHomBase):
                 self.__coboundary_matrix[self.__simplex_count - 1 - row_i] \
                     .add(self.__simplex_count - 1 - col_i)
         self.__working_matrix = None
+        self.__reduction_matrix = None
+        if instrument:
+            self.__add_col = self._stats.counted_add(self.__add_col, lambda i: len(self.__working_matrix[i]))
 
     def __get_last_in_col(self, i: int) -> int | None:
         if not self.__working_matrix[i]:
@@ -59,47 +57,56 @@ class PersHom4(PersHomBase):
                 self.__working_matrix[i].add(k)
                 continue
             self.__working_matrix[i].remove(k)
+        if self.__reduction_matrix is not None:
+            self.__reduction_matrix[i] ^= self.__reduction_matrix[j]
 
-    def compute(self) -> None:
-        low: Dict[int, List[int]] = dict()
-        self.__working_matrix = list()
-        cocycles = []
-        marked = set()
-        for i in range(self.__simplex_count):
-            cocycles.append({i})
+    def __cochain(self, i: int) -> np.ndarray | None:
+        if self.__reduction_matrix is None:
+            return None
+        return np.sort(self.__simplex_count - 1 - np.fromiter(self.__reduction_matrix[i], dtype=np.int64))
 
-        self._pers_diag = PersDiag()
+    def compute(self) -> None:
+        """
+        Reduces the coboundary matrix, the anti-transpose of the boundary matrix, whose pairs are those of the
+        boundary matrix. Simplex i is column n - 1 - i, so the low of a column is the oldest coface. Dimensions go up
+        one at a time: a simplex that kills a class is never a cocycle creator and its column is cleared. A column
+        whose low row has no entries in earlier columns is an apparent pair and is paired without a lookup.
+        """
+        n = self.__simplex_count
+        low: Dict[int, int] = self._pivot_table()
+        paired: Set[int] = set()
+        self._new_pers_diag()
 
-        for i in range(self.__simplex_count - 1, -1, -1):
-            indices = set()
-            for j in self.__boundary_matrix[self.__simplex_count - 1 - i]:
-                j_index = self.__simplex_count - 1 - j
-                if j_index in marked:
-                    continue
-                for k in cocycles[j_index]:
-                    if k in indices:
-                        indices.remove(k)
+        with self._phase("reduction"):
+            self.__working_matrix = [set(column) for column in self.__coboundary_matrix]
+            self.__reduction_matrix = [{i} for i in range(n)] if self._representatives else None
+            if self._stats is not None:
+                self._stats.start_working_matrix(sum(len(column) for column in self.__working_matrix))
+            for p in sorted(set(self.__dims.tolist())):
+                for col_i in np.flatnonzero(self.__dims == p)[::-1].tolist():
+                    i = n - 1 - col_i
+                    if col_i in paired:
+                        self.__working_matrix[i] = set()
                         continue
-                    indices.add(k)
-            if not indices:
-                continue
-            marked.add(i)
-            p = min(indices)
-            marked.add(p)
-
-            # print(cocycles)
-            row_i = self.__simplex_count - 1 - p
-            col_i = self.__simplex_count - 1 - i
-            pers_point = PersPoint(
-                born_index=row_i,
-                die_index=col_i,
-                born=self.__weights[row_i],
-                die=self.__weights[col_i],
-                dim=self.__simplex_ordering[row_i].dim
-            )
-            self._pers_diag.add_point(pers_point)
-
-            for j in indices:
-                if j == p:
-                    continue
-                cocycles[j].add(p)
+                    last = self.__get_last_in_col(i)
+                    if last is not None and i != n - 1 - max(self.__boundary_matrix[n - 1 - last]):
+                        while last is not None and last in low:
+                            self.__add_col(i, low[last])
+                            last = self.__get_last_in_col(i)
+                    if last is None:
+                        # A cocycle that no later column pairs with: its class never dies.
+                        if self._essential:
+                            self._add_essential(col_i, self.__weights[col_i], p, self.__cochain(i))
+                        continue
+                    low[last] = i
+                    die_index = n - 1 - last
+                    paired.add(die_index)
+                    self._add_point(PersPoint(
+                        born_index=col_i,
+                        die_index=die_index,
+                        born=self.__weights[col_i],
+                        die=self.__weights[die_index],
+                        dim=p
+                    ), self.__cochain(i))
+        if self._stats is not None:
+            self._stats.log_summary()
@@ -0,0 +1,285 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from Complexes.Combinatorial import binomial_array
+from PersistentHomology.PersHomBase import PersHomBase, PersPoint
+
+
+class PersHom5(PersHomBase):
+    """
+    Persistent cohomology of the Vietoris-Rips filtration of a distance matrix, in the style of Ripser. Simplices are
+    never stored as objects: a p-simplex is its index in the combinatorial number system and its cofacets are
+    enumerated from that index on demand. Columns of a dimension are reduced in reverse filtration order, cofacets
+    that became pivots are cleared from the next dimension, and only the non-trivial columns of the reduction matrix V
+    are kept.
+
+    Before a coboundary is built, its cofacets are enumerated lazily by decreasing index, stopping at the first one of
+    the same diameter: that one is the pivot. If no other column holds it, the pair is emergent and the column is never
+    built. Apparent pairs are among these, as a zero pivot only ever belongs to an earlier column if it is not apparent.
+
+    Simplices of a dimension are kept as their indices and diameters only; vertices are decoded from the index a block
+    at a time when they are needed.
+
+    The filtration orders simplices by diameter and breaks ties by decreasing index. Points record simplex indices as
+    born_index and die_index and only pairs of positive persistence are reported. Representatives are cocycles, given
+    as the indices of their p-simplices; a vertex is its own index.
+    """
+    __distances: np.ndarray
+    __max_dim: int
+    __threshold: float
+    __vertex_count: int
+    __binomials: np.ndarray
+    _cofacet_chunk: int = 64
+    _block_size: int = 1 << 20
+
+    def __init__(self, distance_matrix: np.ndarray, max_dim: int, threshold: float = np.inf, essential: bool = False,
+                 representatives: bool = False, instrument: bool = False):
+        super().__init__(essential, representatives, instrument)
+        distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+        if distance_matrix.ndim != 2 or distance_matrix.shape[0] != distance_matrix.shape[1]:
+            raise ValueError("Distance matrix must be square.")
+        self.__distances = distance_matrix
+        self.__max_dim = max_dim
+        self.__threshold = threshold
+        self.__vertex_count = distance_matrix.shape[0]
+        table = [binomial_array(np.arange(self.__vertex_count + 1), k) for k in range(max_dim + 3)]
+        dtype = object if any(row.dtype == object for row in table) else np.int64
+        self.__binomials = np.array([row.astype(dtype) for row in table], dtype=dtype)
+
+    def __vertices(self, key: int, p: int) -> np.ndarray:
+        vertices = np.empty(p + 1, dtype=np.int64)
+        top = self.__vertex_count
+        for k in range(p + 1, 0, -1):
+            # Largest vertex v below the previous one with C(v, k) <= key.
+            vertex = int(np.searchsorted(self.__binomials[k, :top], key, side="right")) - 1
+            vertices[k - 1] = vertex
+            key -= self.__binomials[k, vertex]
+            top = vertex
+        return vertices
+
+    def __decode(self, keys: np.ndarray, p: int) -> np.ndarray:
+        """
+        The vertices of many p-simplices at once, as an (m, p + 1) array of sorted rows.
+        """
+        vertices = np.empty((keys.shape[0], p + 1), dtype=np.int64)
+        keys = keys.copy()
+        for k in range(p + 1, 0, -1):
+            # Largest vertex v with C(v, k) <= key; it is below the vertex found before it.
+            column = np.searchsorted(self.__binomials[k, :self.__vertex_count], keys, side="right") - 1
+            vertices[:, k - 1] = column
+            keys -= self.__binomials[k, column]
+        return vertices
+
+    def __coboundary(self, key: int, p: int, diameter: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indices and diameters of the cofacets of a p-simplex within the threshold.
+        """
+        simplex = self.__vertices(key, p)
+        mask = np.ones(self.__vertex_count, dtype=bool)
+        mask[simplex] = False
+        candidates = np.nonzero(mask)[0]
+        diameters = np.maximum(self.__distances[np.ix_(candidates, simplex)].max(axis=1), diameter)
+        within = diameters <= self.__threshold
+        candidates, diameters = candidates[within], diameters[within]
+
+        # Inserting v after the first j vertices keeps the terms below it and shifts the ones above up by one.
+        positions = np.searchsorted(simplex, candidates)
+        terms_below = np.concatenate([[0], np.cumsum([self.__binomials[i + 1, v] for i, v in enumerate(simplex)])])
+        terms_above = [self.__binomials[i + 2, v] for i, v in enumerate(simplex)]
+        terms_above = np.concatenate([np.cumsum(terms_above[::-1])[::-1], [0]])
+        keys = terms_below[positions] + self.__binomials[positions + 1, candidates] + terms_above[positions]
+        return keys, diameters
+
+    def __zero_pivot(self, simplex: np.ndarray, diameter: float) -> int | None:
+        """
+        The vertex whose cofacet comes first in the filtration, if that cofacet has the diameter of the simplex. The
+        index of a cofacet grows with the added vertex, so vertices are scanned downwards a chunk at a time and the
+        scan stops at the first cofacet of the same diameter.
+        """
+        top = self.__vertex_count
+        while top > 0:
+            bottom = max(top - self._cofacet_chunk, 0)
+            hits = self.__distances[simplex, bottom:top].max(axis=0) <= diameter
+            hits[simplex[(simplex >= bottom) & (simplex < top)] - bottom] = False
+            found = np.flatnonzero(hits)
+            if found.shape[0]:
+                return bottom + int(found[-1])
+            top = bottom
+        return None
+
+    def __diameter(self, key: int, p: int) -> float:
+        simplex = self.__vertices(key, p)
+        return float(self.__distances[np.ix_(simplex, simplex)].max())
+
+    def __cofacet_key(self, simplex: np.ndarray, vertex: int) -> int:
+        position = int(np.searchsorted(simplex, vertex))
+        key = self.__binomials[position + 1, vertex]
+        for i, v in enumerate(simplex.tolist()):
+            key += self.__binomials[i + 1 if i < position else i + 2, v]
+        return key
+
+    @staticmethod
+    def __pivot(keys: np.ndarray, diameters: np.ndarray) -> Tuple[int, float]:
+        """
+        The cofacet that comes first in the filtration: smallest diameter, then largest index.
+        """
+        diameter = diameters.min()
+        return keys[diameters == diameter].max(), diameter
+
+    @staticmethod
+    def __add(keys: np.ndarray, diameters: np.ndarray, other_keys: np.ndarray,
+              other_diameters: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        all_keys = np.concatenate([keys, other_keys])
+        all_diameters = np.concatenate([diameters, other_diameters])
+        unique_keys, first, counts = np.unique(all_keys, return_index=True, return_counts=True)
+        odd = counts % 2 == 1
+        return unique_keys[odd], all_diameters[first[odd]]
+
+    @staticmethod
+    def __filtration_order(keys: np.ndarray, diameters: np.ndarray) -> List[int]:
+        """
+        Positions sorted by increasing diameter and then decreasing index.
+        """
+        if keys.dtype == object:
+            return sorted(range(keys.shape[0]), key=lambda i: (diameters[i], -keys[i]))
+        return np.lexsort((-keys, diameters)).tolist()
+
+    def __edges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows, cols = np.triu_indices(self.__vertex_count, k=1)
+        diameters = self.__distances[rows, cols]
+        within = diameters <= self.__threshold
+        rows, cols, diameters = rows[within], cols[within], diameters[within]
+        keys = self.__binomials[2, cols] + rows
+        return np.column_stack([rows, cols]), keys, diameters
+
+    def __compute_dim_0(self, edges: np.ndarray, keys: np.ndarray, diameters: np.ndarray) -> np.ndarray:
+        """
+        Union-find over the edges in filtration order. Returns a mask of the edges that do not merge components,
+        which are the only edges left to reduce in dimension one.
+        """
+        parent = list(range(self.__vertex_count))
+        # Vertices of each component, only tracked for representatives: the cocycle of a component is its vertices.
+        members = {vertex: [vertex] for vertex in range(self.__vertex_count)} if self._representatives else None
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        remaining = np.ones(keys.shape[0], dtype=bool)
+        for i in self.__filtration_order(keys, diameters):
+            x, y = find(int(edges[i, 0])), find(int(edges[i, 1]))
+            if x == y:
+                continue
+            parent[max(x, y)] = min(x, y)
+            remaining[i] = False
+            representative = None
+            if members is not None:
+                representative = np.array(sorted(members[max(x, y)]))
+                members[min(x, y)].extend(members.pop(max(x, y)))
+            if diameters[i] > 0:
+                self._add_point(PersPoint(
+                    born_index=max(x, y), die_index=int(keys[i]), born=0.0, die=float(diameters[i]), dim=0),
+                    representative)
+        if self._essential:
+            for vertex in range(self.__vertex_count):
+                if find(vertex) == vertex:
+                    self._add_essential(vertex, 0.0, 0, np.array(sorted(members[vertex])) if members is not None else None)
+        return remaining
+
+    def __next_simplices(self, p: int, keys: np.ndarray, diameters: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indices and diameters of all (p + 1)-simplices within the threshold, each generated once from the facet
+        without its largest vertex, for a block of facets at a time.
+        """
+        block = max(1, self._block_size // max(self.__vertex_count, 1))
+        next_keys, next_diameters = [], []
+        for start in range(0, keys.shape[0], block):
+            rows = self.__decode(keys[start:start + block], p)
+            cofacet_diameters = np.maximum(self.__distances[rows].max(axis=1), diameters[start:start + block, None])
+            within = (cofacet_diameters <= self.__threshold) & (np.arange(self.__vertex_count) > rows[:, -1:])
+            facets, added = np.nonzero(within)
+            next_keys.append(keys[start:start + block][facets] + self.__binomials[p + 2, added])
+            next_diameters.append(cofacet_diameters[facets, added])
+        if not next_keys:
+            return np.empty(0, dtype=self.__binomials.dtype), np.empty(0)
+        return np.concatenate(next_keys), np.concatenate(next_diameters)
+
+    def __compute_dim(self, p: int, keys: np.ndarray, diameters: np.ndarray) -> Dict[int, int]:
+        """
+        Reduces the coboundary columns of the given p-simplices and returns the pivot cofacets with their columns.
+        """
+        pivots: Dict[int, int] = dict()
+        # Columns of V that are more than the simplex itself; the others are (key, diameter of its pivot).
+        reductions: Dict[int, List[Tuple[int, float]]] = dict()
+        order = self.__filtration_order(keys, diameters)[::-1]
+        block = max(1, self._block_size // (p + 1))
+        for start in range(0, len(order), block):
+            positions = order[start:start + block]
+            block_vertices = self.__decode(keys[positions], p)
+            for i, position in enumerate(positions):
+                key, diameter = keys[position], float(diameters[position])
+                vertex = self.__zero_pivot(block_vertices[i], diameter)
+                if vertex is not None:
+                    pivot = self.__cofacet_key(block_vertices[i], vertex)
+                    if pivot not in pivots:
+                        if self._stats is not None:
+                            self._stats.count("emergent_pairs")
+                        pivots[pivot] = key
+                        continue
+
+                column_keys, column_diameters = self.__coboundary(key, p, diameter)
+                if column_keys.shape[0] == 0:
+                    if self._essential:
+                        self._add_essential(int(key), diameter, p, np.array([key]))
+                    continue
+                pivot, pivot_diameter = self.__pivot(column_keys, column_diameters)
+                reduction = {key: diameter}
+                while pivot in pivots:
+                    other = pivots[pivot]
+                    for other_key, other_diameter in reductions.get(other, ((other, self.__diameter(other, p)),)):
+                        other_keys, other_diameters = self.__coboundary(other_key, p, other_diameter)
+                        column_keys, column_diameters = self.__add(column_keys, column_diameters, other_keys,
+                                                                   other_diameters)
+                        if other_key in reduction:
+                            del reduction[other_key]
+                        else:
+                            reduction[other_key] = other_diameter
+                    if column_keys.shape[0] == 0:
+                        break
+                    pivot, pivot_diameter = self.__pivot(column_keys, column_diameters)
+                if column_keys.shape[0] == 0:
+                    if self._essential:
+                        self._add_essential(int(key), diameter, p, np.sort(np.array(list(reduction))))
+                    continue
+                pivots[pivot] = key
+                if len(reduction) > 1:
+                    reductions[key] = list(reduction.items())
+                if pivot_diameter > diameter:
+                    self._add_point(PersPoint(
+                        born_index=int(key), die_index=int(pivot), born=diameter, die=float(pivot_diameter), dim=p),
+                        np.sort(np.array(list(reduction))) if self._representatives else None)
+        return pivots
+
+    def compute(self) -> None:
+        self._new_pers_diag()
+        with self._phase("edges"):
+            edges, keys, diameters = self.__edges()
+        with self._phase("dim 0"):
+            remaining = self.__compute_dim_0(edges, keys, diameters)
+        simplex_keys, simplex_diameters = keys, diameters
+        columns = remaining
+        for p in range(1, self.__max_dim + 1):
+            with self._phase(f"dim {p}"):
+                pivots = self.__compute_dim(p, simplex_keys[columns], simplex_diameters[columns])
+            if p == self.__max_dim:
+                break
+            with self._phase(f"simplices {p + 1}"):
+                simplex_keys, simplex_diameters = self.__next_simplices(p, simplex_keys, simplex_diameters)
+            cleared = np.array(list(pivots), dtype=simplex_keys.dtype)
+            columns = ~np.isin(simplex_keys, cleared)
+        if self._stats is not None:
+            self._stats.log_summary()
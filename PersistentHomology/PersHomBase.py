@@ -1,64 +1,233 @@
 from __future__ import annotations
+import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, Generator, Set, Counter
-import collections
+from typing import ContextManager, Dict, Generator, Iterable, List
+
+import numpy as np
+
+from Complexes import Instrumentation
+from Complexes.Instrumentation import Stats
+from PersistentHomology import DiagramDistance
 
 
 @dataclass(frozen=True)
 class PersPoint:
+    """
+    Essential classes never die: they have die = inf and die_index = None.
+    """
     born_index: int
-    die_index: int
+    die_index: int | None
     born: float
     die: float
     dim: int
 
 
 class PersDiag:
-    __points: Dict[int, Counter[PersPoint]]
-    __point_count: int
+    """
+    Persistence diagram stored as columns: born, die, born_index, die_index and dims, one entry per point. Points added
+    one at a time are buffered and joined into the arrays on the next query; die_index is -1 for essential points.
+    """
+    __columns: Dict[str, np.ndarray]
+    __pending: List[PersPoint]
 
     def __init__(self):
-        self.__points = dict()
-        self.__point_count = 0
+        self.__columns = {
+            "born": np.empty(0, dtype=np.float64),
+            "die": np.empty(0, dtype=np.float64),
+            "born_index": np.empty(0, dtype=np.int64),
+            "die_index": np.empty(0, dtype=np.int64),
+            "dims": np.empty(0, dtype=np.int64),
+        }
+        self.__pending = []
+
+    @staticmethod
+    def from_arrays(born: np.ndarray, die: np.ndarray, born_index: np.ndarray, die_index: np.ndarray,
+                    dims: np.ndarray) -> PersDiag:
+        diag = PersDiag()
+        diag.__columns = {
+            "born": np.asarray(born, dtype=np.float64),
+            "die": np.asarray(die, dtype=np.float64),
+            "born_index": PersDiag.__index_array(born_index),
+            "die_index": PersDiag.__index_array(die_index),
+            "dims": np.asarray(dims, dtype=np.int64),
+        }
+        return diag
+
+    @staticmethod
+    def from_points(points: Iterable[PersPoint]) -> PersDiag:
+        diag = PersDiag()
+        diag.__pending = list(points)
+        return diag
+
+    @staticmethod
+    def __index_array(indices) -> np.ndarray:
+        # Combinatorial simplex indices can outgrow int64, in which case they stay Python integers.
+        try:
+            return np.asarray(indices, dtype=np.int64)
+        except OverflowError:
+            return np.asarray(indices, dtype=object)
+
+    def __flush(self) -> Dict[str, np.ndarray]:
+        if self.__pending:
+            pending = self.__pending
+            self.__pending = []
+            columns = self.__columns
+            self.__columns = {
+                "born": np.concatenate([columns["born"], [point.born for point in pending]]),
+                "die": np.concatenate([columns["die"], [point.die for point in pending]]),
+                "born_index": np.concatenate([columns["born_index"], self.__index_array(
+                    [point.born_index for point in pending])]),
+                "die_index": np.concatenate([columns["die_index"], self.__index_array(
+                    [-1 if point.die_index is None else point.die_index for point in pending])]),
+                "dims": np.concatenate([columns["dims"], np.array([point.dim for point in pending], dtype=np.int64)]),
+            }
+        return self.__columns
 
     def __repr__(self) -> str:
-        return f"PersDiag with {self.__point_count} points"
+        return f"PersDiag with {len(self)} points"
+
+    def __len__(self) -> int:
+        return self.__columns["born"].shape[0] + len(self.__pending)
+
+    def __sorted_columns(self) -> List[np.ndarray]:
+        columns = self.__flush()
+        keys = [columns["die_index"], columns["born_index"], columns["die"], columns["born"], columns["dims"]]
+        if any(key.dtype == object for key in keys):
+            order = np.array(sorted(range(len(self)), key=lambda i: tuple(key[i] for key in reversed(keys))),
+                             dtype=np.int64)
+        else:
+            order = np.lexsort(keys)
+        return [key[order] for key in keys]
 
     def __eq__(self, other: PersDiag):
-        if self.__point_count != other.__point_count:
+        """
+        Equal as multisets of points, indices included.
+        """
+        if not isinstance(other, PersDiag):
+            return NotImplemented
+        if len(self) != len(other):
             return False
-        if self.__points.keys() != other.__points.keys():
-            return False
-        for key in self.__points.keys():
-            if self.__points[key] != other.__points[key]:
-                return False
-        return True
+        return all(np.array_equal(mine, theirs)
+                   for mine, theirs in zip(self.__sorted_columns(), other.__sorted_columns()))
+
+    @property
+    def born(self) -> np.ndarray:
+        return self.__flush()["born"]
+
+    @property
+    def die(self) -> np.ndarray:
+        return self.__flush()["die"]
+
+    @property
+    def born_index(self) -> np.ndarray:
+        return self.__flush()["born_index"]
+
+    @property
+    def die_index(self) -> np.ndarray:
+        return self.__flush()["die_index"]
+
+    @property
+    def dims(self) -> np.ndarray:
+        return self.__flush()["dims"]
+
+    @property
+    def lifetimes(self) -> np.ndarray:
+        columns = self.__flush()
+        return columns["die"] - columns["born"]
+
+    def __point(self, i: int) -> PersPoint:
+        columns = self.__columns
+        die_index = int(columns["die_index"][i])
+        return PersPoint(
+            born_index=int(columns["born_index"][i]),
+            die_index=None if die_index == -1 else die_index,
+            born=float(columns["born"][i]),
+            die=float(columns["die"][i]),
+            dim=int(columns["dims"][i])
+        )
 
     @property
     def points(self) -> Generator[PersPoint, None, None]:
-        for p_pers_points in self.__points.values():
-            for p_pers_point in p_pers_points:
-                yield p_pers_point
+        for i in np.argsort(self.dims, kind="stable").tolist():
+            yield self.__point(i)
 
     def p_points(self, p: int) -> Generator[PersPoint, None, None]:
-        if p not in self.__points:
-            return
-        for pers_point in self.__points[p]:
-            yield pers_point
+        for i in np.flatnonzero(self.dims == p).tolist():
+            yield self.__point(i)
+
+    def to_points(self) -> List[PersPoint]:
+        return list(self.points)
 
     def add_point(self, point: PersPoint) -> None:
-        if point.dim not in self.__points:
-            self.__points[point.dim] = collections.Counter()
-        self.__points[point.dim][point] += 1
-        self.__point_count += 1
+        self.__pending.append(point)
+
+    def __select(self, mask_or_order: np.ndarray) -> PersDiag:
+        columns = self.__flush()
+        return PersDiag.from_arrays(*(columns[name][mask_or_order]
+                                      for name in ("born", "die", "born_index", "die_index", "dims")))
+
+    def filter(self, min_lifetime: float = 0.0, dim: int | None = None, finite: bool = False) -> PersDiag:
+        """
+        Points of the given dimension (all if None) living strictly longer than min_lifetime, optionally without the
+        essential ones.
+        """
+        mask = self.lifetimes > min_lifetime
+        if dim is not None:
+            mask &= self.dims == dim
+        if finite:
+            mask &= np.isfinite(self.die)
+        return self.__select(mask)
+
+    def top_k(self, k: int, dim: int | None = None) -> PersDiag:
+        """
+        The k most persistent points, longest first; essential points come before all finite ones.
+        """
+        candidates = np.arange(len(self)) if dim is None else np.flatnonzero(self.dims == dim)
+        lifetimes = self.lifetimes[candidates]
+        if k < candidates.shape[0]:
+            candidates = candidates[np.argpartition(-lifetimes, k - 1)[:k]] if k > 0 else candidates[:0]
+            lifetimes = self.lifetimes[candidates]
+        return self.__select(candidates[np.argsort(-lifetimes, kind="stable")])
+
+    def bottleneck_distance(self, other: PersDiag, dim: int) -> float:
+        return DiagramDistance.bottleneck(self, other, dim)
+
+    def wasserstein_distance(self, other: PersDiag, dim: int, order: float = 1, internal_p: float = np.inf,
+                             delta: float | None = None) -> float:
+        return DiagramDistance.wasserstein(self, other, dim, order, internal_p, delta)
+
+    def betti_curve(self, thresholds: np.ndarray, dim: int) -> np.ndarray:
+        """
+        Number of p-classes alive at each threshold t, those with born <= t < die.
+        """
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        mask = self.dims == dim
+        born, die = np.sort(self.born[mask]), np.sort(self.die[mask])
+        return (np.searchsorted(born, thresholds, side="right") - np.searchsorted(die, thresholds, side="right"))
 
 
 class PersHomBase(ABC):
+    """
+    With essential set, compute also reports the classes that never die. With representatives set, the engine keeps
+    the columns it needs to give a representative (co)cycle for every point; both are off by default so that the plain
+    reduction does no extra bookkeeping. With instrument set, get_stats gives the time spent in each phase and the
+    counters of the reduction; engines only swap in their counting column addition and pivot table when it is set.
+    """
     _pers_diag: PersDiag | None
+    _essential: bool
+    _representatives: bool
+    _representative_columns: Dict[PersPoint, object] | None
+    _stats: Stats | None
+    _logger: logging.Logger
 
-    def __init__(self):
+    def __init__(self, essential: bool = False, representatives: bool = False, instrument: bool = False):
         self._pers_diag = None
+        self._essential = essential
+        self._representatives = representatives
+        self._representative_columns = None
+        self._logger = logging.getLogger(__name__)
+        self._stats = Stats(type(self).__name__, self._logger) if instrument else None
 
     @abstractmethod
     def compute(self) -> None:
@@ -67,3 +236,44 @@ class PersHomBase(ABC):
     def get_pers_diag(self) -> PersDiag:
         assert self._pers_diag is not None, "It seems like that the persistent diagram has not been constructed."
         return self._pers_diag
+
+    def get_stats(self) -> Stats:
+        if self._stats is None:
+            raise ValueError("Instrumentation is off, pass instrument=True.")
+        return self._stats
+
+    def _phase(self, name: str) -> ContextManager:
+        return Instrumentation.phase(self._stats, name)
+
+    def _pivot_table(self) -> Dict[int, int]:
+        return dict() if self._stats is None else self._stats.pivot_table()
+
+    def _new_pers_diag(self) -> None:
+        self._pers_diag = PersDiag()
+        self._representative_columns = dict() if self._representatives else None
+
+    def _add_point(self, point: PersPoint, representative: object = None) -> None:
+        """
+        Adds a point to the diagram and keeps its representative, which is only turned into an array when asked for.
+        """
+        self._pers_diag.add_point(point)
+        if self._representatives:
+            self._representative_columns[point] = representative
+
+    def _add_essential(self, born_index: int, born: float, dim: int, representative: object = None) -> None:
+        self._add_point(PersPoint(born_index=born_index, die_index=None, born=born, die=np.inf, dim=dim),
+                        representative)
+
+    def get_representative(self, point: PersPoint) -> np.ndarray:
+        """
+        Indices of the simplices of a representative of the class of the point, as numbered by the engine.
+        """
+        if not self._representatives:
+            raise ValueError("Representatives were not kept, pass representatives=True.")
+        assert self._representative_columns is not None, "It seems like that the persistence has not been computed."
+        if point not in self._representative_columns:
+            raise ValueError("Point not in persistence diagram.")
+        representative = self._representative_columns[point]
+        if isinstance(representative, np.ndarray):
+            return representative
+        return representative.indices()
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Tuple, Set, Any, Generator
 
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
-from Complexes.Simplex import Simplex
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
 import numpy as np
 
 
@@ -80,41 +80,35 @@ class PersDiags(PersDiagsBase):
 
 
 class PersHomZ2Old:
-    __simplex_ordering: List[Simplex]
     __weights: List[float]
-    __boundary: np.ndarray
-    __reduced_boundary: np.ndarray | None
+    __boundary: BoundaryMatrix
+    __reduced_boundary: List[np.ndarray] | None
     __simplex_count: int
     __lowest_rows: Dict[int, int]
     __ipers_diag: IPersDiags
     __pers_diag: PersDiags
 
     def __init__(self, filtered_complex: FilteredSimplicialComplex):
-        self.__simplex_ordering = filtered_complex.get_simplex_ordering()
-        self.__weights = filtered_complex.get_weight_ordering()
-        self.__boundary = np.zeros((len(self.__simplex_ordering), len(self.__simplex_ordering)))
-        self.__simplex_count = len(self.__simplex_ordering)
+        self.__boundary = BoundaryMatrix.from_complex(filtered_complex)
+        self.__weights = self.__boundary.weights.tolist()
+        self.__simplex_count = self.__boundary.size
         self.__reduced_boundary = None
         self.__lowest_rows = None
         self.__ipers_diag = None
         self.__pers_diag = None
-        for i, simplex in enumerate(self.__simplex_ordering):
-            for j in range(i):
-                if self.__simplex_ordering[j] in simplex.facets:
-                    self.__boundary[j][i] = 1
 
     @staticmethod
     def __get_last_1_in_array(array: np.ndarray) -> int | None:
-        if np.all(array == 0):
+        if array.shape[0] == 0:
             return None
-        return max(j for j, val in enumerate(array) if val == 1)
+        return int(array[-1])
 
     @staticmethod
-    def __add_col_op_mod_2(array: np.ndarray, col_a: int, col_b: int) -> None:
+    def __add_col_op_mod_2(columns: List[np.ndarray], col_a: int, col_b: int) -> None:
         """
         Inline operations, does col_a = col_a + col_b
         """
-        array[:, col_a] = np.mod(array[:, col_a] + array[:, col_b], 2)
+        columns[col_a] = np.setxor1d(columns[col_a], columns[col_b], assume_unique=True)
 
     def compute(self) -> None:
         self.reduce_boundary()
@@ -123,10 +117,10 @@ class PersHomZ2Old:
 
     def reduce_boundary(self) -> None:
         low: Dict[int, int] = dict()
-        boundary = self.__boundary.copy()
+        boundary = [self.__boundary.column(i) for i in range(self.__simplex_count)]
 
         for i in range(self.__simplex_count):
-            last_1 = self.__get_last_1_in_array(boundary[:, i])
+            last_1 = self.__get_last_1_in_array(boundary[i])
             if last_1 is None:
                 continue
             if last_1 not in low:
@@ -135,7 +129,7 @@ class PersHomZ2Old:
             while last_1 in low and last_1 is not None:
                 competing_col = low[last_1]
                 self.__add_col_op_mod_2(boundary, i, competing_col)
-                last_1 = self.__get_last_1_in_array(boundary[:, i])
+                last_1 = self.__get_last_1_in_array(boundary[i])
             if last_1 is not None:
                 low[last_1] = i
 
@@ -146,7 +140,7 @@ class PersHomZ2Old:
         assert self.__reduced_boundary is not None, "Reduced boundary does not seem to be computed."
         ipers_diag = IPersDiags()
         for row, col in self.__lowest_rows.items():
-            ipers_diag.add_point(IPersPoint(row, col), self.__simplex_ordering[col].dim)
+            ipers_diag.add_point(IPersPoint(row, col), int(self.__boundary.dims[col]))
         self.__ipers_diag = ipers_diag
 
     def construct_pers_diag(self) -> None:
@@ -158,8 +152,14 @@ class PersHomZ2Old:
         self.__pers_diag = pers_diag
 
     def get_boundary(self) -> np.ndarray:
+        """
+        The reduced boundary matrix, materialised as a dense array on each call.
+        """
         assert self.__reduced_boundary is not None, "Reduced boundary does not seem to be computed."
-        return self.__reduced_boundary
+        boundary = np.zeros((self.__simplex_count, self.__simplex_count))
+        for i, column in enumerate(self.__reduced_boundary):
+            boundary[column, i] = 1
+        return boundary
 
     def get_ipers_diags(self) -> IPersDiags:
         assert self.__ipers_diag is not None, "Index persistence diagram does not seem to be constructed."
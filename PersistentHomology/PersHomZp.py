@@ -0,0 +1,158 @@
+from __future__ import annotations
+from typing import Dict, List, Set
+
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+from PersistentHomology.PersHomBase import PersHomBase, PersPoint
+import numpy as np
+
+# Inverses are tabulated for primes up to this bound and computed on demand above it.
+_INVERSE_TABLE_LIMIT = 1 << 16
+
+
+class ZpColumn:
+    """
+    A column over Z/p: sorted int64 row indices and their non-zero values in [1, p).
+    """
+    __slots__ = ("rows", "values")
+    rows: np.ndarray
+    values: np.ndarray
+
+    def __init__(self, rows: np.ndarray, values: np.ndarray):
+        self.rows = rows
+        self.values = values
+
+    def __len__(self) -> int:
+        return self.rows.shape[0]
+
+    @property
+    def low(self) -> int | None:
+        return int(self.rows[-1]) if self.rows.shape[0] else None
+
+    def add(self, other: ZpColumn, factor: int, prime: int) -> None:
+        """
+        self <- self + factor * other
+        """
+        rows, inverse = np.unique(np.concatenate([self.rows, other.rows]), return_inverse=True)
+        values = np.zeros(rows.shape[0], dtype=np.int64)
+        # Both values are below p < 2^31, so the product fits in int64.
+        np.add.at(values, inverse, np.concatenate([self.values, other.values * factor % prime]))
+        values %= prime
+        keep = values != 0
+        self.rows, self.values = rows[keep], values[keep]
+
+    def indices(self) -> np.ndarray:
+        return self.rows
+
+
+class PersHomZp(PersHomBase):
+    """
+    Reduction over Z/p for a prime p, with the twist of PersHom3: dimensions from the top down, and the column of
+    every simplex that appears as a pivot is cleared. The boundary comes from BoundaryMatrix with its signs, and
+    columns are arrays of rows and values. The Z2 engines stay the fast path for p = 2; here the pivot of column j is
+    cancelled by adding -R_j[low] / R_i[low] times the column i that owns it, with the inverse read from a table.
+    """
+    __prime: int
+    __inverses: np.ndarray | None
+    __simplex_count: int
+    __weights: List[float]
+    __boundary_matrix: BoundaryMatrix
+    __working_matrix: List[ZpColumn] | None
+    __reduction_matrix: List[ZpColumn] | None
+    __p_columns: Dict[int, List[int]]
+
+    def __init__(self, filtered_complex: FilteredSimplicialComplex, prime: int = 3, essential: bool = False,
+                 representatives: bool = False, instrument: bool = False):
+        super().__init__(essential, representatives, instrument)
+        if prime < 2 or prime >= 1 << 31 or any(prime % k == 0 for k in range(2, int(prime ** 0.5) + 1)):
+            raise ValueError("Coefficients must be a prime below 2^31.")
+        self.__prime = prime
+        self.__inverses = None
+        if prime <= _INVERSE_TABLE_LIMIT:
+            self.__inverses = np.array([0] + [pow(a, -1, prime) for a in range(1, prime)], dtype=np.int64)
+        with self._phase("boundary"):
+            self.__boundary_matrix = BoundaryMatrix.from_complex(filtered_complex)
+        self.__simplex_count = self.__boundary_matrix.size
+        self.__weights = self.__boundary_matrix.weights.tolist()
+        self.__p_columns = dict()
+        for p in np.unique(self.__boundary_matrix.dims).tolist():
+            self.__p_columns[p] = self.__boundary_matrix.p_columns(p).tolist()
+        self.__working_matrix = None
+        self.__reduction_matrix = None
+        if instrument:
+            self.__add_col = self._stats.counted_add(self.__add_col, lambda i: len(self.__working_matrix[i]))
+
+    @property
+    def prime(self) -> int:
+        return self.__prime
+
+    def __inverse(self, value: int) -> int:
+        if self.__inverses is not None:
+            return int(self.__inverses[value])
+        return pow(value, -1, self.__prime)
+
+    def __add_col(self, i: int, j: int) -> None:
+        """
+        R_i <- R_i + c R_j, with c chosen to cancel the pivot of R_i.
+        """
+        column, other = self.__working_matrix[i], self.__working_matrix[j]
+        factor = (self.__prime - int(column.values[-1])) * self.__inverse(int(other.values[-1])) % self.__prime
+        column.add(other, factor, self.__prime)
+        if self.__reduction_matrix is not None:
+            self.__reduction_matrix[i].add(self.__reduction_matrix[j], factor, self.__prime)
+
+    def __new_column(self, j: int) -> ZpColumn:
+        rows = self.__boundary_matrix.column(j).astype(np.int64)
+        values = self.__boundary_matrix.column_signs(j).astype(np.int64) % self.__prime
+        return ZpColumn(rows, values)
+
+    def compute(self) -> None:
+        low: Dict[int, int] = self._pivot_table()
+        with self._phase("reduction"):
+            self.__working_matrix = [self.__new_column(j) for j in range(self.__simplex_count)]
+            self.__reduction_matrix = None
+            if self._representatives and self._essential:
+                self.__reduction_matrix = [ZpColumn(np.array([j], dtype=np.int64), np.ones(1, dtype=np.int64))
+                                           for j in range(self.__simplex_count)]
+            if self._stats is not None:
+                self._stats.start_working_matrix(sum(len(column) for column in self.__working_matrix))
+
+            cleared: Set[int] = set()
+            for dim in sorted(self.__p_columns, reverse=True):
+                for i in self.__p_columns[dim]:
+                    if i in cleared:
+                        continue
+                    last_in_col = self.__working_matrix[i].low
+                    while last_in_col is not None and last_in_col in low:
+                        self.__add_col(i, low[last_in_col])
+                        last_in_col = self.__working_matrix[i].low
+                    if last_in_col is not None:
+                        low[last_in_col] = i
+                        cleared.add(last_in_col)
+
+        with self._phase("diagram"):
+            self._new_pers_diag()
+            for row, col in low.items():
+                pers_point = PersPoint(
+                    born_index=row,
+                    die_index=col,
+                    born=self.__weights[row],
+                    die=self.__weights[col],
+                    dim=int(self.__boundary_matrix.dims[row])
+                )
+                self._add_point(pers_point, self.__working_matrix[col])
+            if self._essential:
+                paired = set(low.keys()) | set(low.values())
+                for i in range(self.__simplex_count):
+                    if i not in paired:
+                        self._add_essential(i, self.__weights[i], int(self.__boundary_matrix.dims[i]),
+                                            self.__reduction_matrix[i] if self._representatives else None)
+        if self._stats is not None:
+            self._stats.log_summary()
+
+    def get_representative_values(self, point: PersPoint) -> np.ndarray:
+        """
+        Coefficients in [1, p) of the simplices given by get_representative, in the same order.
+        """
+        self.get_representative(point)
+        return self._representative_columns[point].values
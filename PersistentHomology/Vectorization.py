@@ -0,0 +1,132 @@
+from __future__ import annotations
+from typing import Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+from scipy.special import erf
+
+if TYPE_CHECKING:
+    from PersistentHomology.PersHomBase import PersDiag
+
+KINDS = ("image", "landscape", "silhouette", "betti")
+_CHUNK_SIZE = 65536
+
+
+def _finite_points(diag: PersDiag, dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Births and deaths of the finite p-points off the diagonal; essential points have no finite summary and are left
+    out of images, landscapes and silhouettes.
+    """
+    mask = (diag.dims == dim) & np.isfinite(diag.die) & (diag.die > diag.born)
+    return diag.born[mask], diag.die[mask]
+
+
+def _pixel_integrals(centres: np.ndarray, edges: np.ndarray, sigma: float) -> np.ndarray:
+    """
+    Mass of a Gaussian of standard deviation sigma around each centre that falls in each interval between the edges.
+    """
+    cumulative = erf((edges[None, :] - centres[:, None]) / (sigma * np.sqrt(2)))
+    return (cumulative[:, 1:] - cumulative[:, :-1]) / 2
+
+
+def persistence_image(diag: PersDiag, dim: int, resolution: Tuple[int, int] = (20, 20), sigma: float = 0.1,
+                      birth_range: Tuple[float, float] | None = None,
+                      persistence_range: Tuple[float, float] | None = None) -> np.ndarray:
+    """
+    Persistence image on (birth, persistence) coordinates: every point is a Gaussian weighted by its persistence
+    relative to the top of persistence_range, integrated exactly over each pixel. The Gaussian is separable, so the
+    image is a single (birth pixels x points) @ (points x persistence pixels) product.
+    """
+    born, die = _finite_points(diag, dim)
+    persistence = die - born
+    birth_range = birth_range or _range(born)
+    persistence_range = persistence_range or (0.0, _range(persistence)[1])
+    birth_edges = np.linspace(*birth_range, resolution[0] + 1)
+    persistence_edges = np.linspace(*persistence_range, resolution[1] + 1)
+    weights = persistence / persistence_range[1] if persistence_range[1] > 0 else np.zeros_like(persistence)
+    image = np.zeros(resolution)
+    for start in range(0, born.shape[0], _CHUNK_SIZE):
+        stop = start + _CHUNK_SIZE
+        along_birth = _pixel_integrals(born[start:stop], birth_edges, sigma) * weights[start:stop, None]
+        image += along_birth.T @ _pixel_integrals(persistence[start:stop], persistence_edges, sigma)
+    return image
+
+
+def _tents(born: np.ndarray, die: np.ndarray, samples: np.ndarray) -> np.ndarray:
+    return np.maximum(np.minimum(samples[None, :] - born[:, None], die[:, None] - samples[None, :]), 0)
+
+
+def landscape(diag: PersDiag, dim: int, samples: np.ndarray, layers: int = 5) -> np.ndarray:
+    """
+    The first layers persistence landscapes evaluated at samples, as a (layers, len(samples)) array; layer k is the
+    k-th largest tent function at every sample. Points are taken in chunks that only keep a running top-k.
+    """
+    born, die = _finite_points(diag, dim)
+    samples = np.asarray(samples, dtype=np.float64)
+    top = np.zeros((layers, samples.shape[0]))
+    for start in range(0, born.shape[0], _CHUNK_SIZE):
+        tents = np.concatenate([top, _tents(born[start:start + _CHUNK_SIZE], die[start:start + _CHUNK_SIZE], samples)])
+        top = -np.partition(-tents, layers - 1, axis=0)[:layers]
+    return -np.sort(-top, axis=0)
+
+
+def silhouette(diag: PersDiag, dim: int, samples: np.ndarray, power: float = 1.0) -> np.ndarray:
+    """
+    Average of the tent functions weighted by persistence to the given power.
+    """
+    born, die = _finite_points(diag, dim)
+    samples = np.asarray(samples, dtype=np.float64)
+    weights = (die - born) ** power
+    total = np.zeros(samples.shape[0])
+    for start in range(0, born.shape[0], _CHUNK_SIZE):
+        stop = start + _CHUNK_SIZE
+        total += weights[start:stop] @ _tents(born[start:stop], die[start:stop], samples)
+    weight_sum = weights.sum()
+    return total / weight_sum if weight_sum > 0 else total
+
+
+def betti_curve(diag: PersDiag, dim: int, samples: np.ndarray) -> np.ndarray:
+    """
+    Number of p-classes alive at each sample, essential ones included.
+    """
+    return diag.betti_curve(samples, dim).astype(np.float64)
+
+
+def _range(values: np.ndarray) -> Tuple[float, float]:
+    if values.shape[0] == 0:
+        return 0.0, 1.0
+    low, high = float(values.min()), float(values.max())
+    return (low, high) if high > low else (low - 0.5, low + 0.5)
+
+
+def _stack(rows: Sequence[np.ndarray], feature_length: int) -> np.ndarray:
+    return np.stack(rows) if rows else np.empty((0, feature_length))
+
+
+def vectorize(diagrams: Sequence[PersDiag], dim: int, kind: str = "image", samples: np.ndarray | None = None,
+              sample_count: int = 100, **parameters) -> np.ndarray:
+    """
+    Fixed-length features of every diagram as rows of one 2D array. The grid is shared by the whole batch: samples
+    default to sample_count points spanning all finite births and deaths, and image ranges default to those of all the
+    points. Further parameters go to the kernel of the chosen kind. No diagrams give a (0, feature length) array.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Kind must be one of {KINDS}.")
+    finite = [_finite_points(diag, dim) for diag in diagrams]
+    all_born = np.concatenate([born for born, _ in finite]) if finite else np.empty(0)
+    all_die = np.concatenate([die for _, die in finite]) if finite else np.empty(0)
+
+    if kind == "image":
+        parameters.setdefault("birth_range", _range(all_born))
+        parameters.setdefault("persistence_range", (0.0, _range(all_die - all_born)[1]))
+        return _stack([persistence_image(diag, dim, **parameters).ravel() for diag in diagrams],
+                      int(np.prod(parameters.get("resolution", (20, 20)))))
+
+    if samples is None:
+        samples = np.linspace(*_range(np.concatenate([all_born, all_die])), sample_count)
+    sample_count = len(samples)
+    if kind == "landscape":
+        return _stack([landscape(diag, dim, samples, **parameters).ravel() for diag in diagrams],
+                      parameters.get("layers", 5) * sample_count)
+    if kind == "silhouette":
+        return _stack([silhouette(diag, dim, samples, **parameters) for diag in diagrams], sample_count)
+    return _stack([betti_curve(diag, dim, samples) for diag in diagrams], sample_count)
@@ -0,0 +1,30 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from PersistentHomology import Benchmark
+
+
+class TestBenchmark(TestCase):
+    def test_run_and_compare(self):
+        results = Benchmark.run_benchmark(["full_simplex", "flat_ties"], ["PersHom2", "PersHom3"], [5], 2, 0)
+        self.assertEqual([(result["workload"], result["engine"]) for result in results],
+                         [("full_simplex", "PersHom2"), ("full_simplex", "PersHom3"),
+                          ("flat_ties", "PersHom2"), ("flat_ties", "PersHom3")])
+        for result in results:
+            self.assertEqual(len(result["times"]), 2)
+            self.assertGreater(result["peak_bytes"], 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            Benchmark.save_results(results, path)
+            baseline = Benchmark.load_results(path)
+        self.assertEqual(baseline, json.loads(json.dumps(results)))
+        self.assertEqual(Benchmark.compare(results, baseline), [])
+
+        slower = [dict(result, median=result["median"] * 2) for result in results]
+        regressions = Benchmark.compare(slower, baseline, tolerance=0.5)
+        self.assertEqual(len(regressions), 4)
+        self.assertTrue(all(regression["metric"] == "median" for regression in regressions))
+        self.assertEqual(Benchmark.compare(slower, baseline[:1], tolerance=0.5)[0]["engine"], "PersHom2")
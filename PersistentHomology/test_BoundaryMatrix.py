@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.Simplex import Simplex
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+
+
+class TestBoundaryMatrix(TestCase):
+    def setUp(self):
+        self.fc = FilteredSimplicialComplex()
+        for vertex in (1, 3, 5):
+            self.fc.add_simplex(Simplex({vertex}), 0)
+        self.fc.add_simplex(Simplex({1, 5}), 1)
+        self.fc.add_simplex(Simplex({1, 3}), 2)
+        self.fc.add_simplex(Simplex({3, 5}), 2)
+        self.fc.add_simplex(Simplex({1, 3, 5}), 3)
+
+    def test_matches_facets(self):
+        boundary_matrix = BoundaryMatrix.from_complex(self.fc)
+        ordering = self.fc.get_simplex_ordering()
+        position = {simplex: i for i, simplex in enumerate(ordering)}
+        self.assertEqual(boundary_matrix.nnz, 9)
+        for j, simplex in enumerate(ordering):
+            expected = sorted(position[facet] for facet in simplex.facets if facet in position)
+            self.assertEqual(boundary_matrix.column(j).tolist(), expected)
+        self.assertEqual(boundary_matrix.dims.tolist(), [0, 0, 0, 1, 1, 1, 2])
+
+    def test_signs(self):
+        boundary_matrix = BoundaryMatrix.from_complex(self.fc)
+        # d[1, 3, 5] = [3, 5] - [1, 5] + [1, 3] and the columns are ordered [1, 5], [1, 3], [3, 5].
+        self.assertEqual(boundary_matrix.column(6).tolist(), [3, 4, 5])
+        self.assertEqual(boundary_matrix.column_signs(6).tolist(), [-1, 1, 1])
+        self.assertEqual(boundary_matrix.column_signs(3).tolist(), [-1, 1])
+
+    def test_empty_simplex(self):
+        self.fc.add_simplex(Simplex(set()), -1)
+        boundary_matrix = BoundaryMatrix.from_complex(self.fc)
+        self.assertTrue(np.array_equal(boundary_matrix.to_dense()[0, 1:4], np.ones(3)))
+
+    def test_cap(self):
+        boundary_matrix = BoundaryMatrix.from_complex(self.fc.cap(1))
+        self.assertEqual(boundary_matrix.size, 4)
+        self.assertEqual(boundary_matrix.column(3).tolist(), [0, 2])
+
+    def test_missing_facet(self):
+        fc = FilteredSimplicialComplex()
+        fc.add_simplex(Simplex({1}), 0)
+        fc.add_simplex(Simplex({1, 2}), 1)
+        with self.assertRaises(ValueError):
+            BoundaryMatrix.from_complex(fc)
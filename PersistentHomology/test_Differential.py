@@ -0,0 +1,94 @@
+from collections import Counter
+from unittest import TestCase
+
+import numpy as np
+
+from PersistentHomology import Differential
+from PersistentHomology.Columns import COLUMN_TYPES
+from PersistentHomology.PersHom3 import VARIANTS
+
+
+class TestDifferential(TestCase):
+    def test_engines_agree(self):
+        self.assertEqual(Differential.check(150, seed=1), [])
+        self.assertEqual(Differential.check(50, seed=2, max_vertices=6, empty_simplex=True), [])
+
+    def test_every_reduction_is_gated(self):
+        for variant in VARIANTS:
+            for column_type in COLUMN_TYPES:
+                self.assertIn(f"PersHom3-{variant}-{column_type}", Differential.ENGINES)
+
+    def test_distance_engines_agree(self):
+        self.assertEqual(Differential.check_distances(100, seed=1), [])
+        self.assertEqual(Differential.check_distances(30, seed=2, max_dim=1, max_vertices=10), [])
+
+    def test_shrink_distances(self):
+        def broken(distances, max_dim):
+            # Misses every loop.
+            diagram = Differential.DISTANCE_ENGINES["PersHom5"](distances, max_dim)
+            return Counter({point: count for point, count in diagram.items() if point[0] != 1})
+
+        engines = {"PersHom3": Differential.DISTANCE_ENGINES["PersHom3"], "broken": broken}
+        failures = Differential.check_distances(30, seed=0, engines=engines, max_dim=1)
+        self.assertTrue(failures)
+        for failure in failures:
+            self.assertEqual(failure.engines, ("broken",))
+            # At least four points carry a loop, and every point of the shrunk matrix is needed for it.
+            vertex_count = len([simplex for simplex in failure.simplices if len(simplex) == 1])
+            self.assertGreaterEqual(vertex_count, 4)
+            distances = np.zeros((vertex_count, vertex_count))
+            for (u, v), weight in ((simplex, weight) for simplex, weight in failure.simplices.items()
+                                   if len(simplex) == 2):
+                distances[u, v] = distances[v, u] = weight
+            for vertex in range(vertex_count):
+                smaller = np.delete(np.delete(distances, vertex, axis=0), vertex, axis=1)
+                self.assertEqual(Differential.distance_disagreement(smaller, 1, engines), [])
+            self.assertNotEqual(failure.diagrams["PersHom3"], failure.diagrams["broken"])
+
+    def test_essential_classes_are_compared(self):
+        def no_essential(fc):
+            return Differential.finite(Differential.ENGINES["PersHom4"](fc))
+
+        # Every complex has at least one component that never dies.
+        engines = {"PersHom1": Differential.ENGINES["PersHom1"], "PersHom4": no_essential}
+        failures = Differential.check(5, seed=0, engines=engines, relabelled=False)
+        self.assertEqual(len(failures), 5)
+        # Engines without essential classes are only held to the finite bars.
+        engines = {"PersHom1": Differential.ENGINES["PersHom1"], "PersHomZ2Old": Differential.ENGINES["PersHomZ2Old"]}
+        self.assertEqual(Differential.check(20, seed=0, engines=engines), [])
+
+    def test_random_complex_is_filtered(self):
+        for seed in range(20):
+            simplices = Differential.random_complex(np.random.default_rng(seed))
+            for simplex, weight in simplices.items():
+                for k in range(len(simplex)):
+                    face = simplex[:k] + simplex[k + 1:]
+                    if face:
+                        self.assertLessEqual(simplices[face], weight)
+
+    def test_normalise_drops_the_diagonal(self):
+        self.assertEqual(Differential.normalise([(0, 0.0, 1.0), (0, 1.0, 1.0), (1, 2.0, np.inf)]),
+                         Counter({(0, 0.0, 1.0): 1, (1, 2.0, np.inf): 1}))
+
+    def test_relabelling_keeps_the_diagram(self):
+        simplices = {(0,): 0.0, (1,): 0.0, (2,): 0.0, (0, 1): 1.0, (1, 2): 1.0, (0, 2): 1.0, (0, 1, 2): 2.0}
+        relabelled = Differential.relabel(simplices, {0: 2, 1: 0, 2: 1})
+        self.assertEqual(Differential.diagrams(simplices), Differential.diagrams(relabelled))
+
+    def test_shrink_finds_a_minimal_failure(self):
+        def broken(fc):
+            # Misses every class born by an edge.
+            diagram = Differential.ENGINES["PersHom1"](fc)
+            return Counter({point: count for point, count in diagram.items() if point[0] != 1})
+
+        engines = {"PersHom1": Differential.ENGINES["PersHom1"], "broken": broken}
+        failures = Differential.check(30, seed=0, engines=engines, relabelled=False)
+        self.assertTrue(failures)
+        for failure in failures:
+            self.assertEqual(failure.engines, ("broken",))
+            # A single loop closed by a triangle, or left open as an essential class, is all it takes.
+            edges = [simplex for simplex in failure.simplices if len(simplex) == 2]
+            self.assertEqual(set(Counter(vertex for edge in edges for vertex in edge).values()), {2})
+            if any(len(simplex) == 3 for simplex in failure.simplices):
+                self.assertEqual(len(edges), 3)
+            self.assertNotEqual(failure.diagrams["PersHom1"], failure.diagrams["broken"])
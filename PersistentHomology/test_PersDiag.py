@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+import numpy as np
+
+from PersistentHomology.DiagramDistance import pairwise_distances
+from PersistentHomology.PersHomBase import PersDiag, PersPoint
+from PersistentHomology.Vectorization import landscape, persistence_image, silhouette, vectorize
+
+
+class TestPersDiag(TestCase):
+    def setUp(self):
+        self.points = [
+            PersPoint(born_index=0, die_index=None, born=0.0, die=np.inf, dim=0),
+            PersPoint(born_index=1, die_index=5, born=0.0, die=1.0, dim=0),
+            PersPoint(born_index=2, die_index=6, born=0.0, die=0.5, dim=0),
+            PersPoint(born_index=7, die_index=9, born=1.5, die=4.0, dim=1),
+            PersPoint(born_index=8, die_index=10, born=2.0, die=2.0, dim=1),
+        ]
+        self.diag = PersDiag()
+        for point in self.points:
+            self.diag.add_point(point)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.diag), 5)
+        self.assertEqual(sorted(self.diag.to_points(), key=lambda point: point.born_index), self.points)
+        self.assertEqual(list(self.diag.p_points(1)), self.points[3:])
+        self.assertEqual(self.diag.die_index.tolist(), [-1, 5, 6, 9, 10])
+
+    def test_equality_is_order_free(self):
+        self.assertEqual(self.diag, PersDiag.from_points(reversed(self.points)))
+        self.assertNotEqual(self.diag, PersDiag.from_points(self.points[1:]))
+        columns = (self.diag.born, self.diag.die, self.diag.born_index, self.diag.die_index, self.diag.dims)
+        self.assertEqual(self.diag, PersDiag.from_arrays(*columns))
+
+    def test_filter_and_top_k(self):
+        self.assertEqual(len(self.diag.filter(0.6)), 3)
+        self.assertEqual(len(self.diag.filter(dim=1)), 1)
+        self.assertEqual(len(self.diag.filter(finite=True)), 3)
+        top = self.diag.top_k(2)
+        self.assertEqual(top.born_index.tolist(), [0, 7])
+        self.assertEqual(self.diag.top_k(1, dim=0).born_index.tolist(), [0])
+
+    def test_betti_curve(self):
+        self.assertEqual(self.diag.betti_curve([0.0, 0.5, 1.0, 10.0], 0).tolist(), [3, 2, 1, 1])
+        self.assertEqual(self.diag.betti_curve([1.0, 2.0, 4.0], 1).tolist(), [0, 1, 0])
+
+
+class TestDiagramDistance(TestCase):
+    @staticmethod
+    def diag(pairs, essential=()):
+        born = [b for b, _ in pairs] + list(essential)
+        die = [d for _, d in pairs] + [np.inf] * len(essential)
+        count = len(born)
+        return PersDiag.from_arrays(born, die, np.arange(count), np.arange(count), np.zeros(count, dtype=np.int64))
+
+    def test_bottleneck(self):
+        diag = self.diag([(0, 4), (1, 2)], [0])
+        other = self.diag([(0.5, 4), (3, 3.5)], [1])
+        # (0, 4) goes to (0.5, 4) for 0.5, the others go to the diagonal for 0.5 and 0.25; the essential births
+        # differ by 1.
+        self.assertAlmostEqual(diag.bottleneck_distance(other, 0), 1)
+        self.assertAlmostEqual(self.diag([(0, 4), (1, 2)]).bottleneck_distance(self.diag([(0.5, 4), (3, 3.5)]), 0),
+                               0.5)
+        self.assertEqual(diag.bottleneck_distance(self.diag([(0, 4)]), 0), np.inf)
+        self.assertEqual(diag.bottleneck_distance(diag, 0), 0)
+
+    def test_wasserstein(self):
+        diag, other = self.diag([(0, 4), (1, 2)]), self.diag([(0.5, 4), (3, 3.5)])
+        self.assertAlmostEqual(diag.wasserstein_distance(other, 0), 0.5 + 0.5 + 0.25)
+        self.assertAlmostEqual(diag.wasserstein_distance(other, 0, delta=1e-4), 1.25, delta=1.25e-4)
+        self.assertAlmostEqual(diag.wasserstein_distance(self.diag([]), 0, order=2, internal_p=2),
+                               np.sqrt(8 + 0.5))
+
+    def test_pairwise(self):
+        diagrams = [self.diag([(0, 4), (1, 2)]), self.diag([(0.5, 4), (3, 3.5)]), self.diag([])]
+        matrix = pairwise_distances(diagrams, 0)
+        self.assertTrue(np.allclose(matrix, matrix.T))
+        self.assertAlmostEqual(matrix[0, 1], 0.5)
+        self.assertAlmostEqual(matrix[0, 2], 2)
+        self.assertAlmostEqual(pairwise_distances(diagrams, 0, "wasserstein")[1, 2], 1.75 + 0.25)
+
+
+class TestVectorization(TestCase):
+    def setUp(self):
+        self.diag = TestDiagramDistance.diag([(0, 4), (1, 2)], [0])
+
+    def test_landscape_and_silhouette(self):
+        samples = np.array([0.5, 1.5, 2, 3])
+        self.assertEqual(landscape(self.diag, 0, samples, 2).tolist(), [[0.5, 1.5, 2, 1], [0, 0.5, 0, 0]])
+        # Weights 4 and 1.
+        self.assertTrue(np.allclose(silhouette(self.diag, 0, samples), [0.4, 1.3, 1.6, 0.8]))
+
+    def test_image_mass(self):
+        # With a tiny sigma every point lands in one pixel with its relative persistence as mass.
+        image = persistence_image(self.diag, 0, (2, 2), 1e-6, (-1, 2), (0, 5))
+        self.assertTrue(np.allclose(image, [[0, 0.8], [0.2, 0]]))
+
+    def test_batch(self):
+        other = TestDiagramDistance.diag([(0.5, 1)])
+        features = vectorize([self.diag, other], 0, "betti", samples=np.array([0, 0.75, 1.5]))
+        self.assertEqual(features.tolist(), [[2, 2, 3], [0, 1, 0]])
+        self.assertEqual(vectorize([self.diag, other], 0, "image", resolution=(3, 3)).shape, (2, 9))
+        self.assertEqual(vectorize([self.diag, other], 0, "landscape", sample_count=10, layers=2).shape, (2, 20))
+
+    def test_empty_batch(self):
+        # Rows have the length a non-empty batch would give them.
+        self.assertEqual(vectorize([], 0, "image", resolution=(3, 4)).shape, (0, 12))
+        self.assertEqual(vectorize([], 0, "image").shape, (0, 400))
+        self.assertEqual(vectorize([], 0, "landscape", sample_count=10, layers=2).shape, (0, 20))
+        self.assertEqual(vectorize([], 0, "landscape", samples=np.array([0, 1, 2])).shape, (0, 15))
+        self.assertEqual(vectorize([], 0, "silhouette", sample_count=7).shape, (0, 7))
+        self.assertEqual(vectorize([], 0, "betti").shape, (0, 100))
@@ -0,0 +1,50 @@
+import itertools
+from collections import Counter
+from unittest import TestCase
+
+import numpy as np
+
+from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
+from Complexes.Simplex import Simplex
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+from PersistentHomology.PersHom3 import PersHom3
+from PersistentHomology.PersHomZp import PersHomZp
+
+
+class TestPersHomZp(TestCase):
+    def test_projective_plane(self):
+        # The loop of the projective plane is 2-torsion: over Z2 it lives forever and fills a 2-class, over Z3 the
+        # triangles kill it.
+        triangles = [(0, 1, 2), (0, 2, 3), (0, 3, 4), (0, 4, 5), (0, 5, 1), (1, 2, 4), (2, 3, 5), (3, 4, 1), (4, 5, 2),
+                     (5, 1, 3)]
+        fc = FilteredSimplicialComplex(check_valid=True)
+        for k in (1, 2, 3):
+            for face in sorted({face for triangle in triangles for face in itertools.combinations(triangle, k)}):
+                fc.add_simplex(Simplex(set(face)), k - 1)
+
+        def essential(pers_hom):
+            pers_hom.compute()
+            return Counter(point.dim for point in pers_hom.get_pers_diag().points if point.die_index is None)
+
+        pers_hom_3 = PersHom3(fc, essential=True)
+        self.assertEqual(essential(pers_hom_3), Counter({0: 1, 1: 1, 2: 1}))
+        pers_hom_2 = PersHomZp(fc, 2, essential=True)
+        pers_hom_2.compute()
+        self.assertEqual(pers_hom_2.get_pers_diag(), pers_hom_3.get_pers_diag())
+        for prime in (3, 5, 2 ** 31 - 1):
+            self.assertEqual(essential(PersHomZp(fc, prime, essential=True)), Counter({0: 1}))
+
+        pers_hom = PersHomZp(fc, 3, essential=True, representatives=True)
+        pers_hom.compute()
+        boundary = BoundaryMatrix.from_complex(fc)
+        signed = np.zeros((boundary.size, boundary.size), dtype=np.int64)
+        columns = np.repeat(np.arange(boundary.size), np.diff(boundary.indptr))
+        signed[boundary.indices, columns] = boundary.data
+        for point in pers_hom.get_pers_diag().points:
+            representative = pers_hom.get_representative(point)
+            values = pers_hom.get_representative_values(point)
+            self.assertEqual(representative.max(), point.born_index)
+            self.assertFalse((signed[:, representative] @ values % 3).any())
+
+        with self.assertRaises(ValueError):
+            PersHomZp(fc, 4)
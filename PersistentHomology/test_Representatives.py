@@ -0,0 +1,63 @@
+from collections import Counter
+from unittest import TestCase
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+from PersistentHomology.BoundaryMatrix import BoundaryMatrix
+from PersistentHomology.PersHom3 import PersHom3
+from PersistentHomology.PersHom4 import PersHom4
+from PersistentHomology.PersHom5 import PersHom5
+
+
+class VR(Vectorized, Incremental):
+    pass
+
+
+class TestRepresentatives(TestCase):
+    def test_essential_and_representatives(self):
+        # A noisy circle and a far away cluster: two components and one loop up to the threshold.
+        angles = np.linspace(0, 2 * np.pi, 13)[:-1]
+        points = np.c_[np.cos(angles), np.sin(angles)] + np.random.default_rng(0).normal(0, 0.02, (12, 2))
+        points = np.r_[points, points[:3] + [3, 0]]
+        vr = VR(list(points), 0.8, "euclidean")
+        vr.compute(3)
+        dense = BoundaryMatrix.from_complex(vr.get_complex()).to_dense()
+
+        for variant in ("standard", "twist", "chunk"):
+            pers_hom_3 = PersHom3(vr.get_complex(), variant, essential=True, representatives=True)
+            pers_hom_3.compute()
+            essential = Counter(point.dim for point in pers_hom_3.get_pers_diag().points
+                                if point.die_index is None and point.dim <= 1)
+            self.assertEqual(essential, Counter({0: 2, 1: 1}))
+            for point in pers_hom_3.get_pers_diag().points:
+                representative = pers_hom_3.get_representative(point)
+                self.assertEqual(representative.max(), point.born_index)
+                self.assertFalse((dense[:, representative].sum(axis=1) % 2).any())
+
+        # Cohomology pairs the same simplices; its representatives are cochains whose coboundary vanishes, everywhere
+        # for an essential class and before the death for a finite one.
+        pers_hom_4 = PersHom4(vr.get_complex(), essential=True, representatives=True)
+        pers_hom_4.compute()
+        self.assertEqual(pers_hom_4.get_pers_diag(), pers_hom_3.get_pers_diag())
+        for point in pers_hom_4.get_pers_diag().points:
+            cochain = np.zeros(dense.shape[0], dtype=np.int64)
+            cochain[pers_hom_4.get_representative(point)] = 1
+            self.assertEqual(pers_hom_4.get_representative(point).min(), point.born_index)
+            coboundary = np.flatnonzero(dense.T @ cochain % 2)
+            if point.die_index is None:
+                self.assertEqual(coboundary.shape[0], 0)
+            else:
+                self.assertEqual(coboundary.min(), point.die_index)
+
+        pers_hom_5 = PersHom5(cdist(points, points), 1, 0.8, essential=True, representatives=True)
+        pers_hom_5.compute()
+        self.assertEqual(Counter(point.dim for point in pers_hom_5.get_pers_diag().points if point.die_index is None),
+                         Counter({0: 2, 1: 1}))
+
+        pers_hom_3 = PersHom3(vr.get_complex())
+        pers_hom_3.compute()
+        with self.assertRaises(ValueError):
+            pers_hom_3.get_representative(next(pers_hom_3.get_pers_diag().points))
@@ -1,14 +1,24 @@
+import itertools
+from collections import Counter
 from unittest import TestCase
 
+import numpy as np
+from scipy.spatial.distance import cdist
+
 from Complexes.FilteredSimplicialComplex import FilteredSimplicialComplex
 from Complexes.Simplex import Simplex
+from Complexes.VR.Expansion.Incremental import Incremental
+from Complexes.VR.Skeleton.Vectorized import Vectorized
+from PersistentHomology.Columns import COLUMN_TYPES
 from PersistentHomology.PersHom1 import PersHom1
 from PersistentHomology.PersHom2 import PersHom2
-import itertools
-import time
-
 from PersistentHomology.PersHom3 import PersHom3
 from PersistentHomology.PersHom4 import PersHom4
+from PersistentHomology.PersHom5 import PersHom5
+
+
+class VR(Vectorized, Incremental):
+    pass
 
 
 class SpeedTest1v2(TestCase):
@@ -23,16 +33,9 @@ class SpeedTest1v2(TestCase):
 
         pers_hom_1 = PersHom1(fc)
         pers_hom_2 = PersHom2(fc)
-
-        start = time.perf_counter()
         pers_hom_1.compute()
-        end = time.perf_counter()
-        print(f"PersHom1: {round(end - start, 5)}")
-
-        start = time.perf_counter()
         pers_hom_2.compute()
-        end = time.perf_counter()
-        print(f"PersHom2: {round(end - start, 5)}")
+        self.assertEqual(pers_hom_1.get_pers_diag(), pers_hom_2.get_pers_diag())
 
     def test_23(self):
         fc = FilteredSimplicialComplex(check_valid=True)
@@ -45,35 +48,43 @@ class SpeedTest1v2(TestCase):
 
         pers_hom_2 = PersHom2(fc)
         pers_hom_3 = PersHom3(fc)
+        pers_hom_2.compute()
+        pers_hom_3.compute()
+        self.assertEqual(pers_hom_2.get_pers_diag(), pers_hom_3.get_pers_diag())
 
-        start = time.perf_counter()
+    def test_3_variants(self):
+        points = np.random.default_rng(1).random((25, 2))
+        vr = VR(list(points), 0.6, "euclidean")
+        vr.compute(3)
+
+        pers_hom_2 = PersHom2(vr.get_complex())
         pers_hom_2.compute()
-        end = time.perf_counter()
-        print(f"PersHom2: {round(end - start, 5)}")
+        for variant in ("standard", "twist", "chunk"):
+            for column_type in COLUMN_TYPES:
+                pers_hom_3 = PersHom3(vr.get_complex(), variant, column_type)
+                pers_hom_3.compute()
+                self.assertEqual(pers_hom_2.get_pers_diag(), pers_hom_3.get_pers_diag())
 
-        start = time.perf_counter()
-        pers_hom_3.compute()
-        end = time.perf_counter()
-        print(f"PersHom3: {round(end - start, 5)}")
 
+class SpeedTest3v5(TestCase):
+    def test_35(self):
+        points = np.random.default_rng(0).random((20, 2))
+        vr = VR(list(points), np.inf, "euclidean")
+        vr.compute(3)
 
-class Test(TestCase):
-    def test(self):
-        fc = FilteredSimplicialComplex(check_valid=True)
-        # fc.add_simplex(Simplex(set()), -1)
-        # fc.add_simplex(Simplex({1}), 1)
-        # fc.add_simplex(Simplex({2}), 2)
-        # fc.add_simplex(Simplex({3}), 3)
-        # fc.add_simplex(Simplex({1, 2}), 4)
-        # fc.add_simplex(Simplex({1, 3}), 5)
-        # fc.add_simplex(Simplex({2, 3}), 6)
-        # fc.add_simplex(Simplex({1, 2, 3}), 7)
-        # fc.add_simplex(Simplex({5}), 7)
-        # fc.add_simplex(Simplex({3, 5}), 7)
-        # fc.add_simplex(Simplex({4}), 7)
-        # fc.add_simplex(Simplex({4, 5}), 7)
+        pers_hom_3 = PersHom3(vr.get_complex())
+        pers_hom_3.compute()
+        pers_hom_5 = PersHom5(cdist(points, points), 2)
+        pers_hom_5.compute()
+
+        def finite(pers_hom):
+            return Counter((point.dim, round(point.born, 9), round(point.die, 9))
+                           for point in pers_hom.get_pers_diag().points if point.die > point.born and point.dim <= 2)
+        self.assertEqual(finite(pers_hom_3), finite(pers_hom_5))
 
 
+class SpeedTest3v4(TestCase):
+    def test_34(self):
         fc = FilteredSimplicialComplex(check_valid=True)
         fc.add_simplex(Simplex(set()), -1)
         dim = 12
@@ -82,23 +93,8 @@ class Test(TestCase):
             for elem in itertools.combinations(vertices, l):
                 fc.add_simplex(Simplex(set(elem)), l)
 
-        start = time.perf_counter()
         pers_hom_3 = PersHom3(fc)
         pers_hom_3.compute()
-        end = time.perf_counter()
-        print(f"3: {round(end - start, 3)}")
-        # for pers_point in pers_hom_3.get_pers_diag().points:
-        #     print(pers_point)
-        # print()
-
-        start = time.perf_counter()
         pers_hom_4 = PersHom4(fc)
         pers_hom_4.compute()
-        # for pers_point in pers_hom_4.get_pers_diag().points:
-        #     print(pers_point)
-        end = time.perf_counter()
-        print(f"4: {round(end - start, 3)}")
-
-        print(pers_hom_4.get_pers_diag() == pers_hom_3.get_pers_diag())
-
-
+        self.assertEqual(pers_hom_4.get_pers_diag(), pers_hom_3.get_pers_diag())